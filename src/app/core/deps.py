@@ -2,8 +2,20 @@ from typing import AsyncGenerator
 
 from fastapi import FastAPI, Request
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.requests import HTTPConnection
 
 from app.core import settings
+from app.core.http_cache import ResponseCache
+from app.services import (
+    EventBroker,
+    ModelWorkerPool,
+    SearchService,
+    StorageService,
+    VectorIndex,
+)
+from app.services.image_store import ImageFormat, ImageStore
+
+READ_ONLY_METHODS = frozenset({"GET", "HEAD"})
 
 
 def get_settings(app: FastAPI) -> settings.Settings:
@@ -17,6 +29,8 @@ async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
 
     This is a FastAPI dependency that retrieves the session maker from
     the application state and yields a database session for each request.
+    GET and HEAD requests are served from the pooled read-only engine; all
+    other methods use the single-connection writer engine.
 
     Args:
         request: FastAPI request object.
@@ -25,6 +39,55 @@ async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
         AsyncSession: Database session.
     """
 
-    session_maker: async_sessionmaker[AsyncSession] = request.app.state.db_session_maker
+    session_maker: async_sessionmaker[AsyncSession]
+    if request.method in READ_ONLY_METHODS:
+        session_maker = request.app.state.db_read_session_maker
+    else:
+        session_maker = request.app.state.db_session_maker
     async with session_maker() as session:
         yield session
+
+
+def get_storage(request: Request) -> StorageService:
+    """Get a storage service rooted at the configured data directory."""
+    return StorageService(base_dir=request.app.state.settings.paths.DATA_DIR)
+
+
+def get_vector_index(connection: HTTPConnection) -> VectorIndex:
+    """Get the process-wide capture embedding index, for every VisionService."""
+    return connection.app.state.vector_index
+
+
+def get_search(request: Request) -> SearchService:
+    """Get a search service over the shared capture embedding index."""
+    vector_index: VectorIndex = request.app.state.vector_index
+    return SearchService(
+        vector_index_path=vector_index.path, vector_train_threshold=vector_index.train_threshold
+    )
+
+
+def get_broker(connection: HTTPConnection) -> EventBroker:
+    """Get the live-update broker; usable from HTTP and WebSocket routes."""
+    return connection.app.state.event_broker
+
+
+def get_model_pool(request: Request) -> ModelWorkerPool:
+    """Get the shared model workers; ``pool.client(model)`` is a backend that calls into one."""
+    return request.app.state.model_pool
+
+
+def get_response_cache(request: Request) -> ResponseCache:
+    """Get the in-process cache of serialized GET responses."""
+    return request.app.state.response_cache
+
+
+def get_image_store(request: Request) -> ImageStore:
+    """Get the shared content-addressed screen capture store."""
+    app_settings = request.app.state.settings
+    images = app_settings.images
+    return ImageStore(
+        root=app_settings.paths.DATA_DIR / images.DIR_NAME,
+        format=ImageFormat(images.FORMAT),
+        quality=images.QUALITY,
+        thumbnail_size=(images.THUMBNAIL_SIZE, images.THUMBNAIL_SIZE),
+    )
@@ -0,0 +1,120 @@
+"""Conditional GET helpers and an in-process cache of serialized responses."""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a weak ETag from the values that determine a representation."""
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    Evaluate ``If-None-Match`` / ``If-Modified-Since`` against the current state.
+
+    ``If-None-Match`` takes precedence when both are sent, as in RFC 9110.
+    ``If-Modified-Since`` is only answered once ``last_modified`` is settled
+    (see :func:`settled`). Naive datetimes are treated as UTC.
+    """
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        wanted = _strip_weak(etag)
+        return any(_strip_weak(tag) == wanted for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    last_modified = settled(last_modified)
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return _as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def settled(
+    last_modified: Optional[datetime], now: Optional[datetime] = None
+) -> Optional[datetime]:
+    """
+    Return ``last_modified`` once the second it falls in is over, else None.
+
+    HTTP dates have one-second precision, so a ``Last-Modified`` sent during
+    the second of a change would also validate a later change in that same
+    second. Until the second is over only the ETag is offered and honoured.
+    """
+
+    if last_modified is None:
+        return None
+    now = now or datetime.now(timezone.utc)
+    second_end = _as_utc(last_modified).replace(microsecond=0) + timedelta(seconds=1)
+    return last_modified if second_end <= now else None
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime] = None) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    last_modified = settled(last_modified)
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def not_modified_response(headers: dict[str, str]) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+class ResponseCache:
+    """
+    LRU cache of serialized JSON bodies, keyed by URL and validated by ETag.
+
+    An entry is only served while its ETag still matches the current state,
+    so a version bump makes it stale without explicit invalidation.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[str, bytes]] = OrderedDict()
+
+    def get(self, key: str, etag: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != etag:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: str, etag: str, body: bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (etag, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
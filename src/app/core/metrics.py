@@ -0,0 +1,386 @@
+"""In-process metrics registry exposed in the Prometheus text format.
+
+Metrics are module-level, like loggers, so any service can record into them
+without extra wiring::
+
+    with metrics.MODEL_LATENCY.labels("transcribe_chunk").time():
+        segment = await backend.transcribe_chunk(chunk)
+
+Recording is a dict lookup and a few integer additions with no locking: the
+values are only written from the event loop (and, for some counters, from
+worker threads, where a rare lost increment is acceptable). Values that are
+cheaper to read than to track, such as queue lengths, are gauges with a
+callback evaluated when ``/metrics`` is scraped.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from bisect import bisect_left
+from contextlib import AbstractContextManager, contextmanager
+from typing import Callable, Generic, Iterator, Optional, TypeVar
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds, from sub-millisecond SQLite commits to multi-second LLM calls.
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n")
+
+
+def _escape(value: str) -> str:
+    """Escape a label value; unlike HELP text, it also escapes double quotes."""
+    return _escape_help(value).replace('"', r"\"")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class GaugeChild:
+    __slots__ = ("value", "function")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set_function(self, function: Optional[Callable[[], float]]) -> None:
+        """Report ``function()`` at scrape time instead of the stored value."""
+        self.function = function
+
+    def get(self) -> float:
+        return float(self.function()) if self.function is not None else self.value
+
+
+class HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the duration of the block, also when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+ChildT = TypeVar("ChildT", CounterChild, GaugeChild, HistogramChild)
+
+
+class Metric(Generic[ChildT]):
+    type: str = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], ChildT] = {}
+
+    def _new_child(self) -> ChildT:
+        raise NotImplementedError
+
+    def labels(self, *values: str) -> ChildT:
+        """Return the child for ``values``, one per label name, creating it on first use."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def remove(self, *values: str) -> None:
+        self._children.pop(values, None)
+
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {_escape_help(self.documentation)}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric[CounterChild]):
+    type = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self) -> Iterator[str]:
+        for values, child in list(self._children.items()):
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_total{labels} {_format_value(child.value)}"
+
+
+class Gauge(Metric[GaugeChild]):
+    type = "gauge"
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def set_function(self, function: Optional[Callable[[], float]]) -> None:
+        self.labels().set_function(function)
+
+    def _samples(self) -> Iterator[str]:
+        for values, child in list(self._children.items()):
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}{labels} {_format_value(child.get())}"
+
+
+class Histogram(Metric[HistogramChild]):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def time(self) -> AbstractContextManager[None]:
+        return self.labels().time()
+
+    def _samples(self) -> Iterator[str]:
+        for values, child in list(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), child.counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                labels = _format_labels(self.labelnames, values, le)
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(child.sum)}"
+            yield f"{self.name}_count{labels} {child.count}"
+
+
+MetricT = TypeVar("MetricT", bound=Metric)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: MetricT) -> MetricT:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format, version 0.0.4."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+MODEL_LATENCY = REGISTRY.histogram(
+    "callyfy_model_call_seconds",
+    "Latency of model backend calls.",
+    ("operation",),  # transcribe_chunk, describe_image, embed_image, summarize
+)
+DB_COMMIT_LATENCY = REGISTRY.histogram(
+    "callyfy_db_commit_seconds",
+    "Latency of SQLite commits.",
+    ("path",),  # write_buffer or direct
+)
+DB_ROWS_WRITTEN = REGISTRY.counter(
+    "callyfy_db_rows_written", "Rows inserted through the write buffer or direct commits."
+)
+AUDIO_CHUNKS = REGISTRY.counter(
+    "callyfy_audio_chunks", "Live audio chunks by outcome.", ("outcome",)
+)  # transcribed, failed, persist_failed, dropped, merged
+SCREEN_FRAMES = REGISTRY.counter(
+    "callyfy_screen_frames", "Screen captures by outcome.", ("outcome",)
+)  # analysed, duplicate
+ASR_QUEUE_DEPTH = REGISTRY.gauge(
+    "callyfy_asr_queue_depth", "Audio chunks waiting for ASR, across all live meetings."
+)
+WRITE_BUFFER_PENDING = REGISTRY.gauge(
+    "callyfy_write_buffer_pending", "Objects waiting in the write buffer."
+)
+EVENT_SUBSCRIBERS = REGISTRY.gauge("callyfy_event_subscribers", "Open live-update subscriptions.")
+SCHEDULER_LAG = REGISTRY.gauge(
+    "callyfy_scheduler_lag_seconds",
+    "How late the last run of a periodic task started, relative to its tick.",
+    ("task",),
+)
+SCHEDULER_MISSED_TICKS = REGISTRY.counter(
+    "callyfy_scheduler_missed_ticks", "Ticks dropped because a run overran.", ("task",)
+)
+MODEL_BATCH_SIZE = REGISTRY.histogram(
+    "callyfy_model_batch_size",
+    "Items per batched model call, as achieved by the dynamic batchers.",
+    ("operation",),
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+MODEL_POOL_QUEUE_DEPTH = REGISTRY.gauge(
+    "callyfy_model_pool_queue_depth", "Calls waiting for a shared model worker.", ("model",)
+)
+MODEL_POOL_RESIDENT_MB = REGISTRY.gauge(
+    "callyfy_model_pool_resident_mb", "Memory budget taken by running model workers."
+)
+MODEL_POOL_EVICTIONS = REGISTRY.counter(
+    "callyfy_model_pool_evictions", "Idle model workers stopped to fit the budget.", ("model",)
+)
+CHUNK_TO_SUMMARY_LATENCY = REGISTRY.histogram(
+    "callyfy_chunk_to_summary_seconds",
+    "Time from capturing a live audio chunk until a summary includes its text.",
+)
+HTTP_REQUEST_LATENCY = REGISTRY.histogram(
+    "callyfy_http_request_seconds",
+    "HTTP request latency until the response body is sent, by route template.",
+    ("method", "route", "status"),
+)
+
+
+def route_template(scope: Scope) -> str:
+    """
+    The matched route's path template, e.g. ``/api/v1/meetings/{meeting_id}``.
+
+    Routes of included routers only know their path below the router's
+    prefix, so the prefix is taken from the concrete request path.
+    """
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if path_format is None:
+        return "unmatched"
+    path = scope["path"]
+    for index, char in enumerate(path):
+        if char == "/" and route.path_regex.match(path[index:]):
+            return path[:index] + path_format
+    return path_format
+
+
+class MetricsMiddleware:
+    """
+    Time HTTP requests per route template (``/api/v1/meetings/{meeting_id}``).
+
+    Requests that match no route share the ``unmatched`` label, so probing
+    random URLs cannot grow the label set.
+    """
+
+    def __init__(self, app: ASGIApp, histogram: Histogram = HTTP_REQUEST_LATENCY) -> None:
+        self.app = app
+        self.histogram = histogram
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.histogram.labels(scope["method"], route_template(scope), str(status_code)).observe(
+                time.perf_counter() - start
+            )
@@ -1,5 +1,6 @@
 from functools import cached_property
 from pathlib import Path
+from typing import Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -14,6 +15,9 @@ class AppSettings(BaseSettings):
     VERSION: str = "0.1.0"
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    RESPONSE_CACHE_SIZE: int = 256  # serialized GET responses kept in memory
+    METRICS_ENABLED: bool = True  # Prometheus /metrics endpoint and HTTP request timing
+    WARMUP_BACKENDS: bool = False  # run each model's warmup inference when its worker starts
 
 
 class DBSettings(BaseSettings):
@@ -24,6 +28,17 @@ class DBSettings(BaseSettings):
     PATH: str = "callyfy.db"
     ECHO: bool = False
     FUTURE: bool = True
+    WRITE_BUFFER_MAX_BATCH: int = 256
+    WRITE_BUFFER_MAX_DELAY: float = 0.5
+
+    # Connection profile, applied as PRAGMAs on every new connection
+    JOURNAL_MODE: str = "WAL"
+    SYNCHRONOUS: str = "NORMAL"
+    MMAP_SIZE: int = 256 * 1024 * 1024
+    CACHE_SIZE: int = -64 * 1024  # negative values are KiB
+    TEMP_STORE: str = "MEMORY"
+    BUSY_TIMEOUT: int = 5000  # milliseconds
+    READ_POOL_SIZE: int = 4
 
     @cached_property
     def url(self) -> str:
@@ -41,6 +56,59 @@ class PathsSettings(BaseSettings):
     SCREEN_DIR_NAME: str = "screens"
 
 
+class ImageSettings(BaseSettings):
+    """Screen capture image store settings."""
+
+    model_config = SettingsConfigDict(env_prefix="IMAGES_")
+
+    DIR_NAME: str = "images"  # under PATHS_DATA_DIR, shared by all meetings
+    FORMAT: str = "webp"  # webp or avif
+    QUALITY: int = 80
+    THUMBNAIL_SIZE: int = 320  # longest side, in pixels
+
+
+class VectorIndexSettings(BaseSettings):
+    """Screen capture embedding index settings."""
+
+    model_config = SettingsConfigDict(env_prefix="VECTORS_")
+
+    DIR_NAME: str = "vectors"  # under PATHS_DATA_DIR, shared by all meetings
+    # Build the approximate IVF-PQ index in the background at this many vectors;
+    # below it, exact search is fast enough.
+    TRAIN_THRESHOLD: Optional[int] = 50_000
+
+
+class EventsSettings(BaseSettings):
+    """Live-update broker settings."""
+
+    model_config = SettingsConfigDict(env_prefix="EVENTS_")
+
+    QUEUE_SIZE: int = 256  # per subscriber; slower clients are evicted
+    HISTORY_SIZE: int = 1024  # per meeting, available for resume
+    MAX_MEETINGS: int = 64  # topics kept for idle meetings, least recently used dropped first
+
+
+class TracingSettings(BaseSettings):
+    """Live pipeline tracing settings."""
+
+    model_config = SettingsConfigDict(env_prefix="TRACING_")
+
+    ENABLED: bool = True
+    SPANS_PER_MEETING: int = 4096  # ring buffer size, about 1000 chunks
+    MAX_MEETINGS: int = 32  # least recently traced meetings are dropped first
+    FILE: Optional[Path] = None  # also append spans to this JSON Lines file
+
+
+class ModelPoolSettings(BaseSettings):
+    """Shared model worker settings."""
+
+    model_config = SettingsConfigDict(env_prefix="MODELS_")
+
+    # Memory the running model workers may take together; idle models are
+    # stopped to make room. Unset means no limit.
+    MEMORY_BUDGET_MB: Optional[int] = None
+
+
 class Settings(BaseSettings):
     """Root settings aggregating all configuration sections."""
 
@@ -49,3 +117,8 @@ class Settings(BaseSettings):
     app: AppSettings = Field(default_factory=AppSettings)
     db: DBSettings = Field(default_factory=DBSettings)
     paths: PathsSettings = Field(default_factory=PathsSettings)
+    events: EventsSettings = Field(default_factory=EventsSettings)
+    images: ImageSettings = Field(default_factory=ImageSettings)
+    vectors: VectorIndexSettings = Field(default_factory=VectorIndexSettings)
+    tracing: TracingSettings = Field(default_factory=TracingSettings)
+    models: ModelPoolSettings = Field(default_factory=ModelPoolSettings)
@@ -0,0 +1,184 @@
+"""Lightweight tracing of live chunks from capture to summary.
+
+Each live audio chunk gets a trace ID when it is captured. The pipeline
+records one span per stage (``queue``, ``asr``, ``persist``) under that ID,
+and the ID is stored on the resulting :class:`TranscriptSegment`. When a
+summary is generated, its ``summarize`` span lists the chunk traces persisted
+before it started and not covered by an earlier summary. Each of those chunks
+then gets a ``summarized`` span running from its capture until the summary is
+stored: the end-to-end latency of that chunk.
+
+Spans are kept in a bounded ring buffer per meeting (and optionally appended
+to a JSON Lines file), so tracing can stay on during live calls. Like
+:mod:`app.core.metrics`, the tracer is module-level and configured at startup.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import IO, Any, Iterator, Optional
+
+from app.core import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def new_trace_id() -> str:
+    return os.urandom(8).hex()
+
+
+@dataclass
+class Span:
+    trace_id: str
+    name: str
+    meeting_id: str
+    start: float  # Unix time, seconds
+    end: float
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class Tracer:
+    """
+    Per-meeting ring buffers of spans.
+
+    Only the ``max_meetings`` most recently traced meetings are kept, each
+    with at most ``spans_per_meeting`` spans.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        spans_per_meeting: int = 4096,
+        max_meetings: int = 32,
+        path: Optional[Path] = None,
+    ) -> None:
+        self.configure(enabled, spans_per_meeting, max_meetings, path)
+
+    def configure(
+        self,
+        enabled: bool = True,
+        spans_per_meeting: int = 4096,
+        max_meetings: int = 32,
+        path: Optional[Path] = None,
+    ) -> None:
+        self.close()
+        self.enabled = enabled
+        self.spans_per_meeting = spans_per_meeting
+        self.max_meetings = max_meetings
+        self._spans: OrderedDict[str, deque[Span]] = OrderedDict()
+        # Chunk traces persisted but not yet part of a summary: (trace_id, captured at).
+        self._unsummarized: dict[str, deque[tuple[str, float]]] = {}
+        self._file: Optional[IO[str]] = None
+        if enabled and path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = path.open("a", buffering=1, encoding="utf-8")
+
+    def close(self) -> None:
+        file = getattr(self, "_file", None)
+        if file is not None:
+            file.close()
+            self._file = None
+
+    def _buffer(self, meeting_id: str) -> deque[Span]:
+        spans = self._spans.get(meeting_id)
+        if spans is None:
+            spans = self._spans[meeting_id] = deque(maxlen=self.spans_per_meeting)
+            while len(self._spans) > self.max_meetings:
+                evicted, _ = self._spans.popitem(last=False)
+                self._unsummarized.pop(evicted, None)
+        else:
+            self._spans.move_to_end(meeting_id)
+        return spans
+
+    def record(
+        self,
+        trace_id: str,
+        name: str,
+        meeting_id: str,
+        start: float,
+        end: float,
+        **attributes: Any,
+    ) -> None:
+        if not self.enabled:
+            return
+        span = Span(trace_id, name, meeting_id, start, end, attributes)
+        self._buffer(meeting_id).append(span)
+        if self._file is not None:
+            try:
+                self._file.write(json.dumps(asdict(span), default=str) + "\n")
+            except (OSError, ValueError):
+                logger.exception("Cannot write span to the trace file; disabling it")
+                self.close()
+
+    @contextmanager
+    def span(
+        self, trace_id: str, name: str, meeting_id: str, **attributes: Any
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Record the duration of the block as a span.
+
+        Yields the span's attributes, so the block can add to them. A span whose
+        block raises gets an ``error`` attribute.
+        """
+        start = time.time()
+        try:
+            yield attributes
+        except BaseException as exc:
+            attributes["error"] = type(exc).__name__
+            raise
+        finally:
+            self.record(trace_id, name, meeting_id, start, time.time(), **attributes)
+
+    def chunk_persisted(self, meeting_id: str, trace_id: str, captured_at: float) -> None:
+        """Note a chunk whose text is stored but not yet included in a summary."""
+        if self.enabled:
+            pending = self._unsummarized.setdefault(
+                meeting_id, deque(maxlen=self.spans_per_meeting)
+            )
+            pending.append((trace_id, captured_at))
+
+    def take_unsummarized(self, meeting_id: str) -> list[tuple[str, float]]:
+        """Claim the chunks stored so far for a summary that is about to read them."""
+        return list(self._unsummarized.pop(meeting_id, ()))
+
+    def summary_persisted(
+        self,
+        meeting_id: str,
+        trace_id: str,
+        start: float,
+        end: float,
+        chunks: list[tuple[str, float]],
+        **attributes: Any,
+    ) -> None:
+        """Record a ``summarize`` span and a ``summarized`` span for each chunk it covers."""
+        if not self.enabled:
+            return
+        trace_ids = [chunk_trace for chunk_trace, _ in chunks]
+        self.record(trace_id, "summarize", meeting_id, start, end, chunks=trace_ids, **attributes)
+        for chunk_trace, captured_at in chunks:
+            self.record(chunk_trace, "summarized", meeting_id, captured_at, end, summary=trace_id)
+            metrics.CHUNK_TO_SUMMARY_LATENCY.observe(end - captured_at)
+
+    def spans(self, meeting_id: str, trace_id: Optional[str] = None) -> list[Span]:
+        spans = list(self._spans.get(meeting_id, ()))
+        if trace_id is not None:
+            spans = [s for s in spans if s.trace_id == trace_id]
+        return spans
+
+    def forget(self, meeting_id: str) -> None:
+        self._spans.pop(meeting_id, None)
+        self._unsummarized.pop(meeting_id, None)
+
+
+tracer = Tracer()
@@ -4,14 +4,17 @@ from app.db.base import Base
 from app.db.database import (
     create_db_engine,
     create_session_factory,
-    get_session,
     init_db_tables,
 )
+from app.db.fts import rebuild_fts_index
+from app.db.write_buffer import WriteBuffer, persist
 
 __all__ = [
     "Base",
     "create_db_engine",
     "create_session_factory",
-    "get_session",
     "init_db_tables",
+    "rebuild_fts_index",
+    "WriteBuffer",
+    "persist",
 ]
@@ -1,3 +1,7 @@
+from functools import cache
+from typing import Any
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -7,24 +11,63 @@ from sqlalchemy.ext.asyncio import (
 
 from app.core import settings as app_settings
 from app.db import base as db_base
+from app.db import fts, migrations, versioning
+
+
+def _connection_pragmas(db_settings: app_settings.DBSettings, read_only: bool) -> list[str]:
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(db_settings.BUSY_TIMEOUT)}",
+        f"PRAGMA synchronous = {db_settings.SYNCHRONOUS}",
+        f"PRAGMA mmap_size = {int(db_settings.MMAP_SIZE)}",
+        f"PRAGMA cache_size = {int(db_settings.CACHE_SIZE)}",
+        f"PRAGMA temp_store = {db_settings.TEMP_STORE}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only = ON")
+    else:
+        # journal_mode is persistent and needs a writable connection.
+        pragmas.insert(0, f"PRAGMA journal_mode = {db_settings.JOURNAL_MODE}")
+    return pragmas
 
 
-def create_db_engine(db_settings: app_settings.DBSettings) -> AsyncEngine:
+def create_db_engine(db_settings: app_settings.DBSettings, read_only: bool = False) -> AsyncEngine:
     """
     Create async database engine from settings.
 
+    A writer engine holds a single connection so that its writes are
+    serialised in the pool instead of contending for SQLite's writer lock. The
+    application uses two: one for request sessions and one for the
+    :class:`~app.db.write_buffer.WriteBuffer`, so that a session that is still
+    in a transaction can await the buffer. The read-only engine pools
+    ``READ_POOL_SIZE`` connections, which WAL mode lets run alongside the
+    writers.
+
     Args:
         db_settings: Database configuration settings.
+        read_only: Build the pooled reader engine instead of the writer.
 
     Returns:
         AsyncEngine: Configured async database engine.
     """
 
-    return create_async_engine(
+    engine = create_async_engine(
         db_settings.url,
         echo=db_settings.ECHO,
         future=db_settings.FUTURE,
+        pool_size=db_settings.READ_POOL_SIZE if read_only else 1,
+        max_overflow=0,
+        pool_timeout=max(db_settings.BUSY_TIMEOUT / 1000, 30),
     )
+    pragmas = _connection_pragmas(db_settings, read_only)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return engine
 
 
 def create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
@@ -45,13 +88,36 @@ def create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSessi
     )
 
 
-async def init_db_tables(engine: AsyncEngine) -> None:
+@cache
+def schema_version() -> int:
+    """Version of the schema that :func:`init_db_tables` creates."""
+    return migrations.schema_version(fts.ddl_statements() + versioning.ddl_statements())
+
+
+async def init_db_tables(engine: AsyncEngine, force: bool = False) -> bool:
     """
     Initialize database tables.
 
+    The schema version is stored in ``PRAGMA user_version``. When it matches
+    the current one, the schema is known to be up to date and the table,
+    column, index and trigger checks are skipped.
+
     Args:
         engine: Database engine.
+        force: Run every check even if the stored schema version matches.
+
+    Returns:
+        bool: Whether the checks ran (False if they were skipped).
     """
 
+    version = schema_version()
     async with engine.begin() as conn:
+        if not force and await conn.run_sync(migrations.read_schema_version) == version:
+            return False
         await conn.run_sync(db_base.Base.metadata.create_all)
+        await conn.run_sync(migrations.add_missing_columns)
+        await conn.run_sync(migrations.create_missing_indexes)
+        await fts.init_fts_index(conn)
+        await versioning.init_version_triggers(conn)
+        await conn.run_sync(migrations.write_schema_version, version)
+    return True
@@ -0,0 +1,109 @@
+"""SQLite FTS5 index over transcript segments."""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+TRANSCRIPT_FTS_TABLE = "transcript_segments_fts"
+
+_CREATE_TRANSCRIPT_FTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {TRANSCRIPT_FTS_TABLE} USING fts5(
+        text,
+        content='transcript_segments',
+        content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS transcript_segments_fts_ai
+    AFTER INSERT ON transcript_segments BEGIN
+        INSERT INTO {TRANSCRIPT_FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS transcript_segments_fts_ad
+    AFTER DELETE ON transcript_segments BEGIN
+        INSERT INTO {TRANSCRIPT_FTS_TABLE}({TRANSCRIPT_FTS_TABLE}, rowid, text)
+        VALUES ('delete', old.id, old.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS transcript_segments_fts_au
+    AFTER UPDATE OF text ON transcript_segments BEGIN
+        INSERT INTO {TRANSCRIPT_FTS_TABLE}({TRANSCRIPT_FTS_TABLE}, rowid, text)
+        VALUES ('delete', old.id, old.text);
+        INSERT INTO {TRANSCRIPT_FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+]
+
+
+def ddl_statements() -> list[str]:
+    """The statements run by :func:`init_fts_index`, for the schema version."""
+    return list(_CREATE_TRANSCRIPT_FTS)
+
+
+async def _fts_table_exists(conn: AsyncConnection) -> bool:
+    result = await conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": TRANSCRIPT_FTS_TABLE},
+    )
+    return result.first() is not None
+
+
+async def init_fts_index(conn: AsyncConnection) -> None:
+    """
+    Create the transcript FTS5 table and its sync triggers.
+
+    When the table is created for the first time on a database that already
+    holds transcript segments, the index is populated from them.
+
+    Args:
+        conn: Open connection inside a transaction.
+    """
+
+    existed = await _fts_table_exists(conn)
+    for statement in _CREATE_TRANSCRIPT_FTS:
+        await conn.execute(text(statement))
+    if not existed:
+        await _rebuild(conn)
+
+
+async def _rebuild(conn: AsyncConnection) -> None:
+    await conn.execute(
+        text(f"INSERT INTO {TRANSCRIPT_FTS_TABLE}({TRANSCRIPT_FTS_TABLE}) VALUES ('rebuild')")
+    )
+
+
+async def rebuild_fts_index(engine: AsyncEngine) -> None:
+    """
+    Rebuild the transcript FTS5 index from the ``transcript_segments`` table.
+
+    Args:
+        engine: Database engine.
+    """
+
+    async with engine.begin() as conn:
+        await init_fts_index(conn)
+        await _rebuild(conn)
+        await conn.execute(
+            text(f"INSERT INTO {TRANSCRIPT_FTS_TABLE}({TRANSCRIPT_FTS_TABLE}) VALUES ('optimize')")
+        )
+
+
+def build_match_expression(query: str) -> str:
+    """
+    Turn free-form user input into a safe FTS5 MATCH expression.
+
+    Every whitespace-separated term is quoted so that FTS5 operators and
+    punctuation in the input are matched literally; terms are ANDed.
+
+    Args:
+        query: Raw search query.
+
+    Returns:
+        str: FTS5 query string.
+    """
+
+    terms = [term.replace('"', '""') for term in query.split()]
+    return " ".join(f'"{term}"' for term in terms if term)
@@ -0,0 +1,87 @@
+"""Additive schema upgrades for databases created by older versions."""
+
+import hashlib
+from typing import Iterable
+
+from sqlalchemy import Connection, inspect
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateColumn, CreateIndex, CreateTable
+
+from app.db import base as db_base
+
+
+def add_missing_columns(conn: Connection) -> list[str]:
+    """
+    Add model columns that are missing from existing tables.
+
+    ``create_all`` only creates missing tables; this covers new nullable (or
+    defaulted) columns on tables that already exist.
+
+    Args:
+        conn: Synchronous connection inside a transaction.
+
+    Returns:
+        list[str]: ``table.column`` names that were added.
+    """
+
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    added = []
+    for table in db_base.Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present:
+                continue
+            ddl = CreateColumn(column).compile(dialect=conn.dialect)
+            conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+            added.append(f"{table.name}.{column.name}")
+    return added
+
+
+def create_missing_indexes(conn: Connection) -> None:
+    """
+    Create model indexes that are missing from existing tables.
+
+    Args:
+        conn: Synchronous connection inside a transaction.
+    """
+
+    for table in db_base.Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def schema_version(extra_ddl: Iterable[str] = ()) -> int:
+    """
+    Fingerprint the model schema and any extra DDL as a positive 31-bit integer.
+
+    Any change to a table, column, index or to ``extra_ddl`` changes the value,
+    so it can be stored in ``PRAGMA user_version`` to skip startup DDL checks
+    while the schema is unchanged.
+
+    Args:
+        extra_ddl: Statements run at startup outside of the model metadata.
+
+    Returns:
+        int: Schema version, never 0 (the value of a fresh database).
+    """
+
+    dialect = sqlite.dialect()
+    digest = hashlib.blake2b(digest_size=4)
+    for table in db_base.Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+    for statement in extra_ddl:
+        digest.update(" ".join(statement.split()).encode())
+    return int.from_bytes(digest.digest(), "big") & 0x7FFFFFFF or 1
+
+
+def read_schema_version(conn: Connection) -> int:
+    return int(conn.exec_driver_sql("PRAGMA user_version").scalar() or 0)
+
+
+def write_schema_version(conn: Connection, version: int) -> None:
+    conn.exec_driver_sql(f"PRAGMA user_version = {int(version)}")
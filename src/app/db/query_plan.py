@@ -0,0 +1,53 @@
+"""Inspect SQLite query plans to catch queries that scan whole tables or sort."""
+
+import re
+from typing import Iterable
+
+from sqlalchemy import Connection
+from sqlalchemy.sql import Executable
+
+_SCAN = re.compile(r"^SCAN (\w+)")
+
+
+def explain_query_plan(conn: Connection, stmt: Executable) -> list[str]:
+    """
+    Return the ``EXPLAIN QUERY PLAN`` detail lines for a statement.
+
+    Args:
+        conn: Synchronous connection (use ``AsyncConnection.run_sync``).
+        stmt: Statement to explain; bound parameters are used as compiled.
+
+    Returns:
+        list[str]: One line per plan step, e.g. ``SEARCH t USING INDEX ix (a=?)``.
+    """
+
+    compiled = stmt.compile(dialect=conn.dialect)  # type: ignore[attr-defined]
+    params = compiled.params
+    if compiled.positiontup is not None:
+        parameters: object = tuple(params[name] for name in compiled.positiontup)
+    else:
+        parameters = params
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", parameters)  # type: ignore
+    return [row[-1] for row in rows]
+
+
+def full_table_scans(plan: Iterable[str], tables: Iterable[str]) -> list[str]:
+    """
+    Pick the plan steps that read all rows of one of ``tables``.
+
+    Scans through an index (``SCAN t USING INDEX ix``) are reported as well:
+    a query filtered on a leading index column shows up as ``SEARCH``.
+    """
+
+    wanted = set(tables)
+    scans = []
+    for step in plan:
+        match = _SCAN.match(step.strip())
+        if match and match.group(1) in wanted:
+            scans.append(step)
+    return scans
+
+
+def temp_b_trees(plan: Iterable[str]) -> list[str]:
+    """Pick the plan steps that sort or deduplicate rows in a temporary B-tree."""
+    return [step for step in plan if "TEMP B-TREE" in step]
@@ -0,0 +1,102 @@
+"""Per-meeting and global change counters maintained by SQLite triggers."""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+# Asset tables whose changes bump the owning meeting's version.
+VERSIONED_ASSET_TABLES = ("transcript_segments", "screen_captures", "summaries")
+
+# Second precision, in the format SQLAlchemy's SQLite DateTime type parses.
+_NOW = "strftime('%Y-%m-%d %H:%M:%S', 'now')"
+
+
+def _bump(meeting_id: str) -> str:
+    return (
+        f"UPDATE meetings SET version = version + 1, updated_at = {_NOW} "
+        f"WHERE id = {meeting_id};"
+    )
+
+
+_BUMP_ALL = f"UPDATE meetings_state SET version = version + 1, updated_at = {_NOW} WHERE id = 1;"
+
+
+def _trigger_statements() -> list[str]:
+    statements = [f"""
+        CREATE TRIGGER IF NOT EXISTS meetings_version_au
+        AFTER UPDATE OF title, started_at, ended_at ON meetings BEGIN
+            {_bump("new.id")}
+        END
+        """]
+    # Any meeting version bump, creation or deletion bumps the global counter.
+    # Seeding from the existing meetings keeps it distinct from a fresh database's.
+    statements += [
+        """
+        INSERT OR IGNORE INTO meetings_state (id, version, updated_at)
+        SELECT 1, count(*) + coalesce(sum(version), 0), max(coalesce(updated_at, created_at))
+        FROM meetings
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS meetings_state_ai
+        AFTER INSERT ON meetings BEGIN
+            {_BUMP_ALL}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS meetings_state_au
+        AFTER UPDATE OF version ON meetings BEGIN
+            {_BUMP_ALL}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS meetings_state_ad
+        AFTER DELETE ON meetings BEGIN
+            {_BUMP_ALL}
+        END
+        """,
+    ]
+    for table in VERSIONED_ASSET_TABLES:
+        statements += [
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_version_ai
+            AFTER INSERT ON {table} BEGIN
+                {_bump("new.meeting_id")}
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_version_au
+            AFTER UPDATE ON {table} BEGIN
+                {_bump("new.meeting_id")}
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_version_ad
+            AFTER DELETE ON {table} BEGIN
+                {_bump("old.meeting_id")}
+            END
+            """,
+        ]
+    return statements
+
+
+def ddl_statements() -> list[str]:
+    """The statements run by :func:`init_version_triggers`, for the schema version."""
+    return _trigger_statements()
+
+
+async def init_version_triggers(conn: AsyncConnection) -> None:
+    """
+    Create the triggers that keep ``meetings.version`` and ``updated_at`` current.
+
+    Every insert, update or delete of a meeting's transcripts, captures or
+    summaries, and every change to the meeting itself, increments its version.
+    Those changes and the creation or deletion of a meeting also increment the
+    single row of ``meetings_state``, which validates meeting listings. Because
+    the counters live in the database they also cover rows written by the write
+    buffer or by other processes.
+
+    Args:
+        conn: Open connection inside a transaction.
+    """
+
+    for statement in _trigger_statements():
+        await conn.execute(text(statement))
@@ -0,0 +1,166 @@
+"""Group-commit write-behind buffer shared by the capture services."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Optional, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core import metrics
+from app.db.base import Base
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", bound=Base)
+
+
+class WriteBuffer:
+    """
+    Batch ORM inserts from many producers into few SQLite transactions.
+
+    Objects are queued by :meth:`enqueue` and written by a background task in a
+    single transaction once ``max_batch`` objects are pending or ``max_delay``
+    seconds have passed since the first pending one. Callers that need the
+    primary key await :meth:`add`, which resolves after the batch commits. If
+    a batch fails, its objects are retried one at a time, so only the callers
+    of objects that cannot be inserted get the error.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        max_batch: int = 256,
+        max_delay: float = 0.5,
+    ) -> None:
+        self.session_maker = session_maker
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending: list[tuple[Base, asyncio.Future[Base]]] = []
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task[None]] = None
+        self._closed = False
+
+    def start(self) -> None:
+        """Start the background flusher."""
+        if self._task is None:
+            self._closed = False
+            self._task = asyncio.create_task(self._run(), name="write-buffer")
+
+    async def close(self) -> None:
+        """Stop the background flusher and flush everything still pending."""
+        self._closed = True
+        if self._task is not None:
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    @property
+    def pending(self) -> int:
+        """Number of objects queued and not yet written."""
+        return len(self._pending)
+
+    def enqueue(self, obj: ModelT) -> asyncio.Future[ModelT]:
+        """
+        Queue ``obj`` for insertion without waiting.
+
+        Returns:
+            asyncio.Future: Resolves to ``obj`` once it is committed.
+        """
+        if self._closed:
+            raise RuntimeError("WriteBuffer is closed")
+        future: asyncio.Future[ModelT] = asyncio.get_running_loop().create_future()
+        self._pending.append((obj, future))  # type: ignore[arg-type]
+        if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+        return future
+
+    async def add(self, obj: ModelT) -> ModelT:
+        """Queue ``obj`` and wait until it is committed, with its primary key set."""
+        return await self.enqueue(obj)
+
+    async def flush(self) -> None:
+        """Write every pending object now."""
+        async with self._flush_lock:
+            while self._pending:
+                batch, self._pending = self._pending, []
+                await self._write(batch)
+
+    async def _run(self) -> None:
+        while not self._closed:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if not self._pending:
+                continue
+            if len(self._pending) < self.max_batch and not self._closed:
+                try:
+                    await asyncio.wait_for(self._wait_full(), timeout=self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            async with self._flush_lock:
+                batch = self._pending[: self.max_batch]
+                del self._pending[: self.max_batch]
+                await self._write(batch)
+            if self._pending:
+                self._wakeup.set()
+
+    async def _wait_full(self) -> None:
+        while len(self._pending) < self.max_batch and not self._closed:
+            self._wakeup.clear()
+            await self._wakeup.wait()
+
+    async def _write(self, batch: list[tuple[Base, asyncio.Future[Base]]]) -> None:
+        if not batch:
+            return
+        try:
+            await self._commit([obj for obj, _ in batch])
+        except Exception as exc:
+            if len(batch) > 1:
+                # The rolled-back objects are transient again; retry them one by
+                # one so that only the producers of failing objects see an error.
+                logger.warning(
+                    "Write buffer flush of %d objects failed; retrying them one by one",
+                    len(batch),
+                )
+                for item in batch:
+                    await self._write([item])
+                return
+            obj, future = batch[0]
+            logger.exception("Write buffer insert of %r failed", obj)
+            if not future.done():
+                future.set_exception(exc)
+            return
+        for obj, future in batch:
+            if not future.done():
+                future.set_result(obj)
+
+    async def _commit(self, objects: list[Base]) -> None:
+        async with self.session_maker() as session:
+            session.add_all(objects)
+            with metrics.DB_COMMIT_LATENCY.labels("write_buffer").time():
+                await session.commit()
+        metrics.DB_ROWS_WRITTEN.inc(len(objects))
+
+
+async def persist(
+    obj: ModelT, session: AsyncSession, write_buffer: Optional[WriteBuffer] = None
+) -> ModelT:
+    """
+    Insert ``obj`` through the write buffer when one is configured.
+
+    Without a buffer the object is committed directly on ``session``. With one,
+    ``session`` may have read in its current transaction, but it must not hold
+    uncommitted writes: the buffer's commit would wait for SQLite's writer lock
+    until ``busy_timeout``.
+    """
+
+    if write_buffer is not None:
+        return await write_buffer.add(obj)
+    session.add(obj)
+    with metrics.DB_COMMIT_LATENCY.labels("direct").time():
+        await session.commit()
+    metrics.DB_ROWS_WRITTEN.inc()
+    return obj
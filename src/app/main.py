@@ -1,33 +1,121 @@
-from typing import AsyncGenerator
+import logging
+import time
+from typing import AsyncGenerator, Iterable, Optional
 
 from fastapi import APIRouter, FastAPI
 from fastapi.exceptions import RequestValidationError
 
-from app.core import errors, exception_handlers
+from app.core import errors, exception_handlers, http_cache, metrics
 from app.core import settings as app_settings
-from app.db import database
+from app.core import tracing
+from app.db import database, write_buffer
+from app.routers import health as health_router
+from app.routers import metrics as metrics_router
 from app.routers import v1 as v1_router
+from app.services.events import EventBroker
+from app.services.model_pool import ModelSpec, ModelWorkerPool
+from app.services.vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
 
 
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    settings = app_settings.Settings()
-    app.state.settings = settings
+    started = time.perf_counter()
+    settings: app_settings.Settings = app.state.settings
+
+    # Model workers start on first use (eager ones now, in the background), one
+    # per model, shared by all meetings; /ready reports when the eager ones are up
+    app.state.model_pool = ModelWorkerPool(
+        app.state.model_specs,
+        memory_budget_mb=settings.models.MEMORY_BUDGET_MB,
+        warmup=settings.app.WARMUP_BACKENDS,
+    )
+    app.state.model_pool.start()
 
     # Initialize database
     engine = database.create_db_engine(settings.db)
     db_session_maker = database.create_session_factory(engine)
     app.state.db_engine = engine
     app.state.db_session_maker = db_session_maker
-    await database.init_db_tables(engine)
+    schema_checked = await database.init_db_tables(engine)
+
+    read_engine = database.create_db_engine(settings.db, read_only=True)
+    app.state.db_read_engine = read_engine
+    app.state.db_read_session_maker = database.create_session_factory(read_engine)
+
+    # The write buffer commits through a writer connection of its own: request
+    # sessions hold the main writer connection for their whole transaction, and
+    # one awaiting persist() would otherwise wait for itself.
+    buffer_engine = database.create_db_engine(settings.db)
+    app.state.db_buffer_engine = buffer_engine
+    buffer = write_buffer.WriteBuffer(
+        database.create_session_factory(buffer_engine),
+        max_batch=settings.db.WRITE_BUFFER_MAX_BATCH,
+        max_delay=settings.db.WRITE_BUFFER_MAX_DELAY,
+    )
+    buffer.start()
+    app.state.write_buffer = buffer
+    metrics.WRITE_BUFFER_PENDING.set_function(lambda: buffer.pending)
+
+    app.state.response_cache = http_cache.ResponseCache(settings.app.RESPONSE_CACHE_SIZE)
+
+    # One capture embedding index per process, shared by search and vision
+    app.state.vector_index = VectorIndex.shared(
+        settings.paths.DATA_DIR / settings.vectors.DIR_NAME,
+        train_threshold=settings.vectors.TRAIN_THRESHOLD,
+    )
+
+    app.state.event_broker = EventBroker(
+        queue_size=settings.events.QUEUE_SIZE,
+        history_size=settings.events.HISTORY_SIZE,
+        max_topics=settings.events.MAX_MEETINGS,
+    )
+    metrics.EVENT_SUBSCRIBERS.set_function(app.state.event_broker.subscriber_count)
+
+    tracing.tracer.configure(
+        enabled=settings.tracing.ENABLED,
+        spans_per_meeting=settings.tracing.SPANS_PER_MEETING,
+        max_meetings=settings.tracing.MAX_MEETINGS,
+        path=settings.tracing.FILE,
+    )
+
+    app.state.startup_seconds = time.perf_counter() - started
+    logger.info(
+        "Started in %.3fs (%s)",
+        app.state.startup_seconds,
+        "schema checked" if schema_checked else "schema version unchanged",
+    )
 
     yield
 
+    await app.state.model_pool.close()
+
+    # End live-update subscriptions so WebSocket handlers return
+    app.state.event_broker.close()
+    metrics.EVENT_SUBSCRIBERS.set_function(None)
+    tracing.tracer.close()
+
+    # Flush buffered writes before the engine goes away
+    await buffer.close()
+    metrics.WRITE_BUFFER_PENDING.set_function(None)
+
     # Database shutdown
+    await read_engine.dispose()
+    await buffer_engine.dispose()
     await engine.dispose()
 
 
-def create_app() -> FastAPI:
-    settings = app_settings.Settings()
+def create_app(
+    settings: Optional[app_settings.Settings] = None,
+    models: Iterable[ModelSpec] = (),
+) -> FastAPI:
+    """
+    Build the application; settings are read from the environment if not given.
+
+    ``models`` run in shared worker processes, started at startup when eager or
+    else on first use, and available from :func:`app.core.deps.get_model_pool`.
+    """
+    settings = settings or app_settings.Settings()
 
     app = FastAPI(
         title=settings.app.NAME,
@@ -35,6 +123,8 @@ def create_app() -> FastAPI:
         description="Local meeting assistant",
         lifespan=lifespan,
     )
+    app.state.settings = settings
+    app.state.model_specs = list(models)
 
     # Exception handlers
     app.add_exception_handler(errors.AppError, exception_handlers.app_error_handler)
@@ -44,8 +134,13 @@ def create_app() -> FastAPI:
     )
 
     # Routers
+    app.include_router(health_router.router)
     api_router = APIRouter(prefix="/api")
     api_router.include_router(v1_router.router)
     app.include_router(api_router)
 
+    if settings.app.METRICS_ENABLED:
+        app.include_router(metrics_router.router)
+        app.add_middleware(metrics.MetricsMiddleware)
+
     return app
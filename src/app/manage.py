@@ -0,0 +1,69 @@
+"""Maintenance commands for an existing Callyfy database.
+
+Usage::
+
+    python -m app.manage rebuild-fts
+    python -m app.manage convert-embeddings [--dtype float16] [--meeting ID] [--keep]
+"""
+
+import argparse
+import asyncio
+
+from app.core import settings as app_settings
+from app.db import database, fts
+from app.services.embedding_store import EmbeddingDType, convert_legacy_embeddings
+
+
+async def _rebuild_fts(settings: app_settings.Settings) -> None:
+    engine = database.create_db_engine(settings.db)
+    try:
+        await database.init_db_tables(engine)
+        await fts.rebuild_fts_index(engine)
+    finally:
+        await engine.dispose()
+
+
+async def _convert_embeddings(
+    settings: app_settings.Settings, dtype: EmbeddingDType, meeting_id: str | None, keep: bool
+) -> int:
+    engine = database.create_db_engine(settings.db)
+    try:
+        await database.init_db_tables(engine)
+        async with database.create_session_factory(engine)() as session:
+            return await convert_legacy_embeddings(
+                session, dtype=dtype, meeting_id=meeting_id, delete=not keep
+            )
+    finally:
+        await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="app.manage", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild-fts", help="Rebuild the transcript full-text index")
+    convert = commands.add_parser(
+        "convert-embeddings",
+        help="Move per-capture .emb files into per-meeting embedding stores",
+    )
+    convert.add_argument(
+        "--dtype",
+        type=EmbeddingDType,
+        choices=list(EmbeddingDType),
+        default=EmbeddingDType.FLOAT16,
+        help="Storage type for new stores (default: float16)",
+    )
+    convert.add_argument("--meeting", help="Only convert this meeting")
+    convert.add_argument("--keep", action="store_true", help="Keep the .emb files")
+
+    args = parser.parse_args(argv)
+    settings = app_settings.Settings()
+
+    if args.command == "rebuild-fts":
+        asyncio.run(_rebuild_fts(settings))
+    elif args.command == "convert-embeddings":
+        converted = asyncio.run(_convert_embeddings(settings, args.dtype, args.meeting, args.keep))
+        print(f"Converted {converted} screen captures")
+
+
+if __name__ == "__main__":
+    main()
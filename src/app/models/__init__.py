@@ -1,17 +1,23 @@
 from .meeting import (
     Meeting,
+    MeetingsState,
     Participant,
     RawAudioArtifact,
     ScreenCapture,
+    SummaryNode,
     SummaryRecord,
+    TranscriptionCheckpoint,
     TranscriptSegment,
 )
 
 __all__ = [
     "Meeting",
+    "MeetingsState",
     "Participant",
     "TranscriptSegment",
     "ScreenCapture",
     "SummaryRecord",
+    "SummaryNode",
     "RawAudioArtifact",
+    "TranscriptionCheckpoint",
 ]
@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import List, Optional
 from uuid import uuid4
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -12,12 +12,16 @@ from app.db.base import Base
 
 class Meeting(Base):
     __tablename__ = "meetings"
+    __table_args__ = (Index("ix_meetings_created_at_id", "created_at", "id"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     ended_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # Maintained by triggers (see app.db.versioning); bumped on any asset change.
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
     participants: Mapped[List[Participant]] = relationship("Participant", back_populates="meeting")
     transcripts: Mapped[List[TranscriptSegment]] = relationship(
@@ -49,6 +53,9 @@ class Participant(Base):
 
 class TranscriptSegment(Base):
     __tablename__ = "transcript_segments"
+    __table_args__ = (
+        Index("ix_transcript_segments_meeting_id_started_at", "meeting_id", "started_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     meeting_id: Mapped[str] = mapped_column(
@@ -61,6 +68,7 @@ class TranscriptSegment(Base):
     ended_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     text: Mapped[str] = mapped_column(Text, nullable=False)
     confidence: Mapped[Optional[float]] = mapped_column(nullable=True)
+    trace_id: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
 
     meeting: Mapped[Meeting] = relationship("Meeting", back_populates="transcripts")
     speaker: Mapped[Optional[Participant]] = relationship("Participant")
@@ -68,6 +76,9 @@ class TranscriptSegment(Base):
 
 class ScreenCapture(Base):
     __tablename__ = "screen_captures"
+    __table_args__ = (
+        Index("ix_screen_captures_meeting_id_captured_at", "meeting_id", "captured_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     meeting_id: Mapped[str] = mapped_column(
@@ -75,14 +86,25 @@ class ScreenCapture(Base):
     )
     captured_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     image_path: Mapped[str] = mapped_column(String(512), nullable=False)
+    thumbnail_path: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    image_digest: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     embeddings_path: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    frame_hash: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
+    duplicate_of_id: Mapped[Optional[int]] = mapped_column(
+        Integer, ForeignKey("screen_captures.id", ondelete="SET NULL"), nullable=True
+    )
 
     meeting: Mapped[Meeting] = relationship("Meeting", back_populates="screen_captures")
 
 
 class SummaryRecord(Base):
     __tablename__ = "summaries"
+    # The first serves latest-summary lookups, the second time-ordered reads of all kinds.
+    __table_args__ = (
+        Index("ix_summaries_meeting_id_kind_generated_at", "meeting_id", "kind", "generated_at"),
+        Index("ix_summaries_meeting_id_generated_at", "meeting_id", "generated_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     meeting_id: Mapped[str] = mapped_column(
@@ -92,12 +114,35 @@ class SummaryRecord(Base):
     generated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     model_name: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    trace_id: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
 
     meeting: Mapped[Meeting] = relationship("Meeting", back_populates="summaries")
 
 
+class SummaryNode(Base):
+    """Condensed summary of a contiguous run of transcript segments or of child nodes."""
+
+    __tablename__ = "summary_nodes"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    meeting_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("meetings.id", ondelete="CASCADE")
+    )
+    level: Mapped[int] = mapped_column(Integer, nullable=False)  # 0 = summary of segments
+    first_segment_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_segment_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    parent_id: Mapped[Optional[int]] = mapped_column(
+        Integer, ForeignKey("summary_nodes.id", ondelete="SET NULL"), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
 class RawAudioArtifact(Base):
     __tablename__ = "raw_audio_artifacts"
+    __table_args__ = (
+        Index("ix_raw_audio_artifacts_meeting_id_recorded_at", "meeting_id", "recorded_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     meeting_id: Mapped[str] = mapped_column(
@@ -107,5 +152,31 @@ class RawAudioArtifact(Base):
     file_path: Mapped[str] = mapped_column(String(512), nullable=False)
     sample_rate: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     duration_seconds: Mapped[Optional[float]] = mapped_column(nullable=True)
+    codec: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)  # None = as recorded
 
     meeting: Mapped[Meeting] = relationship("Meeting", back_populates="audio_artifacts")
+
+
+class TranscriptionCheckpoint(Base):
+    """Progress of a sliced post-meeting transcription, for resuming after a crash."""
+
+    __tablename__ = "transcription_checkpoints"
+
+    artifact_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("raw_audio_artifacts.id", ondelete="CASCADE"), primary_key=True
+    )
+    slice_bounds: Mapped[str] = mapped_column(Text, nullable=False)  # JSON [[start, end], ...]
+    completed_slices: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
+class MeetingsState(Base):
+    """Single-row change counter over all meetings, kept current by triggers."""
+
+    __tablename__ = "meetings_state"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)  # always 1
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
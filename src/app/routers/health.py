@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+
+from fastapi import APIRouter, Depends, Request, Response, status
+
+from app.core import deps
+from app.schemas import ModelStatusResponse, ReadinessResponse
+from app.services import ModelWorkerPool
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/health")
+async def health() -> dict[str, str]:
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@router.get("/ready", response_model=ReadinessResponse)
+async def ready(
+    request: Request,
+    response: Response,
+    model_pool: ModelWorkerPool = Depends(deps.get_model_pool),
+) -> ReadinessResponse:
+    """
+    Readiness: 200 once every eager model worker has started, 503 before.
+    """
+    ready = model_pool.ready
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return ReadinessResponse(
+        ready=ready,
+        startup_seconds=getattr(request.app.state, "startup_seconds", None),
+        models={
+            name: ModelStatusResponse(**asdict(model_status))
+            for name, model_status in model_pool.status().items()
+        },
+    )
@@ -1,6 +1,9 @@
 from fastapi import APIRouter
 
-from . import meetings
+from . import audio, captures, debug, meetings
 
 router = APIRouter(prefix="/v1")
 router.include_router(meetings.router)
+router.include_router(audio.router)
+router.include_router(captures.router)
+router.include_router(debug.router)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional, Union
+
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import deps
+from app.models import RawAudioArtifact
+from app.schemas import AudioIndexResponse, AudioSegmentResponse
+from app.services.audio_archive import CODEC, AudioArchive, is_archive, wav_header
+
+router = APIRouter(prefix="/meetings", tags=["audio"])
+
+_MEDIA_TYPES = {".wav": "audio/wav", ".flac": "audio/flac", ".flacseg": "application/octet-stream"}
+
+
+async def _get_artifact(meeting_id: str, artifact_id: int, session: AsyncSession) -> Path:
+    artifact = await session.get(RawAudioArtifact, artifact_id)
+    if artifact is None or artifact.meeting_id != meeting_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recording not found")
+    path = Path(artifact.file_path)
+    if not await anyio.Path(path).exists():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recording file missing")
+    return path
+
+
+@router.get("/{meeting_id}/audio/{artifact_id}", response_model=None)
+async def get_recording(
+    meeting_id: str,
+    artifact_id: int,
+    start: Optional[float] = Query(None, ge=0, description="Range start, in seconds"),
+    end: Optional[float] = Query(None, gt=0, description="Range end, in seconds"),
+    session: AsyncSession = Depends(deps.get_session),
+) -> Union[FileResponse, StreamingResponse]:
+    """
+    Serve a meeting recording.
+
+    Without ``start``/``end`` the stored file is sent as is, honouring HTTP
+    ``Range`` requests (and zero-copy ``sendfile`` when the server supports
+    it). Combined with the seek index from ``/index``, this lets a client
+    fetch individual compressed segments. With ``start`` and/or ``end``, only
+    the segments overlapping that time range are decoded and streamed as WAV.
+    """
+    path = await _get_artifact(meeting_id, artifact_id, session)
+    if start is None and end is None:
+        return FileResponse(
+            path, media_type=_MEDIA_TYPES.get(path.suffix, "application/octet-stream")
+        )
+    if not is_archive(path):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Time ranges are only available for compressed recordings",
+        )
+
+    archive = await anyio.to_thread.run_sync(AudioArchive, path)
+    first, last = archive.frame_range(start or 0.0, end)
+    header = wav_header(archive.sample_rate, archive.channels, last - first)
+    length = len(header) + (last - first) * archive.channels * 2
+    # A sync iterator: Starlette decodes each segment in its thread pool.
+    return StreamingResponse(
+        archive.iter_wav(start or 0.0, end),
+        media_type="audio/wav",
+        headers={"Content-Length": str(length)},
+    )
+
+
+@router.get("/{meeting_id}/audio/{artifact_id}/index", response_model=AudioIndexResponse)
+async def get_recording_index(
+    meeting_id: str,
+    artifact_id: int,
+    session: AsyncSession = Depends(deps.get_session),
+) -> AudioIndexResponse:
+    """Return the time-to-byte seek index of a compressed recording."""
+    path = await _get_artifact(meeting_id, artifact_id, session)
+    if not is_archive(path):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Recording is not compressed"
+        )
+    archive = await anyio.to_thread.run_sync(AudioArchive, path)
+    return AudioIndexResponse(
+        artifact_id=artifact_id,
+        codec=CODEC,
+        sample_rate=archive.sample_rate,
+        channels=archive.channels,
+        duration_seconds=archive.duration_seconds,
+        segments=[
+            AudioSegmentResponse(
+                start_seconds=segment.start_frame / archive.sample_rate,
+                frames=segment.frames,
+                offset=segment.offset,
+                length=segment.length,
+            )
+            for segment in archive.segments
+        ],
+    )
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import deps
+from app.models import ScreenCapture
+
+router = APIRouter(prefix="/meetings", tags=["captures"])
+
+_MEDIA_TYPES = {".webp": "image/webp", ".avif": "image/avif", ".png": "image/png"}
+
+
+async def _serve(
+    meeting_id: str, capture_id: int, session: AsyncSession, thumbnail: bool
+) -> FileResponse:
+    capture = await session.get(ScreenCapture, capture_id)
+    if capture is None or capture.meeting_id != meeting_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Capture not found")
+    stored: Optional[str] = capture.thumbnail_path if thumbnail else capture.image_path
+    if not stored or not await anyio.Path(stored).exists():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Image not available")
+    path = Path(stored)
+    headers = {}
+    if capture.image_digest:
+        # Content-addressed files never change, so clients may cache them indefinitely.
+        headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return FileResponse(
+        path,
+        media_type=_MEDIA_TYPES.get(path.suffix, "application/octet-stream"),
+        headers=headers,
+    )
+
+
+@router.get("/{meeting_id}/captures/{capture_id}/image")
+async def get_capture_image(
+    meeting_id: str,
+    capture_id: int,
+    session: AsyncSession = Depends(deps.get_session),
+) -> FileResponse:
+    """Serve a screen capture at full resolution."""
+    return await _serve(meeting_id, capture_id, session, thumbnail=False)
+
+
+@router.get("/{meeting_id}/captures/{capture_id}/thumbnail")
+async def get_capture_thumbnail(
+    meeting_id: str,
+    capture_id: int,
+    session: AsyncSession = Depends(deps.get_session),
+) -> FileResponse:
+    """Serve the small preview generated when the capture was stored."""
+    return await _serve(meeting_id, capture_id, session, thumbnail=True)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime, timezone
+from statistics import quantiles
+from typing import Optional
+
+from fastapi import APIRouter, Query
+
+from app.core.tracing import Span, tracer
+from app.schemas import MeetingTracesResponse, SpanResponse, StageLatency, TraceResponse
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+
+def _utc(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+def _stage(name: str, durations: list[float]) -> StageLatency:
+    if len(durations) < 2:
+        p50 = p99 = durations[0]
+    else:
+        cuts = quantiles(durations, n=100, method="inclusive")
+        p50, p99 = cuts[49], cuts[98]
+    return StageLatency(name=name, count=len(durations), p50_ms=p50 * 1000, p99_ms=p99 * 1000)
+
+
+def _trace(trace_id: str, spans: list[Span]) -> TraceResponse:
+    spans.sort(key=lambda s: s.start)
+    start = spans[0].start
+    return TraceResponse(
+        trace_id=trace_id,
+        started_at=_utc(start),
+        duration_ms=(max(s.end for s in spans) - start) * 1000,
+        spans=[
+            SpanResponse(
+                name=s.name,
+                started_at=_utc(s.start),
+                duration_ms=s.duration * 1000,
+                attributes=s.attributes,
+            )
+            for s in spans
+        ],
+    )
+
+
+@router.get("/meetings/{meeting_id}/traces", response_model=MeetingTracesResponse)
+async def get_meeting_traces(
+    meeting_id: str,
+    limit: int = Query(50, ge=1, le=1000, description="Number of most recent traces"),
+    trace_id: Optional[str] = Query(None, description="Return only this trace"),
+) -> MeetingTracesResponse:
+    """
+    Show where live-pipeline latency goes for a meeting.
+
+    Reads the in-memory span buffer only, so it is cheap to poll during a call.
+    ``stages`` summarizes every buffered span by name; ``summarized`` spans
+    measure capture-to-summary latency per chunk.
+    """
+    spans = tracer.spans(meeting_id, trace_id)
+    by_stage: defaultdict[str, list[float]] = defaultdict(list)
+    by_trace: dict[str, list[Span]] = {}
+    for span in spans:
+        by_stage[span.name].append(span.duration)
+        by_trace.setdefault(span.trace_id, []).append(span)
+
+    # Traces are ordered by first appearance; the newest are at the end.
+    recent = list(by_trace.items())[-limit:]
+    return MeetingTracesResponse(
+        meeting_id=meeting_id,
+        stages=[_stage(name, durations) for name, durations in sorted(by_stage.items())],
+        traces=[_trace(tid, trace_spans) for tid, trace_spans in reversed(recent)],
+    )
@@ -1,33 +1,81 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import anyio
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core import deps
+from app.core.http_cache import (
+    ResponseCache,
+    cache_headers,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+)
+from app.core.tracing import tracer
 from app.models import Meeting
-from app.schemas import MeetingCreate, MeetingList, MeetingResponse
-from app.services import StorageService
+from app.schemas import MeetingCreate, MeetingPage, MeetingResponse
+from app.services import AssetKind, EventBroker, StorageService
+from app.services.events import record_payload
+from app.services.export import ExportFormat, iter_export
+from app.services.storage import decode_cursor, decode_timeline_cursor
 
 router = APIRouter(prefix="/meetings", tags=["meetings"])
 
 
-@router.get("/", response_model=list[MeetingList])
+@router.get("/", response_model=MeetingPage)
 async def list_meetings(
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page"),
+    include_counts: bool = Query(False, description="Include per-meeting asset counts"),
     session: AsyncSession = Depends(deps.get_session),
-    storage: StorageService = Depends(),
-) -> list[Meeting]:
-    """List all meetings."""
-    meetings = await storage.list_meetings(session)
-    return meetings
+    storage: StorageService = Depends(deps.get_storage),
+    cache: ResponseCache = Depends(deps.get_response_cache),
+) -> Response:
+    """List meetings, newest first, one page at a time. Supports conditional GET."""
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    version, last_modified = await storage.meetings_state(session)
+    etag = make_etag("meetings", version, last_modified, limit, cursor, include_counts)
+    headers = cache_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(headers)
+
+    key = str(request.url)
+    body = cache.get(key, etag)
+    if body is None:
+        page = await storage.list_meetings(
+            session, limit=limit, after=after, include_counts=include_counts
+        )
+        body = MeetingPage.model_validate(page).model_dump_json().encode()
+        cache.put(key, etag, body)
+    return Response(body, media_type="application/json", headers=headers)
 
 
 @router.post("/", response_model=MeetingResponse, status_code=status.HTTP_201_CREATED)
 async def create_meeting(
     meeting_data: MeetingCreate,
     session: AsyncSession = Depends(deps.get_session),
-    storage: StorageService = Depends(),
+    storage: StorageService = Depends(deps.get_storage),
 ) -> Meeting:
     """Create a new meeting."""
     meeting = await storage.create_meeting(title=meeting_data.title, session=session)
@@ -37,19 +85,46 @@ async def create_meeting(
 @router.get("/{meeting_id}", response_model=MeetingResponse)
 async def get_meeting(
     meeting_id: str,
+    request: Request,
     session: AsyncSession = Depends(deps.get_session),
-) -> Meeting:
-    """Get a specific meeting by ID."""
-    meeting = await session.get(Meeting, meeting_id)
-    if not meeting:
+    cache: ResponseCache = Depends(deps.get_response_cache),
+) -> Response:
+    """
+    Get a specific meeting by ID.
+
+    Only the meeting's version is read before answering ``If-None-Match`` /
+    ``If-Modified-Since`` with 304, or serving a cached body for that version.
+    """
+    state = (
+        await session.execute(
+            select(Meeting.version, Meeting.created_at, Meeting.updated_at).where(
+                Meeting.id == meeting_id
+            )
+        )
+    ).first()
+    if state is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Meeting not found")
-    return meeting
+
+    etag = make_etag("meeting", meeting_id, state.version)
+    last_modified = state.updated_at or state.created_at
+    headers = cache_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(headers)
+
+    key = request.url.path
+    body = cache.get(key, etag)
+    if body is None:
+        meeting = await session.get(Meeting, meeting_id)
+        body = MeetingResponse.model_validate(meeting).model_dump_json().encode()
+        cache.put(key, etag, body)
+    return Response(body, media_type="application/json", headers=headers)
 
 
 @router.post("/{meeting_id}/start", response_model=MeetingResponse)
 async def start_meeting(
     meeting_id: str,
     session: AsyncSession = Depends(deps.get_session),
+    broker: EventBroker = Depends(deps.get_broker),
 ) -> Meeting:
     """Mark a meeting as started."""
     meeting = await session.get(Meeting, meeting_id)
@@ -59,6 +134,7 @@ async def start_meeting(
         meeting.started_at = datetime.utcnow()
     await session.commit()
     await session.refresh(meeting)
+    broker.publish(meeting.id, "meeting", record_payload(meeting))
     return meeting
 
 
@@ -66,8 +142,9 @@ async def start_meeting(
 async def stop_meeting(
     meeting_id: str,
     session: AsyncSession = Depends(deps.get_session),
+    broker: EventBroker = Depends(deps.get_broker),
 ) -> Meeting:
-    """Mark a meeting as ended."""
+    """Mark a meeting as ended, close its live-update subscriptions and drop its traces."""
     meeting = await session.get(Meeting, meeting_id)
     if not meeting:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Meeting not found")
@@ -75,4 +152,110 @@ async def stop_meeting(
         meeting.ended_at = datetime.utcnow()
     await session.commit()
     await session.refresh(meeting)
+    broker.publish(meeting.id, "meeting", record_payload(meeting))
+    # Subscribers still receive the event above before their stream ends.
+    broker.forget(meeting.id)
+    tracer.forget(meeting.id)
     return meeting
+
+
+@router.get("/{meeting_id}/export")
+async def export_meeting(
+    meeting_id: str,
+    request: Request,
+    fmt: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    kinds: list[AssetKind] = Query(
+        [AssetKind.TRANSCRIPT, AssetKind.SUMMARY, AssetKind.CAPTURE],
+        alias="kind",
+        description="Asset types to include",
+    ),
+    cursor: Optional[str] = Query(None, description="Resume after the record with this `cursor`"),
+    gzip: bool = Query(False, description="Gzip the response body"),
+    session: AsyncSession = Depends(deps.get_session),
+    storage: StorageService = Depends(deps.get_storage),
+) -> StreamingResponse:
+    """
+    Stream a meeting's merged timeline as NDJSON or CSV.
+
+    Rows are read and serialized in batches, so memory use is constant
+    regardless of meeting length. Each record includes its ``cursor``; pass the
+    last one received to resume an interrupted export.
+    """
+    try:
+        after = decode_timeline_cursor(cursor) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    if not await session.get(Meeting, meeting_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Meeting not found")
+
+    session_maker = request.app.state.db_read_session_maker
+
+    async def body():
+        # The request-scoped session may be closed before the body is consumed.
+        async with session_maker() as export_session:
+            entries = storage.iter_meeting_timeline(
+                meeting_id, export_session, kinds=kinds, after=after
+            )
+            async for chunk in iter_export(entries, fmt, compress=gzip, header=after is None):
+                yield chunk
+
+    extension = "ndjson" if fmt is ExportFormat.NDJSON else "csv"
+    headers = {"Content-Disposition": f'attachment; filename="{meeting_id}.{extension}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body(), media_type=fmt.media_type, headers=headers)
+
+
+@router.websocket("/{meeting_id}/events")
+async def meeting_events(
+    websocket: WebSocket,
+    meeting_id: str,
+    after: Optional[int] = Query(None, description="Resume after this event `seq`"),
+    broker: EventBroker = Depends(deps.get_broker),
+) -> None:
+    """
+    Push a meeting's transcript, capture, summary and state events as they are persisted.
+
+    Each message is a JSON object with ``seq``, ``type``, ``meeting_id``,
+    ``published_at`` and ``data``. Reconnect with ``after`` set to the last
+    ``seq`` received to continue without gaps. A ``resync`` message means the
+    events since then are no longer available and state should be reloaded
+    over REST. Clients that fall too far behind are closed with code 1013.
+    """
+    async with websocket.app.state.db_read_session_maker() as session:
+        exists = await session.get(Meeting, meeting_id) is not None
+    if not exists:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Meeting not found")
+        return
+
+    await websocket.accept()
+    with broker.subscribe(meeting_id, after_seq=after) as subscription:
+        if subscription.resync:
+            await websocket.send_json({"type": "resync", "meeting_id": meeting_id})
+
+        disconnected = False
+
+        async def watch_disconnect(scope: anyio.CancelScope) -> None:
+            nonlocal disconnected
+            try:
+                while True:
+                    await websocket.receive_text()
+            except WebSocketDisconnect:
+                disconnected = True
+            scope.cancel()
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(watch_disconnect, tg.cancel_scope)
+            async for event in subscription:
+                await websocket.send_text(event.message)
+            tg.cancel_scope.cancel()
+
+    if disconnected:
+        return
+    if subscription.evicted:
+        await websocket.close(
+            code=status.WS_1013_TRY_AGAIN_LATER,
+            reason=f"Too slow; reconnect with after={subscription.last_seq}",
+        )
+    else:
+        await websocket.close()
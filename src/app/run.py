@@ -1,15 +1,11 @@
 import uvicorn
 
+from app.core.settings import Settings
 from app.main import create_app
 
-app = create_app()
-
-
 if __name__ == "__main__":
-    uvicorn.run(
-        app,
-        host=app.state.settings.app.HOST,
-        port=app.state.settings.app.PORT,
-        reload=True,
-        reload_dirs=["src"],
-    )
+    # One settings object for both the app and the address it listens on. For
+    # auto-reload during development, use `uvicorn app.main:create_app --factory
+    # --reload` instead.
+    settings = Settings()
+    uvicorn.run(create_app(settings), host=settings.app.HOST, port=settings.app.PORT)
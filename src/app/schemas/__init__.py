@@ -1,6 +1,12 @@
 """Pydantic schemas for API request/response validation."""
 
-from .audio import RawAudioArtifactBase, RawAudioArtifactCreate, RawAudioArtifactResponse
+from .audio import (
+    AudioIndexResponse,
+    AudioSegmentResponse,
+    RawAudioArtifactBase,
+    RawAudioArtifactCreate,
+    RawAudioArtifactResponse,
+)
 from .base import BaseSchema
 from .capture import (
     ScreenCaptureBase,
@@ -8,10 +14,12 @@ from .capture import (
     ScreenCaptureList,
     ScreenCaptureResponse,
 )
+from .health import ModelStatusResponse, ReadinessResponse
 from .meeting import (
     MeetingBase,
     MeetingCreate,
     MeetingList,
+    MeetingPage,
     MeetingResponse,
     MeetingUpdate,
     MeetingWithParticipants,
@@ -21,6 +29,7 @@ from .meeting import (
 )
 from .search import SearchQuery, SearchResults, VisualSearchQuery, VisualSearchResults
 from .summary import SummaryBase, SummaryCreate, SummaryKind, SummaryList, SummaryResponse
+from .trace import MeetingTracesResponse, SpanResponse, StageLatency, TraceResponse
 from .transcript import (
     TranscriptSegmentBase,
     TranscriptSegmentCreate,
@@ -36,6 +45,7 @@ __all__ = [
     "MeetingCreate",
     "MeetingResponse",
     "MeetingList",
+    "MeetingPage",
     "MeetingUpdate",
     "MeetingWithParticipants",
     "ParticipantBase",
@@ -61,9 +71,19 @@ __all__ = [
     "RawAudioArtifactBase",
     "RawAudioArtifactCreate",
     "RawAudioArtifactResponse",
+    "AudioIndexResponse",
+    "AudioSegmentResponse",
     # Search
     "SearchQuery",
     "SearchResults",
     "VisualSearchQuery",
     "VisualSearchResults",
+    # Health
+    "ModelStatusResponse",
+    "ReadinessResponse",
+    # Tracing
+    "MeetingTracesResponse",
+    "SpanResponse",
+    "StageLatency",
+    "TraceResponse",
 ]
@@ -14,6 +14,7 @@ class RawAudioArtifactBase(BaseSchema):
     file_path: str = Field(..., max_length=512)
     sample_rate: Optional[int] = Field(None, gt=0)
     duration_seconds: Optional[float] = Field(None, gt=0)
+    codec: Optional[str] = Field(None, description="Storage format; null if stored as recorded")
 
 
 class RawAudioArtifactCreate(BaseSchema):
@@ -31,3 +32,23 @@ class RawAudioArtifactResponse(RawAudioArtifactBase):
     id: int
     meeting_id: str
     recorded_at: datetime
+
+
+class AudioSegmentResponse(BaseSchema):
+    """One independently decodable segment of a compressed recording."""
+
+    start_seconds: float
+    frames: int
+    offset: int = Field(..., description="Byte offset in the recording file")
+    length: int = Field(..., description="Byte length in the recording file")
+
+
+class AudioIndexResponse(BaseSchema):
+    """Seek index of a compressed recording, for byte-range playback."""
+
+    artifact_id: int
+    codec: str
+    sample_rate: int
+    channels: int
+    duration_seconds: float
+    segments: list[AudioSegmentResponse] = []
@@ -12,8 +12,15 @@ class ScreenCaptureBase(BaseSchema):
     """Base screen capture schema."""
 
     image_path: str = Field(..., max_length=512)
+    thumbnail_path: Optional[str] = Field(None, max_length=512)
+    image_digest: Optional[str] = Field(
+        None, description="SHA-256 of the image pixels; shared by identical screens"
+    )
     description: Optional[str] = None
     embeddings_path: Optional[str] = Field(None, max_length=512)
+    duplicate_of_id: Optional[int] = Field(
+        None, description="Earlier capture of the same unchanged screen"
+    )
 
 
 class ScreenCaptureCreate(BaseSchema):
@@ -39,4 +46,5 @@ class ScreenCaptureList(BaseSchema):
     meeting_id: str
     captured_at: datetime
     image_path: str
+    thumbnail_path: Optional[str] = None
     description: Optional[str] = None
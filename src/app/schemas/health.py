@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from .base import BaseSchema
+
+
+class ModelStatusResponse(BaseSchema):
+    """State of one shared model worker."""
+
+    state: str
+    memory_mb: int
+    queue_depth: int
+    start_seconds: Optional[float] = None
+    warmup_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+
+class ReadinessResponse(BaseSchema):
+    """Whether the service can take traffic, and what it is still waiting for."""
+
+    ready: bool
+    startup_seconds: Optional[float] = None
+    models: dict[str, ModelStatusResponse] = {}
@@ -47,6 +47,8 @@ class MeetingResponse(MeetingBase):
     created_at: datetime
     started_at: Optional[datetime] = None
     ended_at: Optional[datetime] = None
+    version: int = Field(0, description="Incremented whenever the meeting or its assets change")
+    updated_at: Optional[datetime] = None
 
 
 class MeetingWithParticipants(MeetingResponse):
@@ -63,6 +65,17 @@ class MeetingList(BaseSchema):
     created_at: datetime
     started_at: Optional[datetime] = None
     ended_at: Optional[datetime] = None
+    version: int = 0
+    transcript_count: Optional[int] = None
+    capture_count: Optional[int] = None
+    summary_count: Optional[int] = None
+
+
+class MeetingPage(BaseSchema):
+    """Schema for one keyset page of the meeting list."""
+
+    items: list[MeetingList] = []
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to get the next page")
 
 
 class MeetingUpdate(BaseSchema):
@@ -37,6 +37,7 @@ class SummaryResponse(SummaryBase):
     meeting_id: str
     generated_at: datetime
     model_name: Optional[str] = None
+    trace_id: Optional[str] = None
 
 
 class SummaryList(BaseSchema):
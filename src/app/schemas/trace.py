@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from pydantic import Field
+
+from .base import BaseSchema
+
+
+class SpanResponse(BaseSchema):
+    """One timed stage of a trace."""
+
+    name: str = Field(..., description="queue, asr, persist, summarize or summarized")
+    started_at: datetime
+    duration_ms: float
+    attributes: dict[str, Any] = {}
+
+
+class TraceResponse(BaseSchema):
+    """The spans recorded for one live chunk or one summary."""
+
+    trace_id: str
+    started_at: datetime
+    duration_ms: float
+    spans: list[SpanResponse] = []
+
+
+class StageLatency(BaseSchema):
+    """Latency distribution of one span name over the buffered spans."""
+
+    name: str
+    count: int
+    p50_ms: float
+    p99_ms: float
+
+
+class MeetingTracesResponse(BaseSchema):
+    """Recent pipeline traces of a meeting, newest first."""
+
+    meeting_id: str
+    stages: list[StageLatency] = []
+    traces: list[TraceResponse] = []
@@ -29,6 +29,7 @@ class TranscriptSegmentResponse(TranscriptSegmentBase):
     id: int
     meeting_id: str
     speaker_id: Optional[int] = None
+    trace_id: Optional[str] = Field(None, description="Trace of the live chunk it came from")
 
 
 class TranscriptSegmentWithSpeaker(TranscriptSegmentResponse):
@@ -1,18 +1,57 @@
 """Service layer for audio, vision, summarization, storage, and scheduling."""
 
-from .audio import AudioService
-from .scheduler import PeriodicTask, SchedulerService
+from .audio import AudioService, BatchingASRBackend
+from .audio_pipeline import BackpressurePolicy, PipelineStats, StreamingASRPipeline
+from .batching import BatchStats, MicroBatcher
+from .embedding_store import EmbeddingDType, EmbeddingStore
+from .events import EventBroker, MeetingEvent, Subscription
+from .frame_dedup import DuplicateFramePolicy, FrameDeduplicator
+from .image_store import ImageFormat, ImageStore
+from .incremental_summary import HierarchicalSummarizationBackend, IncrementalSummarizer
+from .model_pool import ModelClient, ModelSpec, ModelWorkerPool, Priority, model_calls
+from .scheduler import OverrunPolicy, PeriodicTask, SchedulerService, TaskStats
 from .search import SearchService
-from .storage import StorageService
-from .summarization import SummarizationService
-from .vision import VisionService
+from .storage import AssetKind, StorageService, TimelineEntry
+from .summarization import BatchingSummarizationBackend, SummarizationService
+from .vector_index import VectorIndex
+from .vision import BatchingVisionLanguageModel, CaptureTimings, VisionService
 
 __all__ = [
     "AudioService",
+    "BatchingASRBackend",
+    "ModelWorkerPool",
+    "ModelSpec",
+    "ModelClient",
+    "Priority",
+    "model_calls",
+    "StreamingASRPipeline",
+    "BackpressurePolicy",
+    "PipelineStats",
     "VisionService",
+    "BatchingVisionLanguageModel",
+    "BatchingSummarizationBackend",
+    "MicroBatcher",
+    "BatchStats",
+    "CaptureTimings",
+    "FrameDeduplicator",
+    "DuplicateFramePolicy",
     "SummarizationService",
+    "IncrementalSummarizer",
+    "HierarchicalSummarizationBackend",
     "StorageService",
+    "AssetKind",
+    "TimelineEntry",
     "SearchService",
+    "EventBroker",
+    "MeetingEvent",
+    "Subscription",
     "SchedulerService",
     "PeriodicTask",
+    "OverrunPolicy",
+    "TaskStats",
+    "VectorIndex",
+    "EmbeddingStore",
+    "EmbeddingDType",
+    "ImageStore",
+    "ImageFormat",
 ]
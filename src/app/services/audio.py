@@ -1,12 +1,25 @@
 from __future__ import annotations
 
+import logging
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Protocol
+from typing import AsyncIterator, Callable, Iterable, Optional, Protocol
 
+import anyio
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import metrics
+from app.core.tracing import new_trace_id, tracer
+from app.db.write_buffer import WriteBuffer, persist
 from app.models import Meeting, RawAudioArtifact, TranscriptSegment
+from app.services.audio_archive import ARCHIVE_SUFFIX, CODEC, AudioArchiveError, compress_wav
+from app.services.batching import BatchStats, MicroBatcher
+from app.services.events import EventBroker
+from app.services.model_pool import ModelClient, Priority, model_calls
+from app.services.post_processing import SlicedTranscriber
+
+logger = logging.getLogger(__name__)
 
 
 class AudioCaptureBackend(Protocol):
@@ -14,7 +27,7 @@ class AudioCaptureBackend(Protocol):
 
     async def stop_stream(self, meeting: Meeting) -> None: ...
 
-    async def iter_chunks(self, meeting: Meeting) -> Iterable[bytes]: ...
+    def iter_chunks(self, meeting: Meeting) -> AsyncIterator[bytes]: ...
 
     async def record_raw_audio(self, meeting: Meeting, destination: Path) -> None: ...
 
@@ -25,10 +38,54 @@ class ASRBackend(Protocol):
     async def transcribe_file(self, audio_path: Path) -> Iterable[TranscriptSegment]: ...
 
 
+class BatchASRBackend(Protocol):
+    async def transcribe_chunks(self, chunks: list[bytes]) -> list[TranscriptSegment]: ...
+
+    async def transcribe_file(self, audio_path: Path) -> Iterable[TranscriptSegment]: ...
+
+
+class BatchingASRBackend:
+    """
+    :class:`ASRBackend` adapter that micro-batches live chunks for a batch backend.
+
+    Share one instance between the ``AudioService`` of every live meeting so
+    that chunks captured at about the same time are transcribed in one call.
+    Whole files go to the backend unchanged.
+    """
+
+    def __init__(
+        self, backend: BatchASRBackend, max_batch: int = 8, max_wait: float = 0.05
+    ) -> None:
+        self.backend = backend
+        self._transcribe = MicroBatcher(
+            backend.transcribe_chunks, max_batch, max_wait, name="transcribe_chunk"
+        )
+
+    async def transcribe_chunk(self, audio: bytes) -> TranscriptSegment:
+        return await self._transcribe.submit(audio)
+
+    async def transcribe_file(self, audio_path: Path) -> Iterable[TranscriptSegment]:
+        return await self.backend.transcribe_file(audio_path)
+
+    def batch_stats(self) -> dict[str, BatchStats]:
+        return {"transcribe_chunk": self._transcribe.stats}
+
+
 @dataclass
 class AudioService:
     capture_backend: AudioCaptureBackend
     asr_backend: ASRBackend
+    write_buffer: Optional[WriteBuffer] = None
+    broker: Optional[EventBroker] = None
+    # Builds an ASR backend inside post-processing worker processes; must be
+    # picklable. Unused when ``asr_backend`` is a model pool client, whose
+    # worker is already out of process and counted against the pool's budget.
+    asr_factory: Optional[Callable[[], ASRBackend]] = None
+    post_process_workers: int = 2
+    post_process_slice_seconds: float = 60.0
+    # Store full recordings as seekable FLAC segments instead of the backend's WAV.
+    compress_recordings: bool = True
+    archive_segment_seconds: float = 10.0
 
     async def start_capture(self, meeting: Meeting) -> None:
         await self.capture_backend.start_stream(meeting)
@@ -39,28 +96,65 @@ class AudioService:
     async def process_live_chunk(
         self, meeting: Meeting, chunk: bytes, session: AsyncSession
     ) -> TranscriptSegment:
-        transcript = await self.asr_backend.transcribe_chunk(chunk)
+        trace_id, captured = new_trace_id(), time.time()
+        with (
+            model_calls(meeting.id, Priority.LIVE),
+            tracer.span(trace_id, "asr", meeting.id, bytes=len(chunk)),
+        ):
+            transcript = await self.transcribe_chunk(chunk)
+        metrics.AUDIO_CHUNKS.labels("transcribed").inc()
         transcript.meeting_id = meeting.id  # type: ignore[attr-defined]
-        session.add(transcript)
-        await session.commit()
+        transcript.trace_id = trace_id
+        with tracer.span(trace_id, "persist", meeting.id):
+            transcript = await persist(transcript, session, self.write_buffer)
+        tracer.chunk_persisted(meeting.id, trace_id, captured)
+        self.publish_transcript(transcript)
         return transcript
 
+    async def transcribe_chunk(self, chunk: bytes) -> TranscriptSegment:
+        with metrics.MODEL_LATENCY.labels("transcribe_chunk").time():
+            return await self.asr_backend.transcribe_chunk(chunk)
+
+    def publish_transcript(self, transcript: TranscriptSegment) -> None:
+        if self.broker is not None:
+            self.broker.publish_record("transcript", transcript)
+
     async def record_full_audio(
         self, meeting: Meeting, destination: Path, session: AsyncSession
     ) -> RawAudioArtifact:
         await self.capture_backend.record_raw_audio(meeting, destination)
         artifact = RawAudioArtifact(meeting_id=meeting.id, file_path=str(destination))
+        if self.compress_recordings:
+            await self._compress(artifact, destination)
         session.add(artifact)
         await session.commit()
         return artifact
 
-    async def post_process_audio(
-        self, artifact: RawAudioArtifact, session: AsyncSession
-    ) -> list[TranscriptSegment]:
-        segments: list[TranscriptSegment] = []
-        for segment in await self.asr_backend.transcribe_file(Path(artifact.file_path)):
-            segment.meeting_id = artifact.meeting_id  # type: ignore[attr-defined]
-            segments.append(segment)
-            session.add(segment)
-        await session.commit()
-        return segments
+    async def _compress(self, artifact: RawAudioArtifact, recording: Path) -> None:
+        archive_path = recording.with_suffix(ARCHIVE_SUFFIX)
+        try:
+            archive = await anyio.to_thread.run_sync(
+                compress_wav, recording, archive_path, self.archive_segment_seconds
+            )
+        except AudioArchiveError:
+            logger.warning("Keeping %s uncompressed: not a 16-bit PCM WAV", recording)
+            return
+        await anyio.Path(recording).unlink(missing_ok=True)
+        artifact.file_path = str(archive_path)
+        artifact.codec = CODEC
+        artifact.sample_rate = archive.sample_rate
+        artifact.duration_seconds = archive.duration_seconds
+
+    async def post_process_audio(self, artifact: RawAudioArtifact, session: AsyncSession) -> int:
+        """Transcribe the full recording in silence-aligned slices; return segments added."""
+        pooled = isinstance(self.asr_backend, ModelClient)
+        transcriber = SlicedTranscriber(
+            asr_backend=self.asr_backend,
+            asr_factory=None if pooled else self.asr_factory,
+            workers=self.post_process_workers,
+            slice_seconds=self.post_process_slice_seconds,
+        )
+        # Archives are sliced in place: only the segments of each slice are decoded.
+        # Slices queue behind live work for the shared model.
+        with model_calls(artifact.meeting_id, Priority.BACKGROUND):
+            return await transcriber.transcribe(artifact, session)
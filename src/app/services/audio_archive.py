@@ -0,0 +1,246 @@
+"""Compressed, seekable storage for full-meeting recordings.
+
+A recording is stored as a sequence of independent FLAC segments of about
+``segment_seconds`` each, concatenated into one data file, plus an
+append-only seek index next to it::
+
+    recording.flacseg        FLAC segment, FLAC segment, ...
+    recording.flacseg.idx    header: magic "CAIX", sample rate (u32), channels (u16)
+                             record: start frame (u64), frames (u32),
+                                     byte offset (u64), byte length (u32)
+
+Any segment can be decoded (or served to a client) on its own, so playing or
+transcribing a time range only touches the segments it overlaps.
+"""
+
+from __future__ import annotations
+
+import io
+import struct
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import numpy.typing as npt
+import soundfile
+
+from app.core import errors
+
+ARCHIVE_SUFFIX = ".flacseg"
+INDEX_SUFFIX = ".idx"
+CODEC = "flac-segments"
+
+_MAGIC = b"CAIX"
+_HEADER = struct.Struct("<4sIH")
+_RECORD = struct.Struct("<QIQI")
+
+
+class AudioArchiveError(errors.AppError):
+    """Raised for missing or malformed audio archives."""
+
+
+@dataclass(frozen=True)
+class AudioSegment:
+    start_frame: int
+    frames: int
+    offset: int
+    length: int
+
+
+def index_path(path: Path) -> Path:
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def is_archive(path: Path) -> bool:
+    return path.suffix == ARCHIVE_SUFFIX
+
+
+class AudioArchiveWriter:
+    """
+    Append int16 PCM to an archive, compressing it one segment at a time.
+
+    Call :meth:`close` (or use as a context manager) to flush the final,
+    shorter segment.
+    """
+
+    def __init__(
+        self, path: Path, sample_rate: int, channels: int = 1, segment_seconds: float = 10.0
+    ) -> None:
+        if path.exists():
+            raise AudioArchiveError(f"Audio archive already exists: {path}")
+        self.path = path
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.segment_frames = max(int(sample_rate * segment_seconds), 1)
+        self.frames_written = 0
+        self._offset = 0
+        self._pending: list[npt.NDArray[np.int16]] = []
+        self._pending_frames = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._data = path.open("wb")
+        self._index = index_path(path).open("wb")
+        self._index.write(_HEADER.pack(_MAGIC, sample_rate, channels))
+
+    def write(self, pcm: bytes | npt.NDArray[np.int16]) -> None:
+        """Append interleaved little-endian int16 samples."""
+        samples = np.frombuffer(pcm, dtype="<i2") if isinstance(pcm, bytes) else pcm
+        samples = np.asarray(samples, dtype=np.int16).reshape(-1, self.channels)
+        self._pending.append(samples)
+        self._pending_frames += len(samples)
+        while self._pending_frames >= self.segment_frames:
+            buffered = np.concatenate(self._pending)
+            self._encode(buffered[: self.segment_frames])
+            rest = buffered[self.segment_frames :]
+            self._pending, self._pending_frames = ([rest] if len(rest) else []), len(rest)
+
+    def _encode(self, samples: npt.NDArray[np.int16]) -> None:
+        buffer = io.BytesIO()
+        soundfile.write(buffer, samples, self.sample_rate, format="FLAC", subtype="PCM_16")
+        payload = buffer.getvalue()
+        self._data.write(payload)
+        self._data.flush()
+        # The index entry is written after its data, so a crash never indexes a partial segment.
+        self._index.write(
+            _RECORD.pack(self.frames_written, len(samples), self._offset, len(payload))
+        )
+        self._index.flush()
+        self._offset += len(payload)
+        self.frames_written += len(samples)
+
+    def close(self) -> None:
+        if self._data.closed:
+            return
+        if self._pending_frames:
+            self._encode(np.concatenate(self._pending))
+            self._pending, self._pending_frames = [], 0
+        self._data.close()
+        self._index.close()
+
+    def __enter__(self) -> AudioArchiveWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class AudioArchive:
+    """Read access to an archive written by :class:`AudioArchiveWriter`."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        try:
+            raw = index_path(path).read_bytes()
+        except FileNotFoundError as exc:
+            raise AudioArchiveError(f"Audio archive index not found: {path}") from exc
+        if len(raw) < _HEADER.size or raw[:4] != _MAGIC:
+            raise AudioArchiveError(f"Malformed audio archive index: {path}")
+        _, self.sample_rate, self.channels = _HEADER.unpack_from(raw)
+        complete = (len(raw) - _HEADER.size) // _RECORD.size
+        self.segments = [
+            AudioSegment(*_RECORD.unpack_from(raw, _HEADER.size + i * _RECORD.size))
+            for i in range(complete)
+        ]
+        self._starts = np.array([s.start_frame for s in self.segments], dtype=np.int64)
+
+    @property
+    def total_frames(self) -> int:
+        return self.segments[-1].start_frame + self.segments[-1].frames if self.segments else 0
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.total_frames / self.sample_rate
+
+    def frame_range(self, start: float = 0.0, end: Optional[float] = None) -> tuple[int, int]:
+        """Clamp a ``[start, end)`` time range in seconds to sample frames."""
+        first = min(max(int(start * self.sample_rate), 0), self.total_frames)
+        last = self.total_frames if end is None else int(end * self.sample_rate)
+        return first, min(max(last, first), self.total_frames)
+
+    def segments_between(self, first: int, last: int) -> list[AudioSegment]:
+        """Segments overlapping frames ``[first, last)``, found by binary search."""
+        if first >= last:
+            return []
+        lo = max(int(np.searchsorted(self._starts, first, side="right")) - 1, 0)
+        hi = int(np.searchsorted(self._starts, last, side="left"))
+        return self.segments[lo:hi]
+
+    def byte_range(self, start: float = 0.0, end: Optional[float] = None) -> tuple[int, int]:
+        """``(offset, length)`` of the data-file bytes holding a time range."""
+        segments = self.segments_between(*self.frame_range(start, end))
+        if not segments:
+            return 0, 0
+        return segments[0].offset, segments[-1].offset + segments[-1].length - segments[0].offset
+
+    def iter_pcm(
+        self, start: float = 0.0, end: Optional[float] = None
+    ) -> Iterator[npt.NDArray[np.int16]]:
+        """Decode a time range segment by segment, as int16 frames x channels."""
+        return self.iter_frames(*self.frame_range(start, end))
+
+    def iter_frames(self, first: int, last: int) -> Iterator[npt.NDArray[np.int16]]:
+        """Decode sample frames ``[first, last)`` segment by segment."""
+        with self.path.open("rb") as fh:
+            for segment in self.segments_between(first, last):
+                fh.seek(segment.offset)
+                payload = fh.read(segment.length)
+                samples, _ = soundfile.read(io.BytesIO(payload), dtype="int16", always_2d=True)
+                lo = max(first - segment.start_frame, 0)
+                hi = min(last - segment.start_frame, segment.frames)
+                yield samples[lo:hi]
+
+    def iter_wav(self, start: float = 0.0, end: Optional[float] = None) -> Iterator[bytes]:
+        """Stream a time range as 16-bit PCM WAV: the header, then one chunk per segment."""
+        first, last = self.frame_range(start, end)
+        yield wav_header(self.sample_rate, self.channels, last - first)
+        for samples in self.iter_pcm(start, end):
+            yield samples.astype("<i2", copy=False).tobytes()
+
+    def export_wav(self, destination: Path) -> Path:
+        with wave.open(str(destination), "wb") as out:
+            out.setnchannels(self.channels)
+            out.setsampwidth(2)
+            out.setframerate(self.sample_rate)
+            for samples in self.iter_pcm():
+                out.writeframes(samples.astype("<i2", copy=False).tobytes())
+        return destination
+
+
+def wav_header(sample_rate: int, channels: int, frames: int) -> bytes:
+    data_size = frames * channels * 2
+    return (
+        b"RIFF"
+        + struct.pack("<I", 36 + data_size)
+        + b"WAVEfmt "
+        + struct.pack(
+            "<IHHIIHH", 16, 1, channels, sample_rate, sample_rate * channels * 2, channels * 2, 16
+        )
+        + b"data"
+        + struct.pack("<I", data_size)
+    )
+
+
+def compress_wav(
+    source: Path, destination: Path, segment_seconds: float = 10.0, block_frames: int = 65536
+) -> AudioArchive:
+    """
+    Compress a 16-bit PCM WAV recording into an archive, reading it block by block.
+
+    Raises:
+        AudioArchiveError: If ``source`` is not 16-bit PCM WAV.
+    """
+
+    try:
+        reader = wave.open(str(source), "rb")
+    except (wave.Error, EOFError) as exc:
+        raise AudioArchiveError(f"Not a PCM WAV file: {source}") from exc
+    with reader:
+        if reader.getsampwidth() != 2:
+            raise AudioArchiveError(f"Only 16-bit PCM is supported: {source}")
+        with AudioArchiveWriter(
+            destination, reader.getframerate(), reader.getnchannels(), segment_seconds
+        ) as writer:
+            while raw := reader.readframes(block_frames):
+                writer.write(raw)
+    return AudioArchive(destination)
@@ -0,0 +1,330 @@
+"""Backpressured streaming pipeline from audio capture to live transcript segments."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from statistics import quantiles
+from typing import Optional
+
+import anyio
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.tracing import new_trace_id, tracer
+from app.db.write_buffer import persist
+from app.models import Meeting, TranscriptSegment
+from app.services.audio import AudioService
+from app.services.model_pool import Priority, model_calls
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+
+
+class BackpressurePolicy(str, Enum):
+    """What capture does when the queue in front of ASR is full."""
+
+    BUFFER = "buffer"  # wait for room, slowing capture down
+    DROP_OLDEST = "drop_oldest"  # discard the oldest queued chunk
+    MERGE = "merge"  # append the new chunk to the newest queued one
+
+
+@dataclass
+class PipelineStats:
+    chunks_captured: int = 0
+    chunks_transcribed: int = 0
+    chunks_dropped: int = 0
+    chunks_merged: int = 0
+    asr_failures: int = 0
+    persist_failures: int = 0
+    overlap_words_removed: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=1024))
+
+    def record_depth(self, depth: int) -> None:
+        self.queue_depth = depth
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def latency_percentiles(self) -> dict[str, float]:
+        """p50/p99 end-to-end latency (capture to persisted) over recent chunks, in seconds."""
+        if len(self.latencies) < 2:
+            value = self.latencies[0] if self.latencies else 0.0
+            return {"p50": value, "p99": value}
+        cuts = quantiles(self.latencies, n=100, method="inclusive")
+        return {"p50": cuts[49], "p99": cuts[98]}
+
+
+@dataclass
+class _Chunk:
+    audio: bytes
+    captured_at: float
+    overlap: int = 0
+    trace_id: str = field(default_factory=new_trace_id)
+    captured_wall: float = field(default_factory=time.time)  # span timestamps are Unix time
+    merged: list[str] = field(default_factory=list)  # trace IDs of chunks appended under MERGE
+
+
+@dataclass
+class _Submitted:
+    seq: int
+    chunk: _Chunk
+    asr_done: float
+    future: asyncio.Future[TranscriptSegment]
+
+
+class _ChunkQueue:
+    """Bounded FIFO of audio chunks that applies a :class:`BackpressurePolicy` when full."""
+
+    def __init__(self, maxsize: int, policy: BackpressurePolicy, stats: PipelineStats) -> None:
+        self.maxsize = maxsize
+        self.policy = policy
+        self.stats = stats
+        self._items: deque[_Chunk] = deque()
+        self._cond = anyio.Condition()
+        self._closed = False
+        self._next_seq = 0
+
+    async def put(self, chunk: _Chunk) -> None:
+        async with self._cond:
+            while len(self._items) >= self.maxsize:
+                if self.policy is BackpressurePolicy.BUFFER:
+                    await self._cond.wait()
+                elif self.policy is BackpressurePolicy.DROP_OLDEST:
+                    self._items.popleft()
+                    self.stats.chunks_dropped += 1
+                    metrics.AUDIO_CHUNKS.labels("dropped").inc()
+                    metrics.ASR_QUEUE_DEPTH.dec()
+                else:
+                    newest = self._items[-1]
+                    # The new chunk's overlap prefix is already the tail of ``newest``.
+                    newest.audio += chunk.audio[chunk.overlap :]
+                    newest.merged.append(chunk.trace_id)
+                    self.stats.chunks_merged += 1
+                    metrics.AUDIO_CHUNKS.labels("merged").inc()
+                    return
+            self._items.append(chunk)
+            metrics.ASR_QUEUE_DEPTH.inc()
+            self.stats.record_depth(len(self._items))
+            self._cond.notify_all()
+
+    async def get(self) -> Optional[tuple[int, _Chunk]]:
+        """Return the next chunk with its sequence number, or None once closed and drained."""
+        async with self._cond:
+            while not self._items and not self._closed:
+                await self._cond.wait()
+            if not self._items:
+                return None
+            chunk = self._items.popleft()
+            metrics.ASR_QUEUE_DEPTH.dec()
+            seq, self._next_seq = self._next_seq, self._next_seq + 1
+            self.stats.record_depth(len(self._items))
+            self._cond.notify_all()
+            return seq, chunk
+
+    async def close(self) -> None:
+        async with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def discard(self) -> None:
+        """Drop the chunks still queued once no worker is left to take them."""
+        if self._items:
+            metrics.ASR_QUEUE_DEPTH.dec(len(self._items))
+            self._items.clear()
+            self.stats.record_depth(0)
+
+
+def remove_overlap(previous: str, current: str, max_words: int = 32) -> tuple[str, int]:
+    """
+    Strip from ``current`` the leading words that repeat the end of ``previous``.
+
+    Words are compared case-insensitively without punctuation.
+
+    Returns:
+        tuple[str, int]: Remaining text and the number of words removed.
+    """
+
+    prev_words = [w.lower() for w in _WORD.findall(previous)][-max_words:]
+    matches = list(_WORD.finditer(current))
+    cur_words = [m.group().lower() for m in matches]
+    for size in range(min(len(prev_words), len(cur_words), max_words), 0, -1):
+        if prev_words[-size:] == cur_words[:size]:
+            rest = current[matches[size - 1].end() :].lstrip(" \t,.;:!?-")
+            return rest, size
+    return current, 0
+
+
+@dataclass
+class StreamingASRPipeline:
+    """
+    Feed ``AudioCaptureBackend.iter_chunks`` through ASR with flow control.
+
+    Captured chunks go into a bounded queue drained by ``concurrency`` ASR
+    workers. Results are persisted in capture order, after removing the text
+    that repeats because of ``overlap_bytes`` of audio shared between
+    consecutive chunks. Segments are handed to the write buffer without
+    waiting for its group commit; up to ``max_unpersisted`` of them may be
+    awaiting their commit at a time. A chunk whose ASR or insert fails is
+    skipped.
+
+    Each chunk is traced through the ``queue``, ``asr`` and ``persist`` stages
+    (see :mod:`app.core.tracing`); its trace ID is stored on the segment.
+    Chunks appended to another one under ``MERGE`` are listed in the
+    ``merged`` attribute of that chunk's ``queue`` span.
+    """
+
+    audio: AudioService
+    queue_size: int = 8
+    concurrency: int = 1
+    overlap_bytes: int = 0
+    policy: BackpressurePolicy = BackpressurePolicy.BUFFER
+    max_unpersisted: int = 64
+    stats: PipelineStats = field(default_factory=PipelineStats)
+
+    async def run(self, meeting: Meeting, session: AsyncSession) -> None:
+        """Run until the capture stream ends and every queued chunk is persisted."""
+        queue = _ChunkQueue(self.queue_size, self.policy, self.stats)
+        send, receive = anyio.create_memory_object_stream[
+            tuple[int, _Chunk, Optional[TranscriptSegment]]
+        ](max_buffer_size=self.concurrency)
+
+        # The transcribing tasks inherit the meeting for shared model workers.
+        with model_calls(meeting.id, Priority.LIVE):
+            try:
+                async with anyio.create_task_group() as tg:
+                    tg.start_soon(self._persist_in_order, meeting, session, receive)
+                    async with send:
+                        for _ in range(self.concurrency):
+                            tg.start_soon(self._transcribe, meeting, queue, send.clone())
+                    try:
+                        await self._capture(meeting, queue)
+                    finally:
+                        await queue.close()
+            finally:
+                # Chunks left behind by a cancelled or failed run.
+                queue.discard()
+
+    async def _capture(self, meeting: Meeting, queue: _ChunkQueue) -> None:
+        tail = b""
+        async for audio in self.audio.capture_backend.iter_chunks(meeting):
+            self.stats.chunks_captured += 1
+            await queue.put(
+                _Chunk(audio=tail + audio, captured_at=anyio.current_time(), overlap=len(tail))
+            )
+            if self.overlap_bytes:
+                tail = audio[-self.overlap_bytes :]
+
+    async def _transcribe(
+        self,
+        meeting: Meeting,
+        queue: _ChunkQueue,
+        send: MemoryObjectSendStream[tuple[int, _Chunk, Optional[TranscriptSegment]]],
+    ) -> None:
+        async with send:
+            while (item := await queue.get()) is not None:
+                seq, chunk = item
+                merged = {"merged": chunk.merged} if chunk.merged else {}
+                tracer.record(
+                    chunk.trace_id,
+                    "queue",
+                    meeting.id,
+                    chunk.captured_wall,
+                    time.time(),
+                    seq=seq,
+                    **merged,
+                )
+                segment: Optional[TranscriptSegment] = None
+                try:
+                    with tracer.span(chunk.trace_id, "asr", meeting.id, bytes=len(chunk.audio)):
+                        segment = await self.audio.transcribe_chunk(chunk.audio)
+                except Exception:
+                    self.stats.asr_failures += 1
+                    metrics.AUDIO_CHUNKS.labels("failed").inc()
+                    logger.exception("ASR failed for live chunk %d", seq)
+                await send.send((seq, chunk, segment))
+
+    async def _persist_in_order(
+        self,
+        meeting: Meeting,
+        session: AsyncSession,
+        receive: MemoryObjectReceiveStream[tuple[int, _Chunk, Optional[TranscriptSegment]]],
+    ) -> None:
+        pending: dict[int, tuple[_Chunk, Optional[TranscriptSegment]]] = {}
+        next_seq = 0
+        previous_text = ""
+        submitted_send, submitted_receive = anyio.create_memory_object_stream[_Submitted](
+            max_buffer_size=self.max_unpersisted
+        )
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(self._await_persisted, meeting, submitted_receive)
+            async with receive, submitted_send:
+                async for seq, chunk, segment in receive:
+                    pending[seq] = (chunk, segment)
+                    while next_seq in pending:
+                        chunk, segment = pending.pop(next_seq)
+                        next_seq += 1
+                        if segment is None:
+                            continue
+                        asr_done = time.time()
+                        self.stats.chunks_transcribed += 1
+                        metrics.AUDIO_CHUNKS.labels("transcribed").inc()
+                        if self.overlap_bytes and previous_text:
+                            segment.text, removed = remove_overlap(previous_text, segment.text)
+                            self.stats.overlap_words_removed += removed
+                        previous_text = segment.text or previous_text
+                        if not segment.text:
+                            self.stats.latencies.append(anyio.current_time() - chunk.captured_at)
+                            continue
+                        segment.meeting_id = meeting.id  # type: ignore[attr-defined]
+                        segment.trace_id = chunk.trace_id
+                        future = await self._submit(segment, session)
+                        await submitted_send.send(_Submitted(seq, chunk, asr_done, future))
+
+    async def _submit(
+        self, segment: TranscriptSegment, session: AsyncSession
+    ) -> asyncio.Future[TranscriptSegment]:
+        """Queue the insert in the write buffer, or commit it directly without one."""
+        if self.audio.write_buffer is not None:
+            return self.audio.write_buffer.enqueue(segment)
+        future: asyncio.Future[TranscriptSegment] = asyncio.get_running_loop().create_future()
+        try:
+            future.set_result(await persist(segment, session))
+        except Exception as exc:
+            await session.rollback()
+            future.set_exception(exc)
+        return future
+
+    async def _await_persisted(
+        self, meeting: Meeting, receive: MemoryObjectReceiveStream[_Submitted]
+    ) -> None:
+        """Publish segments as their inserts commit, in capture order."""
+        async with receive:
+            async for item in receive:
+                chunk = item.chunk
+                try:
+                    segment = await item.future
+                except Exception as exc:
+                    self.stats.persist_failures += 1
+                    metrics.AUDIO_CHUNKS.labels("persist_failed").inc()
+                    logger.error("Persisting live chunk %d failed: %r", item.seq, exc)
+                    continue
+                # Includes waiting for earlier chunks and for the group commit.
+                tracer.record(
+                    chunk.trace_id,
+                    "persist",
+                    meeting.id,
+                    item.asr_done,
+                    time.time(),
+                    segment_id=segment.id,
+                )
+                tracer.chunk_persisted(meeting.id, chunk.trace_id, chunk.captured_wall)
+                self.audio.publish_transcript(segment)
+                self.stats.latencies.append(anyio.current_time() - chunk.captured_at)
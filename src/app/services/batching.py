@@ -0,0 +1,122 @@
+"""Micro-batching of single-item model calls into batched backend calls."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, Optional, TypeVar
+
+from app.core import metrics
+from app.services.model_pool import Priority, call_priority, model_calls
+
+logger = logging.getLogger(__name__)
+
+ItemT = TypeVar("ItemT")
+ResultT = TypeVar("ResultT")
+
+
+@dataclass
+class BatchStats:
+    batches: int = 0
+    items: int = 0
+    largest: int = 0
+    full: int = 0  # dispatched at max_batch rather than after max_wait
+
+    @property
+    def mean_size(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+
+@dataclass
+class _Pending(Generic[ItemT, ResultT]):
+    item: ItemT
+    priority: Optional[Priority]  # of the caller's model_calls block
+    future: asyncio.Future[ResultT]
+
+
+class MicroBatcher(Generic[ItemT, ResultT]):
+    """
+    Collect concurrent :meth:`submit` calls into one call of ``batch_fn``.
+
+    A batch is dispatched as soon as ``max_batch`` items are waiting, or
+    ``max_wait`` seconds after its first item arrived. ``batch_fn`` must return
+    one result per item, in order; if it raises, every caller in the batch
+    receives the exception. Achieved batch sizes are kept in :attr:`stats` and
+    observed in the ``callyfy_model_batch_size`` histogram under ``name``.
+
+    A batch may mix meetings, so ``batch_fn`` runs outside every caller's
+    :func:`~app.services.model_pool.model_calls` block, at the highest priority
+    among the batch's callers (the client's default if one of them set none).
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[ItemT]], Awaitable[list[ResultT]]],
+        max_batch: int = 8,
+        max_wait: float = 0.02,
+        name: str = "batch",
+    ) -> None:
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.name = name
+        self.stats = BatchStats()
+        self._pending: list[_Pending[ItemT, ResultT]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def submit(self, item: ItemT) -> ResultT:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[ResultT] = loop.create_future()
+        self._pending.append(_Pending(item, call_priority(), future))
+        if len(self._pending) >= self.max_batch:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(
+                self.max_wait, self._dispatch, context=contextvars.Context()
+            )
+        return await future
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending[: self.max_batch], self._pending[self.max_batch :]
+        loop = asyncio.get_running_loop()
+        # Not the context of whichever caller filled the batch or started the timer.
+        task = loop.create_task(self._run(batch), context=contextvars.Context())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        if self._pending:
+            self._timer = loop.call_later(
+                self.max_wait, self._dispatch, context=contextvars.Context()
+            )
+
+    async def _run(self, batch: list[_Pending[ItemT, ResultT]]) -> None:
+        stats = self.stats
+        stats.batches += 1
+        stats.items += len(batch)
+        stats.largest = max(stats.largest, len(batch))
+        stats.full += len(batch) == self.max_batch
+        metrics.MODEL_BATCH_SIZE.labels(self.name).observe(len(batch))
+        priorities = [pending.priority for pending in batch]
+        # A caller without a priority gets the client's default, so the batch does too.
+        priority = None if None in priorities else min(priorities)  # type: ignore[type-var]
+        try:
+            with model_calls(priority=priority):
+                results = await self.batch_fn([pending.item for pending in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"Batch call returned {len(results)} results for {len(batch)}")
+        except Exception as exc:
+            logger.exception("Batched call of %d items failed", len(batch))
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(exc)
+            return
+        for pending, result in zip(batch, results):
+            if not pending.future.done():
+                pending.future.set_result(result)
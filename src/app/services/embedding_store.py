@@ -0,0 +1,336 @@
+"""Per-meeting, append-only, memory-mapped store of screen capture embeddings.
+
+All embeddings of a meeting live in one file instead of one ``.emb`` file per
+capture. The file starts with a fixed-size header followed by fixed-size
+records::
+
+    header   magic "CEMB", format version (u16), dtype code (u16), dim (u32)
+    record   capture_id (i64), scale (f32), vector (dim x float32|float16|int8)
+
+``int8`` vectors are quantised symmetrically per row; ``scale`` maps them back
+(``vector * scale``) and is 1.0 for the float types. Rows are only ever
+appended, so a crash can at worst leave a torn final record, which is ignored.
+"""
+
+from __future__ import annotations
+
+import struct
+import threading
+from enum import Enum
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import errors
+from app.models import ScreenCapture
+
+EMBEDDING_STORE_NAME = "embeddings.cemb"
+LEGACY_SUFFIX = ".emb"
+
+_MAGIC = b"CEMB"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHHI")
+_HEADER_SIZE = 64  # padded so records start at an aligned offset
+
+
+class EmbeddingStoreError(errors.AppError):
+    """Raised for invalid embedding store files or operations."""
+
+
+class EmbeddingDType(str, Enum):
+    FLOAT32 = "float32"
+    FLOAT16 = "float16"
+    INT8 = "int8"
+
+    @property
+    def code(self) -> int:
+        return _DTYPE_CODES[self]
+
+    @property
+    def numpy(self) -> np.dtype:
+        return np.dtype({"float32": "<f4", "float16": "<f2", "int8": "i1"}[self.value])
+
+
+# Stored in the file header; never renumber.
+_DTYPE_CODES = {EmbeddingDType.FLOAT32: 0, EmbeddingDType.FLOAT16: 1, EmbeddingDType.INT8: 2}
+
+
+def _record_dtype(dtype: EmbeddingDType, dim: int) -> np.dtype:
+    return np.dtype([("capture_id", "<i8"), ("scale", "<f4"), ("vector", dtype.numpy, (dim,))])
+
+
+def _quantize(
+    vectors: npt.NDArray[np.float32], dtype: EmbeddingDType
+) -> tuple[np.ndarray, npt.NDArray[np.float32]]:
+    if dtype is not EmbeddingDType.INT8:
+        return vectors.astype(dtype.numpy), np.ones(len(vectors), dtype=np.float32)
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+class EmbeddingStore:
+    """
+    Embeddings of one meeting's captures, addressable by ``ScreenCapture.id``.
+
+    The dimension and dtype are fixed by the first append (or read from the
+    header of an existing file); ``dtype`` is only used when creating the file.
+    """
+
+    def __init__(self, path: Path, dtype: EmbeddingDType = EmbeddingDType.FLOAT16) -> None:
+        self.path = path
+        self.dtype = dtype
+        self.dim: Optional[int] = None
+        self._lock = threading.Lock()
+        self._records: Optional[np.ndarray] = None
+        self._rows: dict[int, int] = {}
+        self._count = 0
+        if path.exists():
+            self._read_header()
+            self._count = self._complete_rows()
+
+    # Persistence ---------------------------------------------------------
+
+    def _read_header(self) -> None:
+        with self.path.open("rb") as fh:
+            raw = fh.read(_HEADER.size)
+        if len(raw) < _HEADER.size:
+            raise EmbeddingStoreError(f"Truncated embedding store header: {self.path}")
+        magic, version, code, dim = _HEADER.unpack(raw)
+        if magic != _MAGIC or version != _FORMAT_VERSION:
+            raise EmbeddingStoreError(f"Not an embedding store (v{_FORMAT_VERSION}): {self.path}")
+        dtypes = {value: dtype for dtype, value in _DTYPE_CODES.items()}
+        if code not in dtypes:
+            raise EmbeddingStoreError(f"Unknown embedding dtype code {code}")
+        self.dtype = dtypes[code]
+        self.dim = dim
+
+    def _write_header(self, dim: int) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        header = _HEADER.pack(_MAGIC, _FORMAT_VERSION, self.dtype.code, dim)
+        with self.path.open("xb") as fh:
+            fh.write(header.ljust(_HEADER_SIZE, b"\0"))
+        self.dim = dim
+
+    @property
+    def record_dtype(self) -> np.dtype:
+        if self.dim is None:
+            raise EmbeddingStoreError("Embedding store is empty")
+        return _record_dtype(self.dtype, self.dim)
+
+    def _complete_rows(self) -> int:
+        size = self.path.stat().st_size - _HEADER_SIZE
+        return max(size, 0) // self.record_dtype.itemsize
+
+    def records(self) -> np.ndarray:
+        """Memory-mapped structured array of every complete record."""
+        if self._records is not None and len(self._records) == self._count:
+            return self._records
+        if self._count == 0:
+            self._records = np.empty(0, dtype=self.record_dtype if self.dim else "<i8")
+        else:
+            self._records = np.memmap(
+                self.path,
+                dtype=self.record_dtype,
+                mode="r",
+                offset=_HEADER_SIZE,
+                shape=(self._count,),
+            )
+        return self._records
+
+    def __len__(self) -> int:
+        return self._count
+
+    # Writes --------------------------------------------------------------
+
+    def append(self, capture_id: int, embedding: bytes | npt.ArrayLike) -> None:
+        """Append one embedding (raw little-endian float32 bytes or an array)."""
+        if isinstance(embedding, (bytes, bytearray, memoryview)):
+            embedding = np.frombuffer(embedding, dtype="<f4")
+        self.append_many([capture_id], np.asarray(embedding, dtype=np.float32).reshape(1, -1))
+
+    def append_many(self, capture_ids: Iterable[int], embeddings: npt.ArrayLike) -> None:
+        ids = np.asarray(list(capture_ids), dtype=np.int64)
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(ids):
+            raise EmbeddingStoreError("capture_ids and embeddings differ in length")
+        with self._lock:
+            if self.dim is None:
+                self._write_header(int(vectors.shape[1]))
+            if vectors.shape[1] != self.dim:
+                raise EmbeddingStoreError(
+                    f"Embedding dimension {vectors.shape[1]} does not match store dimension "
+                    f"{self.dim}"
+                )
+            quantized, scales = _quantize(vectors, self.dtype)
+            records = np.empty(len(ids), dtype=self.record_dtype)
+            records["capture_id"] = ids
+            records["scale"] = scales
+            records["vector"] = quantized
+            with self.path.open("r+b") as fh:
+                # Overwrite a torn trailing record left by an interrupted append.
+                fh.seek(_HEADER_SIZE + self._count * self.record_dtype.itemsize)
+                fh.write(records.tobytes())
+                fh.truncate()
+            if self._rows:
+                for offset, capture_id in enumerate(ids.tolist(), start=self._count):
+                    self._rows[capture_id] = offset
+            self._count += len(ids)
+
+    # Reads ---------------------------------------------------------------
+
+    def row_of(self, capture_id: int) -> Optional[int]:
+        if not self._rows and self._count:
+            ids = self.records()["capture_id"]
+            self._rows = {int(c): row for row, c in enumerate(ids.tolist())}
+        return self._rows.get(capture_id)
+
+    def get(self, capture_id: int) -> Optional[npt.NDArray[np.float32]]:
+        """Return the (dequantised) float32 embedding of a capture, if stored."""
+        row = self.row_of(capture_id)
+        if row is None:
+            return None
+        record = self.records()[row]
+        return record["vector"].astype(np.float32) * np.float32(record["scale"])
+
+    def vectors(self, start: int = 0, stop: Optional[int] = None) -> npt.NDArray[np.float32]:
+        """Dequantised float32 matrix of rows ``start:stop``."""
+        records = self.records()[start:stop]
+        return records["vector"].astype(np.float32) * records["scale"][:, None]
+
+    def top_k(
+        self, query: npt.ArrayLike, k: int = 10, chunk_rows: int = 65536
+    ) -> list[tuple[int, float]]:
+        """
+        Exact cosine-similarity scan over every row, in chunks of ``chunk_rows``.
+
+        Returns:
+            list[tuple[int, float]]: ``(capture_id, score)`` pairs, best first.
+        """
+
+        if self._count == 0 or k <= 0:
+            return []
+        q = np.asarray(query, dtype=np.float32).reshape(-1)
+        q = q / (np.linalg.norm(q) or 1.0)
+        ids = self.records()["capture_id"]
+        scores = np.empty(self._count, dtype=np.float32)
+        for start in range(0, self._count, chunk_rows):
+            block = self.vectors(start, start + chunk_rows)
+            norms = np.linalg.norm(block, axis=1)
+            norms[norms == 0] = 1.0
+            scores[start : start + len(block)] = (block @ q) / norms
+        k = min(k, self._count)
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [(int(ids[i]), float(scores[i])) for i in best]
+
+
+def store_path(directory: Path) -> Path:
+    return directory / EMBEDDING_STORE_NAME
+
+
+def load_capture_embedding(
+    capture: ScreenCapture, stores: Optional[dict[Path, EmbeddingStore]] = None
+) -> Optional[npt.NDArray[np.float32]]:
+    """
+    Read a capture's embedding from wherever ``embeddings_path`` points.
+
+    Handles both the per-meeting store and legacy one-file-per-capture
+    ``.emb`` files. Captures linked to an earlier unchanged frame share that
+    frame's embedding.
+    """
+
+    if not capture.embeddings_path:
+        return None
+    path = Path(capture.embeddings_path)
+    if path.suffix == LEGACY_SUFFIX:
+        return np.fromfile(path, dtype="<f4") if path.exists() else None
+    stores = stores if stores is not None else {}
+    store = stores.get(path)
+    if store is None:
+        if not path.exists():
+            return None
+        store = stores[path] = EmbeddingStore(path)
+    vector = store.get(capture.id)
+    if vector is None and capture.duplicate_of_id is not None:
+        vector = store.get(capture.duplicate_of_id)
+    return vector
+
+
+async def convert_legacy_embeddings(
+    session: AsyncSession,
+    dtype: EmbeddingDType = EmbeddingDType.FLOAT16,
+    meeting_id: Optional[str] = None,
+    delete: bool = True,
+    batch_size: int = 1000,
+) -> int:
+    """
+    Move ``.emb`` files into per-directory embedding stores.
+
+    Each file is appended to the store next to it, the capture rows are
+    repointed at the store and committed, and only then are the old files
+    deleted (unless ``delete`` is false). Captures whose store already holds
+    their row are not appended again, so an interrupted run can be repeated.
+
+    Args:
+        session: Database session.
+        dtype: Storage type for newly created stores.
+        meeting_id: Only convert this meeting.
+        delete: Remove converted ``.emb`` files.
+        batch_size: Captures converted per commit.
+
+    Returns:
+        int: Number of capture rows repointed.
+    """
+
+    stmt = (
+        select(ScreenCapture)
+        .where(ScreenCapture.embeddings_path.like(f"%{LEGACY_SUFFIX}"))
+        .order_by(ScreenCapture.meeting_id, ScreenCapture.id)
+        .limit(batch_size)
+    )
+    if meeting_id is not None:
+        stmt = stmt.where(ScreenCapture.meeting_id == meeting_id)
+
+    stores: dict[Path, EmbeddingStore] = {}
+    converted = 0
+    while captures := list((await session.scalars(stmt)).all()):
+        legacy_files: set[Path] = set()
+        repointed: dict[Path, list[int]] = {}
+        pending: dict[Path, tuple[list[int], list[np.ndarray]]] = {}
+        for capture in captures:
+            legacy = Path(capture.embeddings_path)  # type: ignore[arg-type]
+            target = store_path(legacy.parent)
+            store = stores.get(target)
+            if store is None:
+                store = stores[target] = EmbeddingStore(target, dtype)
+            repointed.setdefault(target, []).append(capture.id)
+            legacy_files.add(legacy)
+            if capture.duplicate_of_id is not None or store.row_of(capture.id) is not None:
+                continue
+            if not legacy.exists():
+                continue
+            ids, vectors = pending.setdefault(target, ([], []))
+            ids.append(capture.id)
+            vectors.append(np.fromfile(legacy, dtype="<f4"))
+        for target, (ids, vectors) in pending.items():
+            stores[target].append_many(ids, np.stack(vectors))
+        for target, ids in repointed.items():
+            await session.execute(
+                update(ScreenCapture)
+                .where(ScreenCapture.id.in_(ids))
+                .values(embeddings_path=str(target))
+                .execution_options(synchronize_session=False)
+            )
+        await session.commit()
+        session.expunge_all()
+        converted += len(captures)
+        if delete:
+            for legacy in legacy_files:
+                legacy.unlink(missing_ok=True)
+    return converted
@@ -0,0 +1,238 @@
+"""In-process per-meeting publish/subscribe of live updates."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Optional
+
+from sqlalchemy import inspect
+
+from app.db.base import Base
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def record_payload(record: Base) -> dict[str, Any]:
+    """Column values of an ORM row, for use as event data."""
+    return {attr.key: getattr(record, attr.key) for attr in inspect(record).mapper.column_attrs}
+
+
+@dataclass
+class MeetingEvent:
+    meeting_id: str
+    seq: int
+    type: str
+    data: dict[str, Any]
+    published_at: datetime
+    # Serialized once at publish time and shared by every subscriber.
+    message: str = field(default="", repr=False)
+
+
+class Subscription:
+    """
+    One subscriber's view of a meeting's event stream.
+
+    Iterating yields replayed history first, then live events. Iteration ends
+    when the subscription is closed or evicted; ``evicted`` tells the two apart.
+    """
+
+    def __init__(self, broker: EventBroker, meeting_id: str, queue_size: int) -> None:
+        self.broker = broker
+        self.meeting_id = meeting_id
+        self.evicted = False
+        # Set when the requested resume point is no longer in history, so the
+        # client must reload state over REST before relying on the stream.
+        self.resync = False
+        self.last_seq = 0
+        self._replay: deque[MeetingEvent] = deque()
+        self._queue: asyncio.Queue[Optional[MeetingEvent]] = asyncio.Queue(queue_size)
+        self._closed = False
+
+    def _offer(self, event: MeetingEvent) -> bool:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def _end(self, discard: bool = True) -> None:
+        """End iteration, after the queued events unless ``discard`` is set."""
+        if self._closed:
+            return
+        self._closed = True
+        if discard:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+        try:
+            self._queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass  # __anext__ stops once the queue is drained
+
+    def close(self) -> None:
+        self.broker._unsubscribe(self)
+        self._end()
+
+    def __enter__(self) -> Subscription:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __aiter__(self) -> Subscription:
+        return self
+
+    async def __anext__(self) -> MeetingEvent:
+        if self._replay:
+            event = self._replay.popleft()
+        else:
+            if self._closed and self._queue.empty():
+                raise StopAsyncIteration
+            item = await self._queue.get()
+            if item is None:
+                self._queue.put_nowait(None)
+                raise StopAsyncIteration
+            event = item
+        self.last_seq = event.seq
+        return event
+
+
+@dataclass
+class _Topic:
+    seq: int = 0
+    history: deque[MeetingEvent] = field(default_factory=deque)
+    subscribers: set[Subscription] = field(default_factory=set)
+
+
+class EventBroker:
+    """
+    Fan out meeting events to subscribers without ever blocking publishers.
+
+    Each meeting has its own sequence counter and a ring buffer of the last
+    ``history_size`` events, from which a reconnecting client resumes. Every
+    subscriber has a queue of ``queue_size`` events; one that falls that far
+    behind is evicted instead of slowing down the capture pipelines, and can
+    reconnect with the last sequence number it processed.
+
+    A meeting's topic is dropped with :meth:`forget` when the meeting ends.
+    Beyond that, only the ``max_topics`` most recently used topics are kept;
+    the least recently used ones without subscribers are dropped first.
+    """
+
+    def __init__(
+        self, queue_size: int = 256, history_size: int = 1024, max_topics: int = 64
+    ) -> None:
+        self.queue_size = queue_size
+        self.history_size = history_size
+        self.max_topics = max_topics
+        self.evictions = 0
+        self._topics: OrderedDict[str, _Topic] = OrderedDict()
+
+    def _topic(self, meeting_id: str) -> _Topic:
+        topic = self._topics.get(meeting_id)
+        if topic is not None:
+            self._topics.move_to_end(meeting_id)
+            return topic
+        topic = self._topics[meeting_id] = _Topic(history=deque(maxlen=self.history_size))
+        if len(self._topics) > self.max_topics:
+            idle = [key for key, other in self._topics.items() if not other.subscribers]
+            for key in idle[: len(self._topics) - self.max_topics]:
+                del self._topics[key]
+        return topic
+
+    def publish(self, meeting_id: str, event_type: str, data: dict[str, Any]) -> MeetingEvent:
+        topic = self._topic(meeting_id)
+        topic.seq += 1
+        event = MeetingEvent(
+            meeting_id=meeting_id,
+            seq=topic.seq,
+            type=event_type,
+            data=data,
+            published_at=datetime.utcnow(),
+        )
+        event.message = json.dumps(
+            {
+                "seq": event.seq,
+                "type": event.type,
+                "meeting_id": meeting_id,
+                "published_at": event.published_at,
+                "data": data,
+            },
+            default=_json_default,
+        )
+        topic.history.append(event)
+        for subscription in list(topic.subscribers):
+            if not subscription._offer(event):
+                self._evict(topic, subscription)
+        return event
+
+    def publish_record(self, event_type: str, record: Base) -> MeetingEvent:
+        """Publish a persisted row of a meeting asset; ``record`` must have ``meeting_id``."""
+        return self.publish(record.meeting_id, event_type, record_payload(record))  # type: ignore
+
+    def subscribe(self, meeting_id: str, after_seq: Optional[int] = None) -> Subscription:
+        """
+        Subscribe to a meeting's events.
+
+        Args:
+            meeting_id: Meeting to follow.
+            after_seq: Last sequence number the client already processed; events
+                after it are replayed from history. ``None`` starts with new events.
+
+        Returns:
+            Subscription: Async iterator of events; close it (or use it as a
+            context manager) when done.
+        """
+        topic = self._topic(meeting_id)
+        subscription = Subscription(self, meeting_id, self.queue_size)
+        if after_seq is not None:
+            oldest = topic.history[0].seq if topic.history else topic.seq + 1
+            if after_seq > topic.seq or after_seq < oldest - 1:
+                subscription.resync = True
+            else:
+                subscription._replay.extend(e for e in topic.history if e.seq > after_seq)
+        topic.subscribers.add(subscription)
+        return subscription
+
+    def subscriber_count(self, meeting_id: Optional[str] = None) -> int:
+        if meeting_id is not None:
+            topic = self._topics.get(meeting_id)
+            return len(topic.subscribers) if topic else 0
+        return sum(len(topic.subscribers) for topic in self._topics.values())
+
+    def forget(self, meeting_id: str) -> None:
+        """Drop a meeting's history and end its subscriptions once they are caught up."""
+        topic = self._topics.pop(meeting_id, None)
+        if topic is not None:
+            for subscription in topic.subscribers:
+                subscription._end(discard=False)
+
+    def close(self) -> None:
+        for meeting_id in list(self._topics):
+            self.forget(meeting_id)
+
+    def _evict(self, topic: _Topic, subscription: Subscription) -> None:
+        topic.subscribers.discard(subscription)
+        subscription.evicted = True
+        subscription._end()
+        self.evictions += 1
+        logger.warning(
+            "Evicted slow subscriber of meeting %s at seq %d",
+            subscription.meeting_id,
+            subscription.last_seq,
+        )
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        topic = self._topics.get(subscription.meeting_id)
+        if topic is not None:
+            topic.subscribers.discard(subscription)
@@ -0,0 +1,89 @@
+"""Streaming serialization of a meeting timeline to NDJSON or CSV."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from enum import Enum
+from typing import Any, AsyncIterator
+
+from .storage import TimelineEntry, encode_timeline_cursor
+
+EXPORT_COLUMNS = ("cursor", "kind", "id", "at", "ended_at", "text", "detail")
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self) -> str:
+        return "application/x-ndjson" if self is ExportFormat.NDJSON else "text/csv"
+
+
+def _record(entry: TimelineEntry) -> dict[str, Any]:
+    return {
+        "cursor": encode_timeline_cursor(entry),
+        "kind": entry.kind.value,
+        "id": entry.id,
+        "at": entry.at.isoformat(),
+        "ended_at": entry.ended_at.isoformat() if entry.ended_at else None,
+        "text": entry.text,
+        "detail": entry.detail,
+    }
+
+
+async def iter_export(
+    entries: AsyncIterator[TimelineEntry],
+    fmt: ExportFormat,
+    compress: bool = False,
+    chunk_size: int = 64 * 1024,
+    header: bool = True,
+) -> AsyncIterator[bytes]:
+    """
+    Serialize a timeline stream into chunks of about ``chunk_size`` bytes.
+
+    Every record carries the ``cursor`` of its own position, so an interrupted
+    download resumes by requesting the export again after the last cursor it
+    received. With ``compress`` the output is a single gzip stream; each chunk
+    is sync-flushed so clients can decompress incrementally.
+
+    Args:
+        entries: Timeline entries in export order.
+        fmt: Output format.
+        compress: Gzip the output.
+        chunk_size: Uncompressed bytes buffered before a chunk is yielded.
+        header: Emit the CSV header row (ignored for NDJSON).
+    """
+
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    text = io.StringIO()
+    writer = csv.writer(text, lineterminator="\n") if fmt is ExportFormat.CSV else None
+    if writer is not None and header:
+        writer.writerow(EXPORT_COLUMNS)
+
+    def drain() -> bytes:
+        data = text.getvalue().encode()
+        text.seek(0)
+        text.truncate()
+        if compressor is not None:
+            data = compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        return data
+
+    async for entry in entries:
+        record = _record(entry)
+        if writer is not None:
+            writer.writerow(record[column] for column in EXPORT_COLUMNS)
+        else:
+            text.write(json.dumps(record, ensure_ascii=False))
+            text.write("\n")
+        if text.tell() >= chunk_size:
+            yield drain()
+
+    tail = drain()
+    if compressor is not None:
+        tail += compressor.flush()
+    if tail:
+        yield tail
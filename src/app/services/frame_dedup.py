@@ -0,0 +1,97 @@
+"""Perceptual-hash change detection for periodic screen captures."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+
+import anyio
+import numpy as np
+from PIL import Image
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Meeting, ScreenCapture
+
+
+class DuplicateFramePolicy(str, Enum):
+    """What to do with a frame that matches the previous one of the meeting."""
+
+    SKIP = "skip"  # drop it and return the previous capture
+    LINK = "link"  # store a row pointing at the previous capture, reusing its analysis
+
+
+def difference_hash(image_path: Path, hash_size: int = 8) -> int:
+    """
+    Compute a ``hash_size**2``-bit difference hash (dHash) of an image.
+
+    The image is reduced to a ``(hash_size + 1) x hash_size`` grayscale
+    thumbnail and each bit records whether a pixel is brighter than its right
+    neighbour, which is robust to scaling, compression and small edits.
+    """
+
+    with Image.open(image_path) as image:
+        image.draft("L", (hash_size * 8, hash_size * 8))
+        small = image.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR)
+        pixels = np.asarray(small, dtype=np.int16)
+    # Row-major bits, most significant first; packbits pads the last byte on the right.
+    bits = (pixels[:, :-1] > pixels[:, 1:]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big") >> (-bits.size % 8)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+@dataclass
+class FrameDeduplicator:
+    """
+    Detect screen captures that did not change since the previous one.
+
+    Two frames are considered the same when their difference hashes differ
+    in at most ``threshold`` of 64 bits. Each frame is compared with the last
+    analysed (non-duplicate) capture of its meeting, so slow changes such as
+    scrolling cannot drift past the threshold one small step at a time. That
+    capture is kept in memory and recovered from the database after a restart.
+    """
+
+    threshold: int = 4
+    policy: DuplicateFramePolicy = DuplicateFramePolicy.LINK
+    _last: dict[str, ScreenCapture] = field(default_factory=dict, init=False, repr=False)
+
+    async def hash_frame(self, image_path: Path) -> str:
+        return f"{await anyio.to_thread.run_sync(difference_hash, image_path):016x}"
+
+    async def find_duplicate(
+        self, meeting: Meeting, frame_hash: str, session: AsyncSession
+    ) -> Optional[ScreenCapture]:
+        """Return the original capture that ``frame_hash`` repeats, if any."""
+        previous = self._last.get(meeting.id)
+        if previous is None:
+            previous = await session.scalar(
+                select(ScreenCapture)
+                .where(
+                    ScreenCapture.meeting_id == meeting.id, ScreenCapture.frame_hash.is_not(None)
+                )
+                .order_by(ScreenCapture.id.desc())
+                .limit(1)
+            )
+            if previous is None:
+                return None
+            if previous.duplicate_of_id is not None:
+                previous = await session.get(ScreenCapture, previous.duplicate_of_id) or previous
+            self._last[meeting.id] = previous
+        if previous.frame_hash is None:
+            return None
+        if hamming_distance(int(previous.frame_hash, 16), int(frame_hash, 16)) > self.threshold:
+            return None
+        return previous
+
+    def remember(self, capture: ScreenCapture) -> None:
+        """Make an analysed ``capture`` the reference for its meeting's next frames."""
+        self._last[capture.meeting_id] = capture
+
+    def forget(self, meeting: Meeting) -> None:
+        self._last.pop(meeting.id, None)
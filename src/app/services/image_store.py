@@ -0,0 +1,115 @@
+"""Content-addressed store for screen capture images and their thumbnails.
+
+Images are keyed by the SHA-256 of their decoded pixels, so the same screen
+(for example a slide shared in several meetings) is stored once however the
+capture backend encoded it. Objects are transcoded to WebP or AVIF and laid
+out in two-level sharded directories::
+
+    images/objects/ab/cd/abcd....webp
+    images/thumbs/ab/cd/abcd....webp
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+
+from PIL import Image
+
+from app.core import errors
+
+
+class ImageStoreError(errors.AppError):
+    """Raised when an image cannot be read or stored."""
+
+
+class ImageFormat(str, Enum):
+    WEBP = "webp"
+    AVIF = "avif"
+
+
+@dataclass(frozen=True)
+class StoredImage:
+    digest: str
+    path: Path
+    thumbnail_path: Path
+    width: int
+    height: int
+    created: bool  # False when the image was already in the store
+
+
+def pixel_digest(image: Image.Image) -> str:
+    """SHA-256 of an image's size, mode and raw pixels, independent of file encoding."""
+    digest = hashlib.sha256(f"{image.mode}:{image.width}x{image.height}:".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+@dataclass
+class ImageStore:
+    root: Path
+    format: ImageFormat = ImageFormat.WEBP
+    quality: int = 80
+    thumbnail_size: tuple[int, int] = (320, 320)
+
+    def _sharded(self, kind: str, digest: str) -> Path:
+        return self.root / kind / digest[:2] / digest[2:4] / f"{digest}.{self.format.value}"
+
+    def object_path(self, digest: str) -> Path:
+        return self._sharded("objects", digest)
+
+    def thumbnail_path(self, digest: str) -> Path:
+        return self._sharded("thumbs", digest)
+
+    def _save(self, image: Image.Image, destination: Path) -> None:
+        """Encode to a temporary file and rename, so readers never see partial objects."""
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=destination.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                image.save(fh, format=self.format.value.upper(), quality=self.quality)
+            os.replace(tmp, destination)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def ingest(self, source: Path, delete_source: bool = False) -> StoredImage:
+        """
+        Add an image file to the store, transcoding it and writing a thumbnail.
+
+        If an image with the same pixels is already stored, nothing is
+        encoded and the existing object is returned.
+
+        Raises:
+            ImageStoreError: If ``source`` is not a readable image.
+        """
+
+        try:
+            with Image.open(source) as opened:
+                image = opened.convert("RGBA" if opened.mode in ("RGBA", "LA", "P") else "RGB")
+        except (OSError, ValueError) as exc:
+            raise ImageStoreError(f"Cannot read image {source}: {exc}") from exc
+
+        digest = pixel_digest(image)
+        path, thumbnail_path = self.object_path(digest), self.thumbnail_path(digest)
+        created = not path.exists()
+        if created:
+            self._save(image, path)
+        if not thumbnail_path.exists():
+            thumbnail = image.copy()
+            thumbnail.thumbnail(self.thumbnail_size, Image.Resampling.LANCZOS)
+            self._save(thumbnail, thumbnail_path)
+        if delete_source and source.resolve() != path.resolve():
+            source.unlink(missing_ok=True)
+        return StoredImage(
+            digest=digest,
+            path=path,
+            thumbnail_path=thumbnail_path,
+            width=image.width,
+            height=image.height,
+            created=created,
+        )
@@ -0,0 +1,196 @@
+"""Incremental, hierarchical summarization with bounded LLM input per tick."""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional, Protocol
+
+import anyio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Meeting, SummaryNode, TranscriptSegment
+from app.services.summarization import SummaryKind
+
+
+class HierarchicalSummarizationBackend(Protocol):
+    async def condense(self, parts: list[str]) -> str:
+        """Summarize consecutive pieces of a meeting into one tree node."""
+        ...
+
+    async def summarize_text(self, parts: list[str], kind: SummaryKind) -> str:
+        """Produce a user-facing summary of ``kind`` from condensed pieces."""
+        ...
+
+
+@dataclass
+class IncrementalSummarizer:
+    """
+    Maintain a per-meeting tree of :class:`SummaryNode` and summarize from it.
+
+    Segments past the watermark (the last segment covered by a leaf) are
+    condensed ``leaf_segments`` at a time into level-0 nodes; every ``fanout``
+    parentless nodes of one level are condensed into a node one level up. A
+    summary is then built from the parentless nodes (the frontier, at most
+    ``fanout - 1`` per level) plus the not-yet-condensed tail, so the text sent
+    to the backend per call stays bounded regardless of meeting length.
+
+    No transaction is open while the backend condenses: the inputs are read
+    and the read is ended, and each new node is written in its own short
+    transaction afterwards. Calls for the same meeting are serialized.
+    """
+
+    backend: HierarchicalSummarizationBackend
+    leaf_segments: int = 30
+    fanout: int = 4
+    relevant_leaves: int = 2
+    _locks: dict[str, anyio.Lock] = field(default_factory=dict, init=False, repr=False)
+
+    @asynccontextmanager
+    async def _meeting_lock(self, meeting_id: str) -> AsyncIterator[None]:
+        lock = self._locks.setdefault(meeting_id, anyio.Lock())
+        try:
+            async with lock:
+                yield
+        finally:
+            # Drop the lock once nobody holds or waits for it, so finished
+            # meetings don't accumulate.
+            if not lock.locked() and not lock.statistics().tasks_waiting:
+                self._locks.pop(meeting_id, None)
+
+    async def summarize(self, meeting: Meeting, kind: SummaryKind, session: AsyncSession) -> str:
+        async with self._meeting_lock(meeting.id):
+            tail = await self._advance(meeting, session, final=kind is SummaryKind.FINAL)
+            frontier = await self._frontier(meeting, session)
+
+        if kind is SummaryKind.RELEVANT:
+            leaves = [n for n in frontier if n.level == 0][-self.relevant_leaves :]
+            if len(leaves) < self.relevant_leaves:
+                leaves = await self._recent_leaves(meeting, session)
+            parts = [n.content for n in leaves] + tail
+        else:
+            parts = [n.content for n in frontier] + tail
+        # Don't hold the connection through the model call: with a single writer
+        # connection that would stall every other write, including the write buffer's.
+        await session.commit()
+        return await self.backend.summarize_text(parts, kind)
+
+    async def _advance(self, meeting: Meeting, session: AsyncSession, final: bool) -> list[str]:
+        """Condense new segments into the tree; return the texts of the uncondensed tail."""
+        watermark = await session.scalar(
+            select(func.max(SummaryNode.last_segment_id)).where(
+                SummaryNode.meeting_id == meeting.id, SummaryNode.level == 0
+            )
+        )
+        rows = (
+            await session.execute(
+                select(TranscriptSegment.id, TranscriptSegment.text)
+                .where(
+                    TranscriptSegment.meeting_id == meeting.id,
+                    TranscriptSegment.id > (watermark or 0),
+                )
+                .order_by(TranscriptSegment.id)
+            )
+        ).all()
+        await session.commit()
+
+        while len(rows) >= self.leaf_segments or (final and rows):
+            group, rows = rows[: self.leaf_segments], rows[self.leaf_segments :]
+            content = await self.backend.condense([text for _, text in group])
+            await self._add_node(meeting, session, 0, group[0][0], group[-1][0], content)
+            await self._merge_levels(meeting, session)
+
+        if final:
+            await self._collapse(meeting, session)
+        return [text for _, text in rows]
+
+    async def _merge_levels(self, meeting: Meeting, session: AsyncSession) -> None:
+        level = 0
+        while True:
+            nodes = await self._parentless(meeting, session, level)
+            if len(nodes) < self.fanout:
+                await session.commit()
+                return
+            await self._condense_nodes(meeting, session, nodes[: self.fanout], level + 1)
+            level += 1
+
+    async def _collapse(self, meeting: Meeting, session: AsyncSession) -> None:
+        """Reduce the frontier to a single root, e.g. before the final summary."""
+        while len(frontier := await self._frontier(meeting, session)) > 1:
+            for start in range(0, len(frontier), self.fanout):
+                group = frontier[start : start + self.fanout]
+                if len(group) > 1:
+                    level = max(n.level for n in group) + 1
+                    await self._condense_nodes(meeting, session, group, level)
+
+    async def _condense_nodes(
+        self, meeting: Meeting, session: AsyncSession, nodes: list[SummaryNode], level: int
+    ) -> None:
+        await session.commit()  # end the read before the model call
+        content = await self.backend.condense([n.content for n in nodes])
+        await self._add_node(
+            meeting,
+            session,
+            level,
+            nodes[0].first_segment_id,
+            nodes[-1].last_segment_id,
+            content,
+            children=nodes,
+        )
+
+    async def _add_node(
+        self,
+        meeting: Meeting,
+        session: AsyncSession,
+        level: int,
+        first_segment_id: int,
+        last_segment_id: int,
+        content: str,
+        children: Optional[list[SummaryNode]] = None,
+    ) -> None:
+        """Insert a node and attach ``children`` to it in one short transaction."""
+        parent = SummaryNode(
+            meeting_id=meeting.id,
+            level=level,
+            first_segment_id=first_segment_id,
+            last_segment_id=last_segment_id,
+            content=content,
+        )
+        session.add(parent)
+        if children:
+            await session.flush()
+            for node in children:
+                node.parent_id = parent.id
+        await session.commit()
+
+    async def _parentless(
+        self, meeting: Meeting, session: AsyncSession, level: int
+    ) -> list[SummaryNode]:
+        result = await session.execute(
+            select(SummaryNode)
+            .where(
+                SummaryNode.meeting_id == meeting.id,
+                SummaryNode.level == level,
+                SummaryNode.parent_id.is_(None),
+            )
+            .order_by(SummaryNode.first_segment_id)
+        )
+        return list(result.scalars())
+
+    async def _frontier(self, meeting: Meeting, session: AsyncSession) -> list[SummaryNode]:
+        result = await session.execute(
+            select(SummaryNode)
+            .where(SummaryNode.meeting_id == meeting.id, SummaryNode.parent_id.is_(None))
+            .order_by(SummaryNode.first_segment_id)
+        )
+        return list(result.scalars())
+
+    async def _recent_leaves(self, meeting: Meeting, session: AsyncSession) -> list[SummaryNode]:
+        result = await session.execute(
+            select(SummaryNode)
+            .where(SummaryNode.meeting_id == meeting.id, SummaryNode.level == 0)
+            .order_by(SummaryNode.last_segment_id.desc())
+            .limit(self.relevant_leaves)
+        )
+        return list(reversed(list(result.scalars())))
@@ -0,0 +1,589 @@
+"""Shared model backends hosted in worker processes, scheduled across meetings.
+
+Each model (ASR, VLM, LLM, ...) runs as a single instance in its own worker
+process, however many meetings use it. Meetings talk to it through a
+:class:`ModelClient`, which has the backend's methods and therefore satisfies
+the same protocol (``ASRBackend``, ``VisionLanguageModel``, ...)::
+
+    pool = ModelWorkerPool([ModelSpec("asr", load_asr, memory_mb=2500)], memory_budget_mb=8000)
+    audio = AudioService(capture_backend=..., asr_backend=pool.client("asr"))
+
+Requests for a model are served one at a time, in priority order (live work
+before interactive, before background post-processing). Within a priority,
+meetings take turns, so one meeting's backlog cannot starve another's. A
+client that is not bound to a meeting or priority takes them from the
+:func:`model_calls` block it is called in; the services open one around each
+meeting's work. Models are started on first use, or at startup when eager;
+when starting one would exceed the memory budget, the least recently used idle
+models are stopped first.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import logging
+import multiprocessing
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import anyio
+
+from app.core import errors, metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ModelWorkerError(errors.AppError):
+    """Raised when a model cannot be started or a call in its worker fails."""
+
+
+class Priority(IntEnum):
+    LIVE = 0  # live transcription and capture analysis
+    INTERACTIVE = 1  # user-facing requests, e.g. on-demand summaries
+    BACKGROUND = 2  # post-processing of recordings
+
+
+class WorkerState(str, Enum):
+    PENDING = "pending"  # not started yet
+    STARTING = "starting"
+    RUNNING = "running"
+    STOPPED = "stopped"  # evicted or crashed; starts again on the next call
+    FAILED = "failed"  # the last start failed; the next call retries
+
+
+_call_context: ContextVar[tuple[Optional[str], Optional[Priority]]] = ContextVar(
+    "model_call_context", default=(None, None)
+)
+
+
+@contextmanager
+def model_calls(
+    meeting_id: Optional[str] = None, priority: Optional[Priority] = None
+) -> Iterator[None]:
+    """
+    Attribute the pool calls made in this block to a meeting and a priority.
+
+    Tasks started inside the block inherit it. Values left as ``None`` are
+    taken from an enclosing block; a client's own meeting and priority, when
+    set, take precedence.
+    """
+
+    outer_meeting, outer_priority = _call_context.get()
+    token = _call_context.set(
+        (meeting_id or outer_meeting, priority if priority is not None else outer_priority)
+    )
+    try:
+        yield
+    finally:
+        _call_context.reset(token)
+
+
+def call_priority() -> Optional[Priority]:
+    """The priority set by the enclosing :func:`model_calls` blocks, if any."""
+    return _call_context.get()[1]
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    name: str
+    # Builds the backend inside the worker process; must be picklable, e.g. a
+    # module-level function.
+    factory: Callable[[], Any]
+    memory_mb: int = 0  # counted against the pool's budget while resident
+    # Priority of particular methods regardless of the client's, e.g.
+    # ``{"transcribe_file": Priority.BACKGROUND}``.
+    method_priorities: dict[str, Priority] = field(default_factory=dict)
+    # Start with the application and gate readiness, rather than on first use.
+    eager: bool = False
+    # Dummy inference run in the worker after ``factory`` when the pool warms
+    # models up, to prime caches and kernels; must be picklable too.
+    warmup: Optional[Callable[[Any], Any]] = None
+    # The class or protocol whose methods clients expose. Defaults to the
+    # factory when it is a class or a ``functools.partial`` of one; without
+    # either, clients forward any public method name.
+    interface: Optional[type] = None
+
+    def resolved_interface(self) -> Optional[type]:
+        if self.interface is not None:
+            return self.interface
+        factory = self.factory
+        while isinstance(factory, functools.partial):
+            factory = factory.func
+        return factory if isinstance(factory, type) else None
+
+
+@dataclass
+class ModelStatus:
+    state: WorkerState
+    memory_mb: int
+    queue_depth: int
+    start_seconds: Optional[float] = None
+    warmup_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+
+def _worker_main(
+    factory: Callable[[], Any], warmup: Optional[Callable[[Any], Any]], conn: Connection
+) -> None:
+    """Worker-process loop: build the backend, then serve calls until told to stop."""
+    loop = asyncio.new_event_loop()
+    try:
+        try:
+            backend = factory()
+            warmup_seconds = None
+            if warmup is not None:
+                begin = time.perf_counter()
+                result = warmup(backend)
+                if inspect.isawaitable(result):
+                    loop.run_until_complete(result)
+                warmup_seconds = time.perf_counter() - begin
+        except BaseException as exc:
+            conn.send(("error", f"{type(exc).__name__}: {exc}"))
+            return
+        conn.send(("ready", warmup_seconds))
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                return
+            if message is None:
+                return
+            method, args, kwargs = message
+            try:
+                result = getattr(backend, method)(*args, **kwargs)
+                if inspect.isawaitable(result):
+                    result = loop.run_until_complete(result)
+                conn.send(("ok", result))
+            except Exception as exc:
+                conn.send(("error", f"{type(exc).__name__}: {exc}"))
+    finally:
+        loop.close()
+
+
+class _Worker:
+    """Parent-side handle of one worker process; its methods block and run in threads."""
+
+    def __init__(self, spec: ModelSpec, context: Any, warmup: bool = False) -> None:
+        self.spec = spec
+        self.conn, child = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(spec.factory, spec.warmup if warmup else None, child),
+            name=f"model-{spec.name}",
+            daemon=True,
+        )
+        self._child = child
+        self.broken = False  # the pipe failed; the process is dead or unusable
+
+    def start(self) -> Optional[float]:
+        """Start the process and wait until the backend is built; returns the warmup time."""
+        self.process.start()
+        self._child.close()
+        status, payload = self._receive()
+        if status == "error":
+            self.stop()
+            raise ModelWorkerError(f"Model {self.spec.name} failed to start: {payload}")
+        return payload
+
+    def call(self, method: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+        try:
+            self.conn.send((method, args, kwargs))
+        except (OSError, ValueError) as exc:
+            self.broken = True
+            raise ModelWorkerError(f"Model {self.spec.name} worker is gone") from exc
+        status, payload = self._receive()
+        if status == "error":
+            raise ModelWorkerError(f"{self.spec.name}.{method} failed: {payload}")
+        return payload
+
+    def _receive(self) -> tuple[str, Any]:
+        try:
+            return self.conn.recv()
+        except (EOFError, OSError) as exc:
+            self.broken = True
+            self.process.join(1.0)
+            raise ModelWorkerError(
+                f"Model {self.spec.name} worker exited (code {self.process.exitcode})"
+            ) from exc
+
+    def stop(self, timeout: float = 5.0) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+
+
+@dataclass
+class _Request:
+    method: str
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    meeting_id: str
+    priority: Priority
+    future: asyncio.Future[Any]
+
+
+class _FairQueue:
+    """Strict priority across levels; round-robin across meetings within a level."""
+
+    def __init__(self) -> None:
+        self._levels: dict[Priority, OrderedDict[str, deque[_Request]]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, request: _Request) -> None:
+        meetings = self._levels.setdefault(request.priority, OrderedDict())
+        meetings.setdefault(request.meeting_id, deque()).append(request)
+        self._size += 1
+
+    def pop(self) -> _Request:
+        for priority in sorted(self._levels):
+            meetings = self._levels[priority]
+            if meetings:
+                meeting_id, queue = meetings.popitem(last=False)
+                request = queue.popleft()
+                if queue:
+                    meetings[meeting_id] = queue  # back of the line
+                self._size -= 1
+                return request
+        raise IndexError("pop from an empty queue")
+
+
+@dataclass
+class _Model:
+    spec: ModelSpec
+    queue: _FairQueue = field(default_factory=_FairQueue)
+    worker: Optional[_Worker] = None
+    dispatcher: Optional[asyncio.Task[None]] = None
+    # Held while the worker starts, so that no call reaches it before its handshake.
+    start_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    started: bool = False
+    active: int = 0  # loads and dispatchers in progress
+    last_used: float = 0.0
+    start_seconds: Optional[float] = None  # of the last successful start
+    warmup_seconds: Optional[float] = None  # part of start_seconds
+    error: Optional[str] = None  # of the last failed start
+
+    @property
+    def state(self) -> WorkerState:
+        if self.started:
+            return WorkerState.RUNNING
+        if self.worker is not None:
+            return WorkerState.STARTING
+        if self.error is not None:
+            return WorkerState.FAILED
+        return WorkerState.PENDING if self.start_seconds is None else WorkerState.STOPPED
+
+    @property
+    def idle(self) -> bool:
+        return not self.active and not self.queue
+
+
+class ModelClient:
+    """
+    A model as seen by its callers: any method call is queued to the shared worker.
+
+    ``await client.transcribe_chunk(chunk)`` runs ``transcribe_chunk(chunk)`` on
+    the backend in the worker process; arguments and results must be picklable.
+    Only the methods of the model's interface (see :class:`ModelSpec`) exist on
+    the client, so ``hasattr`` tells what the hosted backend supports. Calls are
+    attributed to the client's meeting and priority, or else to those of the
+    enclosing :func:`model_calls` block.
+    """
+
+    def __init__(
+        self,
+        pool: ModelWorkerPool,
+        model: str,
+        meeting_id: Optional[str] = None,
+        priority: Optional[Priority] = None,
+    ) -> None:
+        self.pool = pool
+        self.model = model
+        self.meeting_id = meeting_id
+        self.priority = priority
+
+    def __getattr__(self, method: str) -> Callable[..., Any]:
+        if method.startswith("_"):
+            raise AttributeError(method)
+        interface = self.pool.interface(self.model)
+        if interface is not None and not callable(getattr(interface, method, None)):
+            raise AttributeError(f"Model {self.model} ({interface.__name__}) has no {method!r}")
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            meeting_id, priority = _call_context.get()
+            if self.priority is not None:
+                priority = self.priority
+            return await self.pool.submit(
+                self.model,
+                method,
+                args,
+                kwargs,
+                self.meeting_id or meeting_id or "",
+                Priority.LIVE if priority is None else priority,
+            )
+
+        call.__name__ = method
+        return call
+
+
+class ModelWorkerPool:
+    """
+    The owner of every model backend: starts, schedules, evicts and stops them.
+
+    With ``warmup``, each model's :attr:`ModelSpec.warmup` runs in its worker
+    after the backend is built, before the worker counts as started.
+    """
+
+    def __init__(
+        self,
+        specs: Iterable[ModelSpec],
+        memory_budget_mb: Optional[int] = None,
+        warmup: bool = False,
+    ) -> None:
+        self._models = {spec.name: _Model(spec) for spec in specs}
+        for state in self._models.values():
+            if memory_budget_mb is not None and state.spec.memory_mb > memory_budget_mb:
+                raise ValueError(f"Model {state.spec.name} alone exceeds the memory budget")
+        self._interfaces = {name: m.spec.resolved_interface() for name, m in self._models.items()}
+        self.memory_budget_mb = memory_budget_mb
+        self.warmup = warmup
+        self._context = multiprocessing.get_context("spawn")
+        self._budget = asyncio.Condition()
+        self._closed = False
+        self._loads: set[asyncio.Task[None]] = set()
+        self.evictions = 0
+
+    @property
+    def resident(self) -> list[str]:
+        return [name for name, model in self._models.items() if model.worker is not None]
+
+    @property
+    def resident_mb(self) -> int:
+        return sum(m.spec.memory_mb for m in self._models.values() if m.worker is not None)
+
+    def queue_depth(self, model: str) -> int:
+        return len(self._models[model].queue)
+
+    def interface(self, model: str) -> Optional[type]:
+        """The class or protocol whose methods ``model``'s clients expose, if known."""
+        return self._interfaces[model]
+
+    def client(
+        self, model: str, meeting_id: Optional[str] = None, priority: Optional[Priority] = None
+    ) -> ModelClient:
+        if model not in self._models:
+            raise KeyError(model)
+        return ModelClient(self, model, meeting_id, priority)
+
+    def start(self) -> None:
+        """Start every eager model's worker in the background, without waiting."""
+        for name, state in self._models.items():
+            if state.spec.eager:
+                task = asyncio.get_running_loop().create_task(
+                    self._load_in_background(name), name=f"model-pool-load-{name}"
+                )
+                self._loads.add(task)
+                task.add_done_callback(self._loads.discard)
+
+    async def _load_in_background(self, model: str) -> None:
+        try:
+            await self.load(model)
+        except ModelWorkerError:
+            logger.exception("Starting model %s failed; the next call retries", model)
+
+    @property
+    def ready(self) -> bool:
+        """Whether every eager model has started (it may since have been evicted)."""
+        return all(
+            state.start_seconds is not None for state in self._models.values() if state.spec.eager
+        )
+
+    def status(self) -> dict[str, ModelStatus]:
+        return {
+            name: ModelStatus(
+                state=state.state,
+                memory_mb=state.spec.memory_mb,
+                queue_depth=len(state.queue),
+                start_seconds=state.start_seconds,
+                warmup_seconds=state.warmup_seconds,
+                error=state.error,
+            )
+            for name, state in self._models.items()
+        }
+
+    async def submit(
+        self,
+        model: str,
+        method: str,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        meeting_id: str,
+        priority: Priority = Priority.LIVE,
+    ) -> Any:
+        """Queue one backend call and wait for its result."""
+        if self._closed:
+            raise ModelWorkerError("Model pool is closed")
+        state = self._models[model]
+        priority = state.spec.method_priorities.get(method, priority)
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        state.queue.push(_Request(method, args, kwargs, meeting_id, priority, future))
+        metrics.MODEL_POOL_QUEUE_DEPTH.labels(model).set(len(state.queue))
+        if state.dispatcher is None or state.dispatcher.done():
+            state.dispatcher = asyncio.get_running_loop().create_task(
+                self._dispatch(state), name=f"model-pool-{model}"
+            )
+        return await future
+
+    async def load(self, model: str) -> None:
+        """Start a model's worker ahead of its first request."""
+        state = self._models[model]
+        state.active += 1
+        try:
+            await self._make_resident(state)
+        finally:
+            state.active -= 1
+            await self._notify()
+
+    async def _dispatch(self, state: _Model) -> None:
+        name = state.spec.name
+        state.active += 1
+        try:
+            while state.queue:
+                try:
+                    await self._make_resident(state)
+                except ModelWorkerError as exc:
+                    # Fail everything queued; the next request tries to start it again.
+                    while state.queue:
+                        request = state.queue.pop()
+                        if not request.future.done():
+                            request.future.set_exception(exc)
+                    metrics.MODEL_POOL_QUEUE_DEPTH.labels(name).set(0)
+                    break
+
+                request = state.queue.pop()
+                metrics.MODEL_POOL_QUEUE_DEPTH.labels(name).set(len(state.queue))
+                if request.future.done():  # the caller was cancelled
+                    continue
+                worker = state.worker
+                assert worker is not None
+                try:
+                    result = await anyio.to_thread.run_sync(
+                        worker.call, request.method, request.args, request.kwargs
+                    )
+                except ModelWorkerError as exc:
+                    if worker.broken:
+                        logger.error("Model %s worker died; it restarts on the next request", name)
+                        await self._stop(state)
+                    if not request.future.done():
+                        request.future.set_exception(exc)
+                else:
+                    if not request.future.done():
+                        request.future.set_result(result)
+                finally:
+                    state.last_used = time.monotonic()
+        finally:
+            state.active -= 1
+            await self._notify()
+
+    async def _notify(self) -> None:
+        async with self._budget:
+            self._budget.notify_all()
+
+    async def _make_resident(self, state: _Model) -> None:
+        """
+        Start the model's worker, first stopping idle models to fit the budget.
+
+        Concurrent callers (``load()`` and the dispatcher) wait for a single
+        start: a call sent before the worker's ready handshake has been read
+        would receive the handshake as its result.
+        """
+        async with state.start_lock:
+            if state.started:
+                return
+            await self._start(state)
+
+    async def _start(self, state: _Model) -> None:
+        async with self._budget:
+            while not self._fits(state.spec):
+                victim = self._eviction_candidate(exclude=state)
+                if victim is None:
+                    await self._budget.wait()  # until a resident model goes idle
+                    continue
+                await self._stop(victim)
+                self.evictions += 1
+                metrics.MODEL_POOL_EVICTIONS.labels(victim.spec.name).inc()
+                logger.info(
+                    "Stopped idle model %s to make room for %s", victim.spec.name, state.spec.name
+                )
+            worker = _Worker(state.spec, self._context, self.warmup)
+            # Reserve the memory before the (slow) start, under the condition's lock.
+            state.worker = worker
+            metrics.MODEL_POOL_RESIDENT_MB.set(self.resident_mb)
+        started = time.perf_counter()
+        try:
+            # The thread runs to the end even if we are cancelled; record its outcome.
+            with anyio.CancelScope(shield=True):
+                warmup_seconds = await anyio.to_thread.run_sync(worker.start)
+        except ModelWorkerError as exc:
+            state.worker, state.error = None, str(exc)
+            metrics.MODEL_POOL_RESIDENT_MB.set(self.resident_mb)
+            raise
+        state.started, state.error = True, None
+        state.start_seconds = time.perf_counter() - started
+        state.warmup_seconds = warmup_seconds
+        logger.info(
+            "Model %s started in %.3fs%s",
+            state.spec.name,
+            state.start_seconds,
+            f", including a {warmup_seconds:.3f}s warmup" if warmup_seconds is not None else "",
+        )
+
+    def _fits(self, spec: ModelSpec) -> bool:
+        if self.memory_budget_mb is None:
+            return True
+        return self.resident_mb + spec.memory_mb <= self.memory_budget_mb
+
+    def _eviction_candidate(self, exclude: _Model) -> Optional[_Model]:
+        idle = [
+            m for m in self._models.values() if m is not exclude and m.worker is not None and m.idle
+        ]
+        return min(idle, key=lambda m: m.last_used, default=None)
+
+    async def _stop(self, state: _Model) -> None:
+        worker, state.worker = state.worker, None
+        state.started = False
+        metrics.MODEL_POOL_RESIDENT_MB.set(self.resident_mb)
+        if worker is not None:
+            await anyio.to_thread.run_sync(worker.stop)
+
+    async def close(self) -> None:
+        """Fail queued requests and stop every worker."""
+        self._closed = True
+        for task in list(self._loads):
+            task.cancel()
+        await asyncio.gather(*self._loads, return_exceptions=True)
+        for state in self._models.values():
+            while state.queue:
+                request = state.queue.pop()
+                if not request.future.done():
+                    request.future.set_exception(ModelWorkerError("Model pool is closed"))
+            if state.dispatcher is not None:
+                state.dispatcher.cancel()
+        for state in self._models.values():
+            await self._stop(state)
@@ -0,0 +1,275 @@
+"""Sliced, parallel, resumable transcription of full-meeting recordings."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import tempfile
+import wave
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional
+
+import anyio
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import RawAudioArtifact, TranscriptionCheckpoint, TranscriptSegment
+from app.services.audio_archive import AudioArchive, is_archive
+
+if TYPE_CHECKING:
+    from app.services.audio import ASRBackend
+
+logger = logging.getLogger(__name__)
+
+# Column values of a backend segment, with timestamps already shifted to the slice offset.
+# Plain dicts rather than ORM objects so that rows can come back from worker processes.
+SegmentRow = dict[str, Any]
+
+# Columns owned by the database or by the artifact being transcribed, not by the backend.
+_NOT_FROM_BACKEND = frozenset({"id", "meeting_id"})
+
+_ENERGY_FRAME_SECONDS = 0.02
+_SAMPLE_DTYPES = {1: np.uint8, 2: np.int16, 4: np.int32}
+
+
+def _wav_blocks(audio_path: Path) -> Optional[tuple[int, int, Iterator[np.ndarray]]]:
+    """``(rate, frames, blocks)`` of a PCM WAV file as float mono blocks; None if unreadable."""
+    try:
+        reader = wave.open(str(audio_path), "rb")
+    except (wave.Error, EOFError):
+        return None
+    rate, width, channels = reader.getframerate(), reader.getsampwidth(), reader.getnchannels()
+    total = reader.getnframes()
+    if width not in _SAMPLE_DTYPES:
+        reader.close()
+        return None
+
+    block_frames = max(int(rate * _ENERGY_FRAME_SECONDS), 1) * 500
+
+    def blocks() -> Iterator[np.ndarray]:
+        with reader:
+            while raw := reader.readframes(block_frames):
+                samples = np.frombuffer(raw, dtype=_SAMPLE_DTYPES[width]).astype(np.float32)
+                if width == 1:
+                    samples -= 128.0
+                yield samples.reshape(-1, channels).mean(axis=1)
+
+    return rate, total, blocks()
+
+
+def _archive_blocks(audio_path: Path) -> tuple[int, int, Iterator[np.ndarray]]:
+    """Like :func:`_wav_blocks` for an archive, one decoded segment at a time."""
+    archive = AudioArchive(audio_path)
+    blocks = (
+        samples.astype(np.float32).mean(axis=1)
+        for samples in archive.iter_frames(0, archive.total_frames)
+    )
+    return archive.sample_rate, archive.total_frames, blocks
+
+
+def find_silence_bounds(
+    audio_path: Path, target_seconds: float, search_seconds: float
+) -> list[tuple[int, int]]:
+    """
+    Split a recording into slices of about ``target_seconds`` at quiet points.
+
+    Each cut is placed at the lowest-energy 20 ms frame within
+    ``search_seconds`` of the target position. The recording, a WAV file or an
+    :class:`AudioArchive`, is read block by block. Files that are neither
+    yield a single slice covering the whole file.
+
+    Returns:
+        list[tuple[int, int]]: ``(start, end)`` sample frames per slice; ``end``
+        is ``-1`` for the whole-file fallback.
+    """
+
+    if is_archive(audio_path):
+        source: Optional[tuple[int, int, Iterator[np.ndarray]]] = _archive_blocks(audio_path)
+    else:
+        source = _wav_blocks(audio_path)
+    if source is None or source[1] == 0:
+        return [(0, -1)]
+    rate, total, blocks = source
+    frame = max(int(rate * _ENERGY_FRAME_SECONDS), 1)
+    energies: list[np.ndarray] = []
+    carry = np.zeros(0, dtype=np.float32)
+    for block in blocks:
+        # Blocks need not be a whole number of energy frames; carry the rest over.
+        samples = np.concatenate([carry, block]) if len(carry) else block
+        usable = len(samples) // frame * frame
+        if usable:
+            energies.append(np.sqrt((samples[:usable].reshape(-1, frame) ** 2).mean(axis=1)))
+        carry = samples[usable:]
+    energy = np.concatenate(energies) if energies else np.zeros(0, dtype=np.float32)
+
+    target = max(int(target_seconds / _ENERGY_FRAME_SECONDS), 1)
+    search = int(search_seconds / _ENERGY_FRAME_SECONDS)
+    cuts = [0]
+    while cuts[-1] + target + search < len(energy):
+        lo, hi = cuts[-1] + target - search, cuts[-1] + target + search
+        lo = max(lo, cuts[-1] + 1)
+        cuts.append(lo + int(np.argmin(energy[lo:hi])))
+    bounds = [c * frame for c in cuts] + [total]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _write_slice(audio_path: Path, start: int, end: int, destination: Path) -> float:
+    """Copy sample frames ``[start, end)`` into a new WAV file; return the offset in seconds."""
+    if is_archive(audio_path):
+        archive = AudioArchive(audio_path)
+        with wave.open(str(destination), "wb") as writer:
+            writer.setnchannels(archive.channels)
+            writer.setsampwidth(2)
+            writer.setframerate(archive.sample_rate)
+            for samples in archive.iter_frames(start, end):
+                writer.writeframes(samples.astype("<i2", copy=False).tobytes())
+        return start / archive.sample_rate
+    with wave.open(str(audio_path), "rb") as reader:
+        reader.setpos(start)
+        frames = reader.readframes(end - start)
+        with wave.open(str(destination), "wb") as writer:
+            writer.setparams(reader.getparams())
+            writer.writeframes(frames)
+        return start / reader.getframerate()
+
+
+async def _transcribe_slice_with(
+    backend: ASRBackend, audio_path: Path, start: int, end: int
+) -> list[SegmentRow]:
+    if end < 0:
+        segments = await backend.transcribe_file(audio_path)
+        offset = 0.0
+    else:
+        with tempfile.TemporaryDirectory(prefix="callyfy-slice-") as tmp:
+            slice_path = Path(tmp) / "slice.wav"
+            offset = await anyio.to_thread.run_sync(
+                _write_slice, audio_path, start, end, slice_path
+            )
+            segments = await backend.transcribe_file(slice_path)
+    return [_segment_row(segment, timedelta(seconds=offset)) for segment in segments]
+
+
+def _segment_row(segment: TranscriptSegment, shift: timedelta) -> SegmentRow:
+    row = {
+        column.key: getattr(segment, column.key)
+        for column in TranscriptSegment.__table__.columns
+        if column.key not in _NOT_FROM_BACKEND
+    }
+    row["started_at"] += shift
+    row["ended_at"] += shift
+    return row
+
+
+_worker_backends: dict[Callable[[], ASRBackend], ASRBackend] = {}
+
+
+def _transcribe_slice_in_process(
+    factory: Callable[[], ASRBackend], audio_path: Path, start: int, end: int
+) -> list[SegmentRow]:
+    """Worker-process entry point; the backend is built once per process and reused."""
+    backend = _worker_backends.get(factory)
+    if backend is None:
+        backend = _worker_backends[factory] = factory()
+    return asyncio.run(_transcribe_slice_with(backend, audio_path, start, end))
+
+
+@dataclass
+class SlicedTranscriber:
+    """
+    Transcribe a :class:`RawAudioArtifact` slice by slice.
+
+    Slices are cut at silence, transcribed concurrently and persisted strictly
+    in order, one transaction per slice together with a
+    :class:`TranscriptionCheckpoint`. A restarted run resumes after the last
+    committed slice. With ``asr_factory`` set, slices are transcribed in worker
+    processes that each build their own backend from it (it must be picklable,
+    e.g. a module-level function); otherwise the in-process backend is used.
+
+    Segment timestamps returned by ``transcribe_file`` for a slice are shifted
+    by the slice's offset into the recording.
+    """
+
+    asr_backend: ASRBackend
+    asr_factory: Optional[Callable[[], ASRBackend]] = None
+    workers: int = 2
+    slice_seconds: float = 60.0
+    search_seconds: float = 5.0
+
+    async def transcribe(
+        self, artifact: RawAudioArtifact, session: AsyncSession, audio_path: Optional[Path] = None
+    ) -> int:
+        """
+        Transcribe the remaining slices of ``artifact``; return the number of segments added.
+
+        ``audio_path``, a WAV file or an :class:`AudioArchive`, overrides
+        ``artifact.file_path``.
+        """
+        audio_path = audio_path or Path(artifact.file_path)
+        checkpoint = await session.get(TranscriptionCheckpoint, artifact.id)
+        if checkpoint is None:
+            bounds = await anyio.to_thread.run_sync(
+                find_silence_bounds, audio_path, self.slice_seconds, self.search_seconds
+            )
+            checkpoint = TranscriptionCheckpoint(
+                artifact_id=artifact.id, slice_bounds=json.dumps(bounds), completed_slices=0
+            )
+            session.add(checkpoint)
+            await session.commit()
+
+        slices = [tuple(b) for b in json.loads(checkpoint.slice_bounds)]
+        first = checkpoint.completed_slices
+        if first:
+            logger.info(
+                "Resuming transcription of artifact %s at slice %d/%d",
+                artifact.id,
+                first,
+                len(slices),
+            )
+
+        limiter = anyio.CapacityLimiter(self.workers)
+        # Bounds how far transcription may run ahead of the in-order writer.
+        window = anyio.Semaphore(self.workers * 2)
+        turn = anyio.Condition()
+        state = {"next": first, "written": 0}
+
+        async def run_slice(index: int, start: int, end: int) -> None:
+            try:
+                rows = await self._transcribe_slice(audio_path, start, end, limiter)
+                async with turn:
+                    while state["next"] != index:
+                        await turn.wait()
+                    for row in rows:
+                        session.add(TranscriptSegment(meeting_id=artifact.meeting_id, **row))
+                    checkpoint.completed_slices = index + 1
+                    # A failing sibling slice must not cancel a commit half-way.
+                    with anyio.CancelScope(shield=True):
+                        await session.commit()
+                    state["next"], state["written"] = index + 1, state["written"] + len(rows)
+                    turn.notify_all()
+            finally:
+                window.release()
+
+        async with anyio.create_task_group() as tg:
+            for index in range(first, len(slices)):
+                await window.acquire()
+                start, end = slices[index]
+                tg.start_soon(run_slice, index, start, end)
+        return state["written"]
+
+    async def _transcribe_slice(
+        self, audio_path: Path, start: int, end: int, limiter: anyio.CapacityLimiter
+    ) -> list[SegmentRow]:
+        if self.asr_factory is not None:
+            return await anyio.to_process.run_sync(
+                _transcribe_slice_in_process,
+                self.asr_factory,
+                audio_path,
+                start,
+                end,
+                limiter=limiter,
+            )
+        async with limiter:
+            return await _transcribe_slice_with(self.asr_backend, audio_path, start, end)
@@ -2,30 +2,126 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import logging
+from dataclasses import dataclass, field
 from datetime import timedelta
-from typing import Awaitable, Callable
+from enum import Enum
+from typing import Awaitable, Callable, Optional
 
 import anyio
 
+from app.core import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class OverrunPolicy(str, Enum):
+    """What to do with ticks that came due while a run was still in progress."""
+
+    SKIP = "skip"  # drop them and wait for the next tick on the grid
+    COALESCE = "coalesce"  # run once immediately in place of all of them
+    QUEUE = "queue"  # run each of them back-to-back, up to PeriodicTask.max_backlog
+
+
+@dataclass
+class TaskStats:
+    runs: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    missed_ticks: int = 0
+    last_lag: float = 0.0
+    max_lag: float = 0.0
+    last_runtime: float = 0.0
+    max_runtime: float = 0.0
+    last_error: Optional[str] = None
+
 
 @dataclass
 class PeriodicTask:
     name: str
     interval: timedelta
     coro_factory: Callable[[], Awaitable[None]]
+    overrun_policy: OverrunPolicy = OverrunPolicy.SKIP
+    timeout: Optional[timedelta] = None
+    max_backlog: int = 10
+    stats: TaskStats = field(default_factory=TaskStats)
 
 
 @dataclass
 class SchedulerService:
     tasks: list[PeriodicTask]
+    # The monotonic clock ticks are placed on; replaceable in tests.
+    clock: Callable[[], float] = anyio.current_time
+    sleep_until: Callable[[float], Awaitable[None]] = anyio.sleep_until
 
     async def start(self) -> None:
         async with anyio.create_task_group() as tg:
             for task in self.tasks:
                 tg.start_soon(self._run_task, task)
 
+    def stats(self) -> dict[str, TaskStats]:
+        """Per-task lag (seconds behind the tick), runtime and missed-tick counters."""
+        return {task.name: task.stats for task in self.tasks}
+
     async def _run_task(self, task: PeriodicTask) -> None:
+        # Ticks sit on a fixed grid of the monotonic clock, so runtime does not
+        # push later ticks back.
+        interval = task.interval.total_seconds()
+        next_tick = self.clock()
         while True:
-            await task.coro_factory()
-            await anyio.sleep(task.interval.total_seconds())
+            await self.sleep_until(next_tick)
+            started = self.clock()
+            await self._invoke(task)
+            finished = self.clock()
+
+            stats = task.stats
+            stats.runs += 1
+            stats.last_lag = started - next_tick
+            stats.max_lag = max(stats.max_lag, stats.last_lag)
+            metrics.SCHEDULER_LAG.labels(task.name).set(stats.last_lag)
+            stats.last_runtime = finished - started
+            stats.max_runtime = max(stats.max_runtime, stats.last_runtime)
+
+            next_tick += interval
+            if finished >= next_tick:
+                next_tick += self._handle_overrun(task, finished, next_tick, interval) * interval
+
+    def _handle_overrun(
+        self, task: PeriodicTask, now: float, next_tick: float, interval: float
+    ) -> int:
+        """Account for overdue ticks and return how many of them to drop."""
+        overdue = int((now - next_tick) // interval) + 1
+        if task.overrun_policy is OverrunPolicy.SKIP:
+            dropped = overdue
+        elif task.overrun_policy is OverrunPolicy.COALESCE:
+            dropped = overdue - 1
+        else:
+            dropped = max(overdue - task.max_backlog, 0)
+
+        if dropped:
+            task.stats.missed_ticks += dropped
+            metrics.SCHEDULER_MISSED_TICKS.labels(task.name).inc(dropped)
+            logger.warning(
+                "Task %s overran its %.1fs interval; dropped %d tick(s)",
+                task.name,
+                interval,
+                dropped,
+            )
+        return dropped
+
+    async def _invoke(self, task: PeriodicTask) -> None:
+        """Run one tick; failures and timeouts are recorded instead of propagating."""
+        timeout = task.timeout.total_seconds() if task.timeout is not None else None
+        try:
+            with anyio.move_on_after(timeout) as scope:
+                await task.coro_factory()
+        except Exception as exc:
+            # Including a TimeoutError of the task's own: only ours is a timeout.
+            task.stats.failures += 1
+            task.stats.last_error = repr(exc)
+            logger.exception("Task %s failed", task.name)
+            return
+        if scope.cancelled_caught:
+            task.stats.timeouts += 1
+            task.stats.last_error = "timeout"
+            logger.warning("Task %s timed out after %s", task.name, task.timeout)
@@ -2,24 +2,79 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
-from sqlalchemy import select
+import anyio
+from sqlalchemy import column, func, literal_column, select, table
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db import fts
 from app.models import ScreenCapture, SummaryRecord, TranscriptSegment
+from app.services.vector_index import VectorIndex
+
+SNIPPET_OPEN = "<mark>"
+SNIPPET_CLOSE = "</mark>"
+SNIPPET_ELLIPSIS = "…"
+SNIPPET_TOKENS = 16
+
+
+@dataclass
+class TranscriptHit:
+    segment: TranscriptSegment
+    snippet: str
+    rank: float
+
+
+@dataclass
+class CaptureHit:
+    capture: ScreenCapture
+    score: float
 
 
 @dataclass
 class SearchService:
-    text_index_path: Path
     vector_index_path: Path
+    vector_train_threshold: Optional[int] = None
 
-    async def full_text_search(self, query: str, session: AsyncSession) -> list[TranscriptSegment]:
-        like_query = f"%{query}%"
-        result = await session.execute(
-            select(TranscriptSegment).where(TranscriptSegment.text.ilike(like_query))
+    def __post_init__(self) -> None:
+        # Shared with the VisionService appending to the same directory.
+        self.vector_index = VectorIndex.shared(
+            self.vector_index_path, train_threshold=self.vector_train_threshold
         )
-        return list(result.scalars())
+
+    async def full_text_search(
+        self,
+        query: str,
+        session: AsyncSession,
+        meeting_id: Optional[str] = None,
+        limit: int = 20,
+    ) -> list[TranscriptHit]:
+        match = fts.build_match_expression(query)
+        if not match:
+            return []
+
+        fts_rows = table(fts.TRANSCRIPT_FTS_TABLE, column("rowid"))
+        fts_table = literal_column(fts.TRANSCRIPT_FTS_TABLE)
+        rank = func.bm25(fts_table).label("rank")
+        snippet = func.snippet(
+            fts_table, 0, SNIPPET_OPEN, SNIPPET_CLOSE, SNIPPET_ELLIPSIS, SNIPPET_TOKENS
+        ).label("snippet")
+        stmt = (
+            select(TranscriptSegment, snippet, rank)
+            .select_from(fts_rows)
+            .join(TranscriptSegment, TranscriptSegment.id == fts_rows.c.rowid)
+            .where(fts_table.op("MATCH")(match))
+            .order_by(rank)
+            .limit(limit)
+        )
+        if meeting_id is not None:
+            stmt = stmt.where(TranscriptSegment.meeting_id == meeting_id)
+
+        result = await session.execute(stmt)
+        return [
+            TranscriptHit(segment=segment, snippet=snippet_text, rank=score)
+            for segment, snippet_text, score in result.all()
+        ]
 
     async def semantic_summary_search(
         self, query: str, session: AsyncSession
@@ -31,7 +86,25 @@ class SearchService:
         return list(result.scalars())
 
     async def visual_search(
-        self, query_embedding: bytes, session: AsyncSession
-    ) -> list[ScreenCapture]:
-        # TODO: integrate with local vector index (FAISS, Milvus Lite, LanceDB) using embeddings
-        return []
+        self,
+        query_embedding: bytes,
+        session: AsyncSession,
+        meeting_id: Optional[str] = None,
+        limit: int = 10,
+    ) -> list[CaptureHit]:
+        hits = await anyio.to_thread.run_sync(
+            lambda: self.vector_index.search(query_embedding, k=limit, meeting_id=meeting_id)
+        )
+        if not hits:
+            return []
+
+        result = await session.execute(
+            select(ScreenCapture).where(ScreenCapture.id.in_([hit.capture_id for hit in hits]))
+        )
+        captures = {capture.id: capture for capture in result.scalars()}
+        # Rows deleted from the database since they were indexed are skipped.
+        return [
+            CaptureHit(capture=captures[hit.capture_id], score=hit.score)
+            for hit in hits
+            if hit.capture_id in captures
+        ]
@@ -1,12 +1,234 @@
 from __future__ import annotations
 
+import base64
+import heapq
 from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from itertools import islice
 from pathlib import Path
+from typing import Any, AsyncIterator, Iterable, Optional
 
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, Select, func, literal, null, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Meeting, RawAudioArtifact, ScreenCapture, SummaryRecord, TranscriptSegment
+from app.models import (
+    Meeting,
+    MeetingsState,
+    RawAudioArtifact,
+    ScreenCapture,
+    SummaryRecord,
+    TranscriptSegment,
+)
+
+MeetingCursor = tuple[datetime, str]
+TimelineCursor = tuple[datetime, str, int]
+
+
+class AssetKind(str, Enum):
+    TRANSCRIPT = "transcript"
+    CAPTURE = "capture"
+    SUMMARY = "summary"
+    AUDIO = "audio"
+
+
+ASSET_MODELS: dict[AssetKind, Any] = {
+    AssetKind.TRANSCRIPT: TranscriptSegment,
+    AssetKind.CAPTURE: ScreenCapture,
+    AssetKind.SUMMARY: SummaryRecord,
+    AssetKind.AUDIO: RawAudioArtifact,
+}
+
+ASSET_TIME_COLUMNS: dict[AssetKind, Any] = {
+    AssetKind.TRANSCRIPT: TranscriptSegment.started_at,
+    AssetKind.CAPTURE: ScreenCapture.captured_at,
+    AssetKind.SUMMARY: SummaryRecord.generated_at,
+    AssetKind.AUDIO: RawAudioArtifact.recorded_at,
+}
+
+
+@dataclass
+class TimelineEntry:
+    """One asset of a meeting, projected to the columns shared by the merged timeline.
+
+    ``text`` is the transcript text, capture description or summary content;
+    ``detail`` is the capture image path, summary kind or audio file path.
+    """
+
+    kind: AssetKind
+    id: int
+    at: datetime
+    ended_at: Optional[datetime]
+    text: Optional[str]
+    detail: Optional[str]
+
+
+def _encode(*parts: str) -> str:
+    return base64.urlsafe_b64encode("|".join(parts).encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str, count: int) -> list[str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (UnicodeDecodeError, ValueError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+    parts = raw.split("|", count - 1)
+    if len(parts) != count:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return parts
+
+
+def encode_cursor(created_at: datetime, meeting_id: str) -> str:
+    return _encode(created_at.isoformat(), meeting_id)
+
+
+def decode_cursor(cursor: str) -> MeetingCursor:
+    """Parse a cursor from :func:`encode_cursor`; raises ValueError if malformed."""
+    created_at, meeting_id = _decode(cursor, 2)
+    try:
+        return datetime.fromisoformat(created_at), meeting_id
+    except ValueError as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+
+
+def encode_timeline_cursor(entry: TimelineEntry) -> str:
+    return _encode(entry.at.isoformat(), entry.kind.value, str(entry.id))
+
+
+def decode_timeline_cursor(cursor: str) -> TimelineCursor:
+    """Parse a cursor from :func:`encode_timeline_cursor`; raises ValueError if malformed."""
+    at, kind, asset_id = _decode(cursor, 3)
+    try:
+        return datetime.fromisoformat(at), AssetKind(kind).value, int(asset_id)
+    except ValueError as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+
+
+def _position(entry: TimelineEntry) -> TimelineCursor:
+    return entry.at, entry.kind.value, entry.id
+
+
+def timeline_statement(
+    meeting_id: str, kind: AssetKind, after: Optional[TimelineCursor] = None
+) -> Select[Any]:
+    """
+    Select one asset type's timeline entries after ``after`` in ``(meeting_id, time)`` index order.
+
+    The timeline is ordered by ``(at, kind, id)``. Within one asset type the
+    kind is constant, so the cursor reduces to a range on the time column that
+    the index can seek to.
+    """
+    model = ASSET_MODELS[kind]
+    at_column = ASSET_TIME_COLUMNS[kind]
+    ended_at: ColumnElement[Any] = null()
+    text: ColumnElement[Any] = null()
+    detail: ColumnElement[Any] = null()
+    if kind is AssetKind.TRANSCRIPT:
+        ended_at, text = TranscriptSegment.ended_at, TranscriptSegment.text
+    elif kind is AssetKind.CAPTURE:
+        text, detail = ScreenCapture.description, ScreenCapture.image_path
+    elif kind is AssetKind.SUMMARY:
+        text, detail = SummaryRecord.content, SummaryRecord.kind
+    else:
+        detail = RawAudioArtifact.file_path
+    stmt = (
+        select(
+            literal(kind.value).label("kind"),
+            model.id.label("id"),
+            at_column.label("at"),
+            ended_at.label("ended_at"),
+            text.label("text"),
+            detail.label("detail"),
+        )
+        .where(model.meeting_id == meeting_id)
+        .order_by(at_column, model.id)
+    )
+    if after is not None:
+        at, after_kind, asset_id = after
+        if kind.value == after_kind:
+            stmt = stmt.where(tuple_(at_column, model.id) > tuple_(at, asset_id))
+        elif kind.value > after_kind:
+            stmt = stmt.where(at_column >= at)
+        else:
+            stmt = stmt.where(at_column > at)
+    return stmt
+
+
+async def _merge_timelines(
+    branches: list[AsyncIterator[TimelineEntry]],
+) -> AsyncIterator[TimelineEntry]:
+    """Merge timeline streams that are each in order, like :func:`heapq.merge`."""
+    heap = []
+    for index, branch in enumerate(branches):
+        entry = await anext(branch, None)
+        if entry is not None:
+            heap.append((_position(entry), index, entry))
+    heapq.heapify(heap)
+    while heap:
+        _, index, entry = heap[0]
+        yield entry
+        following = await anext(branches[index], None)
+        if following is None:
+            heapq.heappop(heap)
+        else:
+            heapq.heapreplace(heap, (_position(following), index, following))
+
+
+def assets_statement(meeting_id: str, kind: AssetKind) -> Select[Any]:
+    """Select one asset type of a meeting in ``(meeting_id, time)`` index order."""
+    model = ASSET_MODELS[kind]
+    return (
+        select(model)
+        .where(model.meeting_id == meeting_id)
+        .order_by(ASSET_TIME_COLUMNS[kind], model.id)
+    )
+
+
+def meetings_page_statement(
+    limit: int, after: Optional[MeetingCursor] = None, include_counts: bool = False
+) -> Select[Any]:
+    """Select up to ``limit`` meetings after ``after``, newest first, in index order."""
+    columns: list[Any] = [
+        Meeting.id,
+        Meeting.title,
+        Meeting.created_at,
+        Meeting.started_at,
+        Meeting.ended_at,
+        Meeting.version,
+    ]
+    if include_counts:
+        for label, model in (
+            ("transcript_count", TranscriptSegment),
+            ("capture_count", ScreenCapture),
+            ("summary_count", SummaryRecord),
+        ):
+            columns.append(
+                select(func.count())
+                .where(model.meeting_id == Meeting.id)  # type: ignore[attr-defined]
+                .correlate(Meeting)
+                .scalar_subquery()
+                .label(label)
+            )
+
+    stmt = select(*columns).order_by(Meeting.created_at.desc(), Meeting.id.desc()).limit(limit)
+    if after is not None:
+        stmt = stmt.where(tuple_(Meeting.created_at, Meeting.id) < tuple_(*after))
+    return stmt
+
+
+def latest_summary_statement(meeting_id: str, kind: str) -> Select[Any]:
+    return (
+        select(SummaryRecord)
+        .where(SummaryRecord.meeting_id == meeting_id, SummaryRecord.kind == kind)
+        .order_by(SummaryRecord.generated_at.desc())
+        .limit(1)
+    )
+
+
+@dataclass
+class MeetingListPage:
+    items: list[dict[str, Any]]
+    next_cursor: Optional[str]
 
 
 @dataclass
@@ -21,34 +243,177 @@ class StorageService:
         (self.base_dir / meeting.id).mkdir(parents=True, exist_ok=True)
         return meeting
 
-    async def list_meetings(self, session: AsyncSession) -> list[Meeting]:
-        result = await session.execute(select(Meeting))
-        return list(result.scalars())
+    async def list_meetings(
+        self,
+        session: AsyncSession,
+        limit: int = 50,
+        after: Optional[MeetingCursor] = None,
+        include_counts: bool = False,
+    ) -> MeetingListPage:
+        """
+        List meetings newest first, one keyset page at a time.
+
+        Only the columns shown in listings are selected. With
+        ``include_counts`` the per-meeting asset counts are computed by
+        correlated subqueries in the same statement.
+
+        Args:
+            session: Database session.
+            limit: Maximum number of meetings in the page.
+            after: ``(created_at, id)`` of the last meeting of the previous page.
+            include_counts: Add ``transcript_count``, ``capture_count`` and ``summary_count``.
+        """
+        stmt = meetings_page_statement(limit + 1, after, include_counts)
+        rows = [dict(row._mapping) for row in await session.execute(stmt)]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+        return MeetingListPage(items=rows, next_cursor=next_cursor)
 
     async def get_meeting_assets(
-        self, meeting: Meeting, session: AsyncSession
+        self,
+        meeting: Meeting,
+        session: AsyncSession,
+        kinds: Optional[Iterable[AssetKind]] = None,
     ) -> tuple[
         list[TranscriptSegment], list[ScreenCapture], list[SummaryRecord], list[RawAudioArtifact]
     ]:
-        transcripts = await session.execute(
-            select(TranscriptSegment).where(TranscriptSegment.meeting_id == meeting.id)
-        )
-        captures = await session.execute(
-            select(ScreenCapture).where(ScreenCapture.meeting_id == meeting.id)
-        )
-        summaries = await session.execute(
-            select(SummaryRecord).where(SummaryRecord.meeting_id == meeting.id)
-        )
-        audio = await session.execute(
-            select(RawAudioArtifact).where(RawAudioArtifact.meeting_id == meeting.id)
-        )
+        """
+        Load every asset of a meeting into lists, in time order.
+
+        Asset types not in ``kinds`` are not queried and come back empty. Prefer
+        :meth:`iter_meeting_timeline` or :meth:`iter_meeting_assets` for long
+        meetings, which stream instead of materializing everything.
+        """
+        wanted = set(kinds) if kinds is not None else set(AssetKind)
+        assets: dict[AssetKind, list[Any]] = {}
+        for kind in AssetKind:
+            assets[kind] = (
+                [asset async for asset in self.iter_meeting_assets(meeting.id, kind, session)]
+                if kind in wanted
+                else []
+            )
         return (
-            list(transcripts.scalars()),
-            list(captures.scalars()),
-            list(summaries.scalars()),
-            list(audio.scalars()),
+            assets[AssetKind.TRANSCRIPT],
+            assets[AssetKind.CAPTURE],
+            assets[AssetKind.SUMMARY],
+            assets[AssetKind.AUDIO],
+        )
+
+    @staticmethod
+    def _timeline_kinds(kinds: Optional[Iterable[AssetKind]]) -> list[AssetKind]:
+        return list(dict.fromkeys(kinds or AssetKind))
+
+    @staticmethod
+    def _entry(row: Any) -> TimelineEntry:
+        return TimelineEntry(
+            kind=AssetKind(row.kind),
+            id=row.id,
+            at=row.at,
+            ended_at=row.ended_at,
+            text=row.text,
+            detail=row.detail,
         )
 
+    async def iter_meeting_timeline(
+        self,
+        meeting_id: str,
+        session: AsyncSession,
+        kinds: Optional[Iterable[AssetKind]] = None,
+        after: Optional[TimelineCursor] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[TimelineEntry]:
+        """
+        Stream a meeting's assets as one time-ordered timeline.
+
+        Each requested asset type is read in keyset pages of ``batch_size``
+        rows in index order, and the pages are merged here. Memory use is
+        bounded by ``batch_size`` per type regardless of meeting length, and
+        SQLite never sorts.
+
+        Args:
+            meeting_id: Meeting to read.
+            session: Database session.
+            kinds: Asset types to include; all of them by default.
+            after: Resume after this ``(at, kind, id)`` position.
+            batch_size: Rows fetched per round trip.
+        """
+        branches = [
+            self._iter_timeline_kind(meeting_id, kind, session, after, batch_size)
+            for kind in self._timeline_kinds(kinds)
+        ]
+        async for entry in _merge_timelines(branches):
+            yield entry
+
+    async def _iter_timeline_kind(
+        self,
+        meeting_id: str,
+        kind: AssetKind,
+        session: AsyncSession,
+        after: Optional[TimelineCursor],
+        batch_size: int,
+    ) -> AsyncIterator[TimelineEntry]:
+        while True:
+            stmt = timeline_statement(meeting_id, kind, after).limit(batch_size)
+            entries = [self._entry(row) for row in await session.execute(stmt)]
+            for entry in entries:
+                yield entry
+            if len(entries) < batch_size:
+                return
+            after = _position(entries[-1])
+
+    async def get_meeting_timeline_page(
+        self,
+        meeting_id: str,
+        session: AsyncSession,
+        kinds: Optional[Iterable[AssetKind]] = None,
+        after: Optional[TimelineCursor] = None,
+        limit: int = 200,
+    ) -> tuple[list[TimelineEntry], Optional[str]]:
+        """Return one keyset page of the merged timeline and the cursor of the next page."""
+        branches = []
+        for kind in self._timeline_kinds(kinds):
+            stmt = timeline_statement(meeting_id, kind, after).limit(limit + 1)
+            branches.append([self._entry(row) for row in await session.execute(stmt)])
+        entries = list(islice(heapq.merge(*branches, key=_position), limit + 1))
+        if len(entries) <= limit:
+            return entries, None
+        entries = entries[:limit]
+        return entries, encode_timeline_cursor(entries[-1])
+
+    async def iter_meeting_assets(
+        self,
+        meeting_id: str,
+        kind: AssetKind,
+        session: AsyncSession,
+        batch_size: int = 500,
+    ) -> AsyncIterator[Any]:
+        """Stream full ORM rows of one asset type in time order, ``batch_size`` at a time."""
+        stmt = assets_statement(meeting_id, kind).execution_options(yield_per=batch_size)
+        result = await session.stream_scalars(stmt)
+        async for asset in result:
+            yield asset
+
+    async def latest_summary(
+        self, meeting_id: str, kind: str, session: AsyncSession
+    ) -> Optional[SummaryRecord]:
+        """Return the most recent summary of ``kind`` for a meeting, if any."""
+        return await session.scalar(latest_summary_statement(meeting_id, kind))
+
+    async def meetings_state(self, session: AsyncSession) -> tuple[int, Optional[datetime]]:
+        """
+        Return ``(version, last change)`` over all meetings.
+
+        Any creation, deletion or change of a meeting or its assets alters the
+        pair, so it can validate cached meeting listings. It is one primary-key
+        lookup of the trigger-maintained ``meetings_state`` row.
+        """
+        state = await session.get(MeetingsState, 1, populate_existing=True)
+        if state is None:
+            return 0, None
+        return state.version, state.updated_at
+
     def resolve_meeting_dir(self, meeting: Meeting) -> Path:
         return self.base_dir / meeting.id
 
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 from enum import Enum
-from typing import Protocol
+from typing import TYPE_CHECKING, Any, Optional, Protocol
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import metrics
+from app.core.tracing import new_trace_id, tracer
+from app.db.write_buffer import WriteBuffer, persist
 from app.models import Meeting, SummaryRecord
+from app.services.batching import BatchStats, MicroBatcher
+from app.services.events import EventBroker
+from app.services.model_pool import Priority, model_calls
+
+if TYPE_CHECKING:
+    from app.services.incremental_summary import IncrementalSummarizer
 
 
 class SummaryKind(str, Enum):
@@ -19,15 +29,96 @@ class SummarizationBackend(Protocol):
     async def summarize(self, meeting: Meeting, kind: SummaryKind) -> str: ...
 
 
+class BatchSummarizationBackend(Protocol):
+    async def summarize_batch(self, requests: list[tuple[Meeting, SummaryKind]]) -> list[str]: ...
+
+
+class BatchHierarchicalSummarizationBackend(Protocol):
+    async def condense_batch(self, requests: list[list[str]]) -> list[str]: ...
+
+    async def summarize_text_batch(
+        self, requests: list[tuple[list[str], SummaryKind]]
+    ) -> list[str]: ...
+
+
+class BatchingSummarizationBackend:
+    """
+    Summarization adapter that micro-batches LLM calls of several meetings.
+
+    Periodic summaries of concurrent meetings tend to fall due together; a
+    shared instance sends them to the LLM as one batch. It is a
+    :class:`SummarizationBackend` when the backend has ``summarize_batch``, and
+    a ``HierarchicalSummarizationBackend`` for :class:`IncrementalSummarizer`
+    when it has ``condense_batch`` and ``summarize_text_batch``.
+    """
+
+    def __init__(
+        self,
+        backend: BatchSummarizationBackend | BatchHierarchicalSummarizationBackend,
+        max_batch: int = 4,
+        max_wait: float = 0.1,
+    ) -> None:
+        self.backend = backend
+        self._batchers: dict[str, MicroBatcher] = {
+            name: MicroBatcher(getattr(backend, f"{name}_batch"), max_batch, max_wait, name=name)
+            for name in ("summarize", "condense", "summarize_text")
+            if hasattr(backend, f"{name}_batch")
+        }
+
+    async def _submit(self, name: str, item: Any) -> str:
+        batcher = self._batchers.get(name)
+        if batcher is None:
+            raise TypeError(f"{type(self.backend).__name__} has no {name}_batch method")
+        return await batcher.submit(item)
+
+    async def summarize(self, meeting: Meeting, kind: SummaryKind) -> str:
+        return await self._submit("summarize", (meeting, kind))
+
+    async def condense(self, parts: list[str]) -> str:
+        return await self._submit("condense", parts)
+
+    async def summarize_text(self, parts: list[str], kind: SummaryKind) -> str:
+        return await self._submit("summarize_text", (parts, kind))
+
+    def batch_stats(self) -> dict[str, BatchStats]:
+        return {name: batcher.stats for name, batcher in self._batchers.items()}
+
+
 @dataclass
 class SummarizationService:
     backend: SummarizationBackend
+    write_buffer: Optional[WriteBuffer] = None
+    broker: Optional[EventBroker] = None
+    # When set, summaries are built from the per-meeting summary tree instead of
+    # handing the whole meeting to ``backend``.
+    incremental: Optional[IncrementalSummarizer] = None
 
     async def generate_summary(
         self, meeting: Meeting, kind: SummaryKind, session: AsyncSession
     ) -> SummaryRecord:
-        content = await self.backend.summarize(meeting, kind)
-        record = SummaryRecord(meeting_id=meeting.id, kind=kind.value, content=content)
-        session.add(record)
-        await session.commit()
+        trace_id, started = new_trace_id(), time.time()
+        chunks = tracer.take_unsummarized(meeting.id)
+        with (
+            metrics.MODEL_LATENCY.labels("summarize").time(),
+            model_calls(meeting.id, Priority.INTERACTIVE),
+        ):
+            if self.incremental is not None:
+                content = await self.incremental.summarize(meeting, kind, session)
+            else:
+                content = await self.backend.summarize(meeting, kind)
+        record = SummaryRecord(
+            meeting_id=meeting.id, kind=kind.value, content=content, trace_id=trace_id
+        )
+        record = await persist(record, session, self.write_buffer)
+        tracer.summary_persisted(
+            meeting.id,
+            trace_id,
+            started,
+            time.time(),
+            chunks,
+            kind=kind.value,
+            summary_id=record.id,
+        )
+        if self.broker is not None:
+            self.broker.publish_record("summary", record)
         return record
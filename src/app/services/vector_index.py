@@ -0,0 +1,520 @@
+"""Local on-disk vector index for screen capture embeddings.
+
+Vectors are L2-normalised on insert and appended to a float32 matrix that is
+memory-mapped for search, so cosine similarity becomes a dot product. Search is
+exact by default; after :meth:`VectorIndex.train` an IVF-PQ mode is available in
+which candidates are selected from the ``nprobe`` closest inverted lists, scored
+with product-quantisation lookup tables and re-ranked exactly. Only the rows of
+the probed lists are read: rows are kept grouped by list, and rows appended
+since the last grouping are tracked per list in memory until the next one. With a
+``train_threshold``, training starts in a background thread once the index
+holds that many vectors.
+
+The row count is kept in memory, so every writer and reader of a directory
+must share one instance: use :meth:`VectorIndex.shared`.
+
+Directory layout::
+
+    meta.json         dimension, meeting id table and IVF/PQ parameters
+    vectors.f32       N x dim normalised vectors
+    capture_ids.i64   ScreenCapture.id per row
+    meetings.i32      index into ``meta.json["meetings"]`` per row
+    lists.i32         IVF list per row (trained indexes only)
+    codes.u8          N x m PQ codes (trained indexes only)
+    list_rows.i64     row ids grouped by IVF list, for the first ``meta.json["grouped"]`` rows
+    list_offsets.i64  nlist + 1 offsets of each list's rows in ``list_rows.i64``
+    ivf.npz           IVF centroids and PQ codebooks (trained indexes only)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from app.core import errors
+
+logger = logging.getLogger(__name__)
+
+FloatArray = npt.NDArray[np.float32]
+
+_PQ_CENTROIDS = 256
+_ASSIGN_BATCH = 65536
+# Rows appended since the last grouping by list before they are grouped again,
+# as an absolute minimum and as a fraction of the grouped rows.
+_UNGROUPED_MIN = 4096
+_UNGROUPED_FRACTION = 0.125
+
+
+class VectorIndexError(errors.AppError):
+    """Raised for invalid vector index operations."""
+
+
+@dataclass
+class VectorHit:
+    capture_id: int
+    score: float
+
+
+def _normalize(vectors: FloatArray) -> FloatArray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32, copy=False)
+
+
+def _kmeans(
+    data: FloatArray, k: int, iterations: int, rng: np.random.Generator, spherical: bool
+) -> FloatArray:
+    centroids = data[rng.choice(len(data), size=k, replace=len(data) < k)].copy()
+    for _ in range(iterations):
+        assignment = _assign(data, centroids, spherical)
+        order = np.argsort(assignment, kind="stable")
+        counts = np.bincount(assignment, minlength=k)
+        sums = np.zeros_like(centroids)
+        present = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts[present])[:-1]))
+        sums[present] = np.add.reduceat(data[order], starts, axis=0)
+        empty = counts == 0
+        # Re-seed empty clusters from random points so every list stays usable.
+        sums[empty] = data[rng.choice(len(data), size=int(empty.sum()))]
+        counts[empty] = 1
+        centroids = sums / counts[:, None]
+        if spherical:
+            centroids = _normalize(centroids)
+    return centroids.astype(np.float32, copy=False)
+
+
+def _assign(data: FloatArray, centroids: FloatArray, spherical: bool) -> npt.NDArray[np.int32]:
+    out = np.empty(len(data), dtype=np.int32)
+    centroid_norms = (centroids**2).sum(axis=1)
+    for start in range(0, len(data), _ASSIGN_BATCH):
+        batch = data[start : start + _ASSIGN_BATCH]
+        dots = batch @ centroids.T
+        if spherical:
+            out[start : start + len(batch)] = dots.argmax(axis=1)
+        else:
+            out[start : start + len(batch)] = (centroid_norms - 2 * dots).argmin(axis=1)
+    return out
+
+
+def _auto_train_params(count: int, dim: int) -> tuple[int, int]:
+    """``(nlist, m)`` for automatic training: about 4 * sqrt(N) lists, m dividing dim."""
+    nlist = min(1024, max(1, int(4 * math.sqrt(count))))
+    m = next(m for m in (16, 8, 4, 2, 1) if dim % m == 0)
+    return nlist, m
+
+
+class VectorIndex:
+    """Append-only cosine-similarity index stored under ``path``."""
+
+    _instances: dict[Path, VectorIndex] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: Path, train_threshold: Optional[int] = None) -> None:
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.train_threshold = train_threshold
+        self._lock = threading.Lock()
+        self._training: Optional[threading.Thread] = None
+        self._meta: dict = {"dim": None, "meetings": [], "nlist": None, "m": None}
+        self._meeting_index: dict[str, int] = {}
+        self._centroids: Optional[FloatArray] = None
+        self._codebooks: Optional[FloatArray] = None
+        self._cache: dict[str, np.ndarray] = {}
+        self._count = 0
+        # Row ids grouped by IVF list, and the rows appended since, per list.
+        self._list_rows: np.ndarray = np.empty(0, np.int64)
+        self._list_offsets: Optional[np.ndarray] = None
+        self._ungrouped: dict[int, list[int]] = {}
+        self._ungrouped_count = 0
+        self._load()
+
+    @classmethod
+    def shared(cls, path: Path, train_threshold: Optional[int] = None) -> VectorIndex:
+        """The process-wide instance for ``path``, created on first use."""
+        key = path.resolve()
+        with cls._instances_lock:
+            index = cls._instances.get(key)
+            if index is None:
+                index = cls._instances[key] = cls(path, train_threshold)
+            elif train_threshold is not None:
+                index.train_threshold = train_threshold
+            return index
+
+    # Persistence ---------------------------------------------------------
+
+    def _file(self, name: str) -> Path:
+        return self.path / name
+
+    def _load(self) -> None:
+        meta_path = self._file("meta.json")
+        if meta_path.exists():
+            self._meta = json.loads(meta_path.read_text())
+        self._meeting_index = {m: i for i, m in enumerate(self._meta["meetings"])}
+        if self._file("ivf.npz").exists():
+            with np.load(self._file("ivf.npz")) as ivf:
+                self._centroids = ivf["centroids"]
+                self._codebooks = ivf["codebooks"]
+        self._count = self._consistent_count()
+        if self.trained:
+            self._load_list_rows()
+
+    def _consistent_count(self) -> int:
+        """Rows fully present in every per-row file (a crash may leave a torn append)."""
+        dim = self._meta["dim"]
+        if not dim:
+            return 0
+        counts = [
+            self._rows_in("vectors.f32", 4 * dim),
+            self._rows_in("capture_ids.i64", 8),
+            self._rows_in("meetings.i32", 4),
+        ]
+        if self.trained:
+            counts += [self._rows_in("lists.i32", 4), self._rows_in("codes.u8", self._meta["m"])]
+        return min(counts)
+
+    def _load_list_rows(self) -> None:
+        grouped = self._meta.get("grouped", 0)
+        offsets_path = self._file("list_offsets.i64")
+        if 0 < grouped <= self._count and offsets_path.exists():
+            self._list_offsets = np.fromfile(offsets_path, dtype=np.int64)
+            self._list_rows = np.memmap(
+                self._file("list_rows.i64"), dtype=np.int64, mode="r", shape=(grouped,)
+            )
+        else:
+            grouped = 0
+        lists = self._array("lists.i32", np.int32)
+        self._track_ungrouped(np.arange(grouped, self._count), np.asarray(lists[grouped:]))
+        self._maybe_group_lists()
+
+    def _track_ungrouped(self, rows: np.ndarray, lists: np.ndarray) -> None:
+        for row, list_id in zip(rows.tolist(), lists.tolist()):
+            self._ungrouped.setdefault(list_id, []).append(row)
+        self._ungrouped_count += len(rows)
+
+    def _maybe_group_lists(self) -> None:
+        """Group every row by list once enough rows were appended since the last time."""
+        grouped = len(self._list_rows)
+        if self._ungrouped_count > max(_UNGROUPED_MIN, grouped * _UNGROUPED_FRACTION) or (
+            self._ungrouped_count and self._list_offsets is None
+        ):
+            self._group_lists()
+
+    def _group_lists(self) -> None:
+        lists = np.asarray(self._array("lists.i32", np.int32))
+        order = np.argsort(lists, kind="stable").astype(np.int64)
+        counts = np.bincount(lists, minlength=self._meta["nlist"])
+        offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        for name, array in (("list_rows.i64", order), ("list_offsets.i64", offsets)):
+            tmp = self._file(name + ".tmp")
+            array.tofile(tmp)
+            tmp.replace(self._file(name))
+        self._meta["grouped"] = len(order)
+        self._save_meta()
+        self._list_rows, self._list_offsets = order, offsets
+        self._ungrouped, self._ungrouped_count = {}, 0
+
+    def _rows_in(self, name: str, row_bytes: int) -> int:
+        file = self._file(name)
+        return file.stat().st_size // row_bytes if file.exists() else 0
+
+    def _save_meta(self) -> None:
+        tmp = self._file("meta.json.tmp")
+        tmp.write_text(json.dumps(self._meta))
+        tmp.replace(self._file("meta.json"))
+
+    def _array(self, name: str, dtype: npt.DTypeLike, width: int = 1) -> np.ndarray:
+        """Memory-map the first ``self._count`` rows of a per-row file."""
+        cached = self._cache.get(name)
+        if cached is not None and len(cached) == self._count:
+            return cached
+        shape = (self._count, width) if width > 1 else (self._count,)
+        if self._count == 0:
+            array = np.empty(shape, dtype=dtype)
+        else:
+            array = np.memmap(self._file(name), dtype=dtype, mode="r", shape=shape)
+        self._cache[name] = array
+        return array
+
+    # Properties ----------------------------------------------------------
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self._meta["dim"]
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    def __len__(self) -> int:
+        return self._count
+
+    # Writes --------------------------------------------------------------
+
+    def _coerce(self, embeddings: bytes | npt.ArrayLike) -> FloatArray:
+        if isinstance(embeddings, (bytes, bytearray, memoryview)):
+            vectors = np.frombuffer(embeddings, dtype="<f4")
+        else:
+            vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim == 1:
+            if self.dim is None or len(vectors) % self.dim:
+                vectors = vectors.reshape(1, -1)
+            else:
+                vectors = vectors.reshape(-1, self.dim)
+        if self.dim is not None and vectors.shape[1] != self.dim:
+            raise VectorIndexError(
+                f"Embedding dimension {vectors.shape[1]} does not match index dimension {self.dim}"
+            )
+        return _normalize(vectors)
+
+    def add(self, capture_id: int, meeting_id: str, embedding: bytes | npt.ArrayLike) -> None:
+        """Append one embedding (raw little-endian float32 bytes or an array)."""
+        self.add_many([capture_id], [meeting_id], self._coerce(embedding).reshape(1, -1))
+
+    def add_many(
+        self, capture_ids: list[int], meeting_ids: list[str], embeddings: npt.ArrayLike
+    ) -> None:
+        """Append a batch of embeddings, one row per capture."""
+        vectors = self._coerce(embeddings)
+        if not (len(vectors) == len(capture_ids) == len(meeting_ids)):
+            raise VectorIndexError("capture_ids, meeting_ids and embeddings differ in length")
+
+        with self._lock:
+            meta_dirty = False
+            if self._meta["dim"] is None:
+                self._meta["dim"] = int(vectors.shape[1])
+                meta_dirty = True
+            meeting_rows = []
+            for meeting_id in meeting_ids:
+                if meeting_id not in self._meeting_index:
+                    self._meeting_index[meeting_id] = len(self._meta["meetings"])
+                    self._meta["meetings"].append(meeting_id)
+                    meta_dirty = True
+                meeting_rows.append(self._meeting_index[meeting_id])
+            if meta_dirty:
+                self._save_meta()
+
+            self._append("vectors.f32", vectors)
+            self._append("capture_ids.i64", np.asarray(capture_ids, dtype=np.int64))
+            self._append("meetings.i32", np.asarray(meeting_rows, dtype=np.int32))
+            if self.trained:
+                lists, codes = self._encode(vectors)
+                self._append("lists.i32", lists)
+                self._append("codes.u8", codes)
+                self._track_ungrouped(np.arange(self._count, self._count + len(vectors)), lists)
+            self._count += len(vectors)
+            if self.trained:
+                self._maybe_group_lists()
+            if (
+                self.train_threshold is not None
+                and self._count >= self.train_threshold
+                and not self.trained
+                and self._training is None
+            ):
+                self._training = threading.Thread(
+                    target=self._auto_train, name="vector-index-train", daemon=True
+                )
+                self._training.start()
+
+    def _append(self, name: str, array: np.ndarray) -> None:
+        with self._file(name).open("ab") as fh:
+            fh.write(np.ascontiguousarray(array).tobytes())
+
+    # IVF / PQ ------------------------------------------------------------
+
+    def _auto_train(self) -> None:
+        try:
+            nlist, m = _auto_train_params(self._count, self._meta["dim"])
+            logger.info("Training vector index with %d vectors (nlist=%d)", self._count, nlist)
+            self.train(nlist=nlist, m=m)
+        except Exception:
+            logger.exception("Training the vector index failed; search stays exact")
+
+    def wait_trained(self, timeout: Optional[float] = None) -> bool:
+        """Wait for background training started by ``train_threshold``; True if trained."""
+        if self._training is not None:
+            self._training.join(timeout)
+        return self.trained
+
+    def train(
+        self,
+        nlist: int = 1024,
+        m: int = 16,
+        sample_size: int = 100_000,
+        iterations: int = 20,
+        seed: int = 0,
+    ) -> None:
+        """
+        Train IVF centroids and PQ codebooks and encode every stored row.
+
+        Args:
+            nlist: Number of inverted lists (coarse centroids).
+            m: Number of PQ sub-quantisers; must divide the dimension.
+            sample_size: Rows sampled for k-means training.
+            iterations: Lloyd iterations for both quantisers.
+            seed: Random seed for sampling and initialisation.
+        """
+        with self._lock:
+            dim = self.dim
+            if dim is None or self._count == 0:
+                raise VectorIndexError("Cannot train an empty vector index")
+            if dim % m:
+                raise VectorIndexError(f"PQ sub-quantisers ({m}) must divide dimension {dim}")
+            count = self._count
+            vectors = self._array("vectors.f32", np.float32, dim)
+
+        # The quantisers are fitted on a sample without holding the lock, so
+        # searches and appends continue meanwhile; rows appended since are
+        # encoded below with the others.
+        rng = np.random.default_rng(seed)
+        sample_rows = np.sort(rng.choice(count, min(sample_size, count), False))
+        sample = np.asarray(vectors[sample_rows])
+
+        centroids = _kmeans(sample, min(nlist, len(sample)), iterations, rng, spherical=True)
+        residuals = sample - centroids[_assign(sample, centroids, spherical=True)]
+        sub = dim // m
+        codebooks = np.stack(
+            [
+                _kmeans(
+                    np.ascontiguousarray(residuals[:, j * sub : (j + 1) * sub]),
+                    min(_PQ_CENTROIDS, len(sample)),
+                    iterations,
+                    rng,
+                    spherical=False,
+                )
+                for j in range(m)
+            ]
+        )
+
+        with self._lock:
+            vectors = self._array("vectors.f32", np.float32, dim)
+            self._centroids, self._codebooks = centroids, codebooks
+            self._meta.update(nlist=len(centroids), m=m)
+            for name in ("lists.i32", "codes.u8"):
+                self._file(name).unlink(missing_ok=True)
+                self._cache.pop(name, None)
+            for start in range(0, self._count, _ASSIGN_BATCH):
+                lists, codes = self._encode(np.asarray(vectors[start : start + _ASSIGN_BATCH]))
+                self._append("lists.i32", lists)
+                self._append("codes.u8", codes)
+            np.savez(self._file("ivf.npz"), centroids=centroids, codebooks=codebooks)
+            self._group_lists()
+
+    def _encode(self, vectors: FloatArray) -> tuple[np.ndarray, np.ndarray]:
+        assert self._centroids is not None and self._codebooks is not None
+        lists = _assign(vectors, self._centroids, spherical=True)
+        residuals = vectors - self._centroids[lists]
+        m, _, sub = self._codebooks.shape
+        codes = np.empty((len(vectors), m), dtype=np.uint8)
+        for j in range(m):
+            codes[:, j] = _assign(
+                np.ascontiguousarray(residuals[:, j * sub : (j + 1) * sub]),
+                self._codebooks[j],
+                spherical=False,
+            )
+        return lists, codes
+
+    # Search --------------------------------------------------------------
+
+    def search(
+        self,
+        query: bytes | npt.ArrayLike,
+        k: int = 10,
+        meeting_id: Optional[str] = None,
+        exact: Optional[bool] = None,
+        nprobe: int = 16,
+        refine_factor: int = 16,
+    ) -> list[VectorHit]:
+        """
+        Return the ``k`` most cosine-similar captures.
+
+        Args:
+            query: Query embedding.
+            k: Number of hits to return.
+            meeting_id: Only consider captures of this meeting.
+            exact: Force brute-force (True) or IVF-PQ (False) search. Defaults to
+                IVF-PQ when the index is trained.
+            nprobe: Inverted lists scanned in IVF-PQ mode.
+            refine_factor: IVF-PQ candidates re-ranked exactly, as a multiple of ``k``.
+
+        Returns:
+            list[VectorHit]: Hits ordered by descending similarity.
+        """
+        if self._count == 0:
+            return []
+        q = self._coerce(query)[0]
+
+        with self._lock:
+            count = self._count
+            vectors = self._array("vectors.f32", np.float32, self._meta["dim"])
+            capture_ids = self._array("capture_ids.i64", np.int64)
+            meetings = self._array("meetings.i32", np.int32)
+            use_ivf = self.trained if exact is None else not exact
+            if use_ivf and not self.trained:
+                raise VectorIndexError("Vector index must be trained before IVF-PQ search")
+            lists = self._array("lists.i32", np.int32) if use_ivf else None
+            codes = self._array("codes.u8", np.uint8, self._meta["m"]) if use_ivf else None
+            probed = self._probed_rows(q, nprobe) if use_ivf else None
+
+        meeting_row: Optional[int] = None
+        if meeting_id is not None:
+            meeting_row = self._meeting_index.get(meeting_id)
+            if meeting_row is None:
+                return []
+
+        rows: Optional[np.ndarray] = None
+        if use_ivf:
+            assert lists is not None and codes is not None and probed is not None
+            if meeting_row is not None:
+                probed = probed[meetings[probed] == meeting_row]
+            rows = self._ivf_candidates(q, lists, codes, probed, k * refine_factor)
+        elif meeting_row is not None:
+            rows = np.flatnonzero(meetings == meeting_row)
+
+        if rows is None:
+            scores = np.asarray(vectors @ q)
+            rows = np.arange(count)
+        else:
+            scores = np.asarray(vectors[rows] @ q) if len(rows) else np.empty(0, np.float32)
+
+        top = min(k, len(rows))
+        if top == 0:
+            return []
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best])]
+        return [
+            VectorHit(capture_id=int(capture_ids[rows[i]]), score=float(scores[i])) for i in best
+        ]
+
+    def _probed_rows(self, q: FloatArray, nprobe: int) -> np.ndarray:
+        """Rows of the ``nprobe`` lists closest to ``q``; call with the lock held."""
+        assert self._centroids is not None and self._list_offsets is not None
+        coarse = self._centroids @ q
+        probes = np.argpartition(-coarse, min(nprobe, len(coarse)) - 1)[:nprobe]
+        offsets = self._list_offsets
+        parts = [np.asarray(self._list_rows[offsets[p] : offsets[p + 1]]) for p in probes]
+        parts += [np.asarray(self._ungrouped[p], np.int64) for p in probes if p in self._ungrouped]
+        return np.sort(np.concatenate(parts)) if parts else np.empty(0, np.int64)
+
+    def _ivf_candidates(
+        self, q: FloatArray, lists: np.ndarray, codes: np.ndarray, rows: np.ndarray, candidates: int
+    ) -> np.ndarray:
+        assert self._centroids is not None and self._codebooks is not None
+        if len(rows) <= candidates:
+            return rows
+
+        coarse = self._centroids @ q
+        m, _, sub = self._codebooks.shape
+        # Inner product decomposes over the coarse centroid and each PQ subspace.
+        lut = np.einsum("jcs,js->jc", self._codebooks, q.reshape(m, sub))
+        row_codes = np.asarray(codes[rows])
+        approx = coarse[lists[rows]] + lut[np.arange(m), row_codes].sum(axis=1)
+        keep = np.argpartition(-approx, candidates - 1)[:candidates]
+        return np.sort(rows[keep])
@@ -1,12 +1,27 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import logging
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Protocol
+from statistics import median
+from typing import Optional, Protocol
 
+import anyio
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import metrics
+from app.db.write_buffer import WriteBuffer, persist
 from app.models import Meeting, ScreenCapture
+from app.services.batching import BatchStats, MicroBatcher
+from app.services.embedding_store import EmbeddingDType, EmbeddingStore, store_path
+from app.services.events import EventBroker
+from app.services.frame_dedup import DuplicateFramePolicy, FrameDeduplicator
+from app.services.image_store import ImageStore, StoredImage
+from app.services.model_pool import Priority, model_calls
+from app.services.vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
 
 
 class ScreenCaptureBackend(Protocol):
@@ -16,29 +31,241 @@ class ScreenCaptureBackend(Protocol):
 class VisionLanguageModel(Protocol):
     async def describe_image(self, image_path: Path) -> str: ...
 
-    async def embed_image(self, image_path: Path) -> bytes: ...
+    async def embed_image(self, image_path: Path) -> bytes:
+        """Return the image embedding as raw little-endian float32 values."""
+        ...
+
+
+class BatchVisionLanguageModel(Protocol):
+    async def describe_images(self, image_paths: list[Path]) -> list[str]: ...
+
+    async def embed_images(self, image_paths: list[Path]) -> list[bytes]: ...
+
+
+class BatchingVisionLanguageModel:
+    """
+    :class:`VisionLanguageModel` adapter that micro-batches calls to a batch backend.
+
+    Share one instance between the ``VisionService`` of every active meeting so
+    that captures taken at about the same time go to the VLM in one call.
+    """
+
+    def __init__(
+        self, backend: BatchVisionLanguageModel, max_batch: int = 8, max_wait: float = 0.05
+    ) -> None:
+        self.backend = backend
+        self._describe = MicroBatcher(
+            backend.describe_images, max_batch, max_wait, name="describe_image"
+        )
+        self._embed = MicroBatcher(backend.embed_images, max_batch, max_wait, name="embed_image")
+
+    async def describe_image(self, image_path: Path) -> str:
+        return await self._describe.submit(image_path)
+
+    async def embed_image(self, image_path: Path) -> bytes:
+        return await self._embed.submit(image_path)
+
+    def batch_stats(self) -> dict[str, BatchStats]:
+        return {"describe_image": self._describe.stats, "embed_image": self._embed.stats}
+
+
+@dataclass
+class CaptureTimings:
+    """Per-stage wall time of one ``capture_screen`` call, in seconds."""
+
+    capture: float = 0.0
+    dedup: float = 0.0
+    describe: float = 0.0
+    embed: float = 0.0
+    ingest: float = 0.0
+    analysis: float = 0.0  # describe, embed and ingest run concurrently
+    write: float = 0.0
+    persist: float = 0.0
+    index: float = 0.0
+    total: float = 0.0
+    duplicate: bool = False
 
 
 @dataclass
 class VisionService:
     capture_backend: ScreenCaptureBackend
     vlm: VisionLanguageModel
+    vector_index: Optional[VectorIndex] = None
+    write_buffer: Optional[WriteBuffer] = None
+    broker: Optional[EventBroker] = None
+    deduplicator: Optional[FrameDeduplicator] = None
+    # Transcode captures into a shared content-addressed store with thumbnails;
+    # ``None`` keeps the backend's file in the meeting's screen directory.
+    image_store: Optional[ImageStore] = None
+    # Append embeddings to one store per screen directory; ``None`` writes a
+    # ``.emb`` file per capture as older versions did.
+    embedding_dtype: Optional[EmbeddingDType] = EmbeddingDType.FLOAT16
+    timings: deque[CaptureTimings] = field(default_factory=lambda: deque(maxlen=256))
+    _stores: dict[Path, EmbeddingStore] = field(default_factory=dict, init=False, repr=False)
+
+    def latency_breakdown(self) -> dict[str, float]:
+        """Median per-stage latency, in seconds, over recent analysed captures."""
+        recent = [t for t in self.timings if not t.duplicate]
+        if not recent:
+            return {}
+        stages = (
+            "capture",
+            "dedup",
+            "describe",
+            "embed",
+            "ingest",
+            "analysis",
+            "write",
+            "persist",
+            "index",
+        )
+        return {stage: median(getattr(t, stage) for t in recent) for stage in stages + ("total",)}
 
     async def capture_screen(
         self, meeting: Meeting, output_dir: Path, session: AsyncSession
     ) -> ScreenCapture:
+        timings = CaptureTimings()
+        started = mark = anyio.current_time()
+
+        def lap() -> float:
+            nonlocal mark
+            now = anyio.current_time()
+            elapsed, mark = now - mark, now
+            return elapsed
+
         image_path = await self.capture_backend.capture(meeting, output_dir)
-        description = await self.vlm.describe_image(image_path)
-        embeddings_path = output_dir / f"{Path(image_path).stem}.emb"
-        embeddings = await self.vlm.embed_image(image_path)
-        embeddings_path.write_bytes(embeddings)
+        timings.capture = lap()
+
+        frame_hash: Optional[str] = None
+        if self.deduplicator is not None:
+            frame_hash = await self.deduplicator.hash_frame(image_path)
+            original = await self.deduplicator.find_duplicate(meeting, frame_hash, session)
+            timings.dedup = lap()
+            if original is not None:
+                capture = await self._reuse_capture(
+                    meeting, image_path, frame_hash, original, session
+                )
+                timings.persist, timings.duplicate = lap(), True
+                self._record(timings, started)
+                return capture
+            # End the lookup's read so that ``session`` doesn't hold its
+            # (writer) connection through the model calls below.
+            await session.commit()
+
+        description = ""
+        embeddings = b""
+
+        async def describe() -> None:
+            nonlocal description
+            begin = anyio.current_time()
+            description = await self.vlm.describe_image(image_path)
+            timings.describe = anyio.current_time() - begin
+            metrics.MODEL_LATENCY.labels("describe_image").observe(timings.describe)
+
+        async def embed() -> None:
+            nonlocal embeddings
+            begin = anyio.current_time()
+            embeddings = await self.vlm.embed_image(image_path)
+            timings.embed = anyio.current_time() - begin
+            metrics.MODEL_LATENCY.labels("embed_image").observe(timings.embed)
+
+        stored: Optional[StoredImage] = None
+
+        async def ingest() -> None:
+            nonlocal stored
+            assert self.image_store is not None
+            begin = anyio.current_time()
+            stored = await anyio.to_thread.run_sync(self.image_store.ingest, Path(image_path))
+            timings.ingest = anyio.current_time() - begin
+
+        with model_calls(meeting.id, Priority.LIVE):
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(describe)
+                tg.start_soon(embed)
+                if self.image_store is not None:
+                    tg.start_soon(ingest)
+        timings.analysis = lap()
+        if stored is not None:
+            # The VLM has finished with the backend's file; the store keeps the pixels.
+            await anyio.Path(image_path).unlink(missing_ok=True)
+
+        if self.embedding_dtype is None:
+            embeddings_path = output_dir / f"{Path(image_path).stem}.emb"
+            await anyio.Path(embeddings_path).write_bytes(embeddings)
+            timings.write = lap()
+        else:
+            embeddings_path = store_path(output_dir)
 
         capture = ScreenCapture(
             meeting_id=meeting.id,
-            image_path=str(image_path),
+            image_path=str(stored.path if stored else image_path),
+            thumbnail_path=str(stored.thumbnail_path) if stored else None,
+            image_digest=stored.digest if stored else None,
             description=description,
             embeddings_path=str(embeddings_path),
+            frame_hash=frame_hash,
+        )
+        capture = await persist(capture, session, self.write_buffer)
+        timings.persist = lap()
+
+        if self.embedding_dtype is not None:
+            # Rows are keyed by capture id, so the append follows the insert.
+            store = self._store(embeddings_path)
+            await anyio.to_thread.run_sync(store.append, capture.id, embeddings)
+            timings.write = lap()
+
+        if self.vector_index is not None:
+            await anyio.to_thread.run_sync(
+                self.vector_index.add, capture.id, meeting.id, embeddings
+            )
+            timings.index = lap()
+        if self.deduplicator is not None:
+            self.deduplicator.remember(capture)
+        self._publish(capture)
+        self._record(timings, started)
+        return capture
+
+    def _store(self, path: Path) -> EmbeddingStore:
+        store = self._stores.get(path)
+        if store is None:
+            assert self.embedding_dtype is not None
+            store = self._stores[path] = EmbeddingStore(path, self.embedding_dtype)
+        return store
+
+    def _publish(self, capture: ScreenCapture) -> None:
+        if self.broker is not None:
+            self.broker.publish_record("capture", capture)
+
+    def _record(self, timings: CaptureTimings, started: float) -> None:
+        timings.total = anyio.current_time() - started
+        self.timings.append(timings)
+        metrics.SCREEN_FRAMES.labels("duplicate" if timings.duplicate else "analysed").inc()
+        logger.debug("Screen capture timings: %s", timings)
+
+    async def _reuse_capture(
+        self,
+        meeting: Meeting,
+        image_path: Path,
+        frame_hash: str,
+        original: ScreenCapture,
+        session: AsyncSession,
+    ) -> ScreenCapture:
+        """Handle an unchanged frame without running the VLM on it."""
+        assert self.deduplicator is not None
+        await anyio.Path(image_path).unlink(missing_ok=True)
+        if self.deduplicator.policy is DuplicateFramePolicy.SKIP:
+            return original
+
+        capture = ScreenCapture(
+            meeting_id=meeting.id,
+            image_path=original.image_path,
+            thumbnail_path=original.thumbnail_path,
+            image_digest=original.image_digest,
+            description=original.description,
+            embeddings_path=original.embeddings_path,
+            frame_hash=frame_hash,
+            duplicate_of_id=original.id,
         )
-        session.add(capture)
-        await session.commit()
+        capture = await persist(capture, session, self.write_buffer)
+        self._publish(capture)
         return capture
@@ -0,0 +1 @@
+"""Benchmarks for Callyfy hot paths. Run modules with ``python -m benchmarks.<name>``."""
@@ -0,0 +1,246 @@
+"""Deterministic stand-ins for the capture and model backends.
+
+Every fake injects a configurable (seeded, jittered) latency with
+``anyio.sleep``, like a call to an out-of-process model server, and produces
+output of a configurable size that depends only on its inputs and seed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import struct
+import wave
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AsyncIterator
+
+import anyio
+import numpy as np
+from PIL import Image
+
+from app.models import Meeting, TranscriptSegment
+from app.services.summarization import SummaryKind
+
+MEETING_START = datetime(2025, 1, 1, 9, 0, 0)
+
+_VOCABULARY = (
+    "roadmap budget release latency customer migration review deadline design metric "
+    "incident rollout backlog priority launch feedback hiring contract security index "
+    "pipeline dashboard estimate dependency milestone retro onboarding pricing outage "
+    "schema capacity forecast sprint vendor audit compliance storage search transcript"
+).split()
+
+
+@dataclass
+class Latency:
+    """Per-call delay: ``mean`` seconds, uniformly jittered by up to ``jitter`` seconds."""
+
+    mean: float = 0.0
+    jitter: float = 0.0
+    seed: int = 0
+    _rng: np.random.Generator = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._rng = np.random.default_rng(self.seed)
+
+    async def wait(self) -> None:
+        delay = self.mean + (self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        await anyio.sleep(max(delay, 0.0))
+
+
+def _words(seed: int, count: int) -> str:
+    rng = np.random.default_rng(seed)
+    return " ".join(_VOCABULARY[i] for i in rng.integers(0, len(_VOCABULARY), count))
+
+
+def _seed_of(*parts: object) -> int:
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class FakeAudioCapture:
+    """Emits ``chunks`` audio chunks, each prefixed with its index for the fake ASR."""
+
+    def __init__(
+        self,
+        chunks: int,
+        chunk_bytes: int = 16_000 * 2 * 5,
+        raw_seconds: float = 120.0,
+        sample_rate: int = 16_000,
+    ) -> None:
+        self.chunks = chunks
+        self.chunk_bytes = chunk_bytes
+        self.raw_seconds = raw_seconds
+        self.sample_rate = sample_rate
+        self._payload = bytes(max(chunk_bytes - 8, 0))
+
+    async def start_stream(self, meeting: Meeting) -> None:
+        pass
+
+    async def stop_stream(self, meeting: Meeting) -> None:
+        pass
+
+    async def iter_chunks(self, meeting: Meeting) -> AsyncIterator[bytes]:
+        for index in range(self.chunks):
+            yield struct.pack("<Q", index) + self._payload
+            await anyio.sleep(0)
+
+    async def record_raw_audio(self, meeting: Meeting, destination: Path) -> None:
+        await anyio.to_thread.run_sync(self._write_wav, destination)
+
+    def _write_wav(self, destination: Path) -> None:
+        """Speech-like bursts of tone separated by silences."""
+        rate = self.sample_rate
+        t = np.arange(int(self.raw_seconds * rate)) / rate
+        voiced = (np.sin(2 * np.pi * t / 7.0) > -0.3).astype(np.float32)
+        signal = np.sin(2 * np.pi * 180 * t) * 6000 * voiced
+        noise = np.random.default_rng(0).normal(0, 60, len(t))
+        with wave.open(str(destination), "wb") as out:
+            out.setnchannels(1)
+            out.setsampwidth(2)
+            out.setframerate(rate)
+            out.writeframes((signal + noise).astype("<i2").tobytes())
+
+
+class FakeASR:
+    """Returns ``words_per_chunk`` deterministic words per chunk, timestamped by chunk index."""
+
+    def __init__(
+        self, latency: Latency, words_per_chunk: int = 14, chunk_seconds: float = 5.0
+    ) -> None:
+        self.latency = latency
+        self.words_per_chunk = words_per_chunk
+        self.chunk_seconds = chunk_seconds
+
+    def _segment(self, index: int, offset: timedelta = timedelta()) -> TranscriptSegment:
+        started = MEETING_START + offset + timedelta(seconds=index * self.chunk_seconds)
+        return TranscriptSegment(
+            started_at=started,
+            ended_at=started + timedelta(seconds=self.chunk_seconds),
+            text=_words(index, self.words_per_chunk),
+            confidence=0.9,
+        )
+
+    async def transcribe_chunk(self, audio: bytes) -> TranscriptSegment:
+        await self.latency.wait()
+        (index,) = struct.unpack_from("<Q", audio)
+        return self._segment(index)
+
+    async def transcribe_chunks(self, chunks: list[bytes]) -> list[TranscriptSegment]:
+        await self.latency.wait()
+        return [self._segment(struct.unpack_from("<Q", audio)[0]) for audio in chunks]
+
+    async def transcribe_file(self, audio_path: Path) -> list[TranscriptSegment]:
+        with wave.open(str(audio_path), "rb") as reader:
+            seconds = reader.getnframes() / reader.getframerate()
+        await self.latency.wait()
+        return [self._segment(i) for i in range(max(int(seconds // self.chunk_seconds), 1))]
+
+
+class FakeScreenCapture:
+    """Renders synthetic slides; each slide stays on screen for ``frames_per_slide`` captures."""
+
+    def __init__(
+        self, latency: Latency, size: tuple[int, int] = (1280, 720), frames_per_slide: int = 6
+    ) -> None:
+        self.latency = latency
+        self.size = size
+        self.frames_per_slide = frames_per_slide
+        self._frames: dict[str, int] = {}
+
+    async def capture(self, meeting: Meeting, destination: Path) -> Path:
+        frame = self._frames.get(meeting.id, 0)
+        self._frames[meeting.id] = frame + 1
+        slide = frame // self.frames_per_slide
+        path = destination / f"{frame:06d}.png"
+        await self.latency.wait()
+        await anyio.to_thread.run_sync(self._render, _seed_of(meeting.id, slide), path)
+        return path
+
+    def _render(self, seed: int, path: Path) -> None:
+        width, height = self.size
+        rng = np.random.default_rng(seed)
+        blocks = rng.integers(0, 256, (height // 40 + 1, width // 40 + 1, 3), dtype=np.uint8)
+        pixels = np.kron(blocks, np.ones((40, 40, 1), dtype=np.uint8))[:height, :width]
+        Image.fromarray(pixels).save(path, compress_level=1)
+
+
+class FakeVLM:
+    """Describes and embeds images deterministically from their file contents."""
+
+    def __init__(self, latency: Latency, dim: int = 512, description_words: int = 40) -> None:
+        self.latency = latency
+        self.dim = dim
+        self.description_words = description_words
+
+    async def _seed(self, image_path: Path) -> int:
+        data = await anyio.Path(image_path).read_bytes()
+        return _seed_of(hashlib.blake2b(data, digest_size=8).hexdigest())
+
+    async def describe_image(self, image_path: Path) -> str:
+        seed = await self._seed(image_path)
+        await self.latency.wait()
+        return _words(seed, self.description_words)
+
+    async def embed_image(self, image_path: Path) -> bytes:
+        seed = await self._seed(image_path)
+        await self.latency.wait()
+        return np.random.default_rng(seed).standard_normal(self.dim).astype("<f4").tobytes()
+
+    async def describe_images(self, image_paths: list[Path]) -> list[str]:
+        await self.latency.wait()
+        return [_words(await self._seed(p), self.description_words) for p in image_paths]
+
+    async def embed_images(self, image_paths: list[Path]) -> list[bytes]:
+        await self.latency.wait()
+        return [
+            np.random.default_rng(await self._seed(p))
+            .standard_normal(self.dim)
+            .astype("<f4")
+            .tobytes()
+            for p in image_paths
+        ]
+
+
+class FakeSummarizer:
+    """Plain and hierarchical summarization backend producing ``output_words`` words."""
+
+    def __init__(self, latency: Latency, output_words: int = 120) -> None:
+        self.latency = latency
+        self.output_words = output_words
+        self.input_chars: list[int] = []
+
+    async def _respond(self, *seed_parts: object, input_chars: int = 0) -> str:
+        self.input_chars.append(input_chars)
+        await self.latency.wait()
+        return _words(_seed_of(*seed_parts), self.output_words)
+
+    async def summarize(self, meeting: Meeting, kind: SummaryKind) -> str:
+        return await self._respond(meeting.id, kind.value)
+
+    async def summarize_batch(self, requests: list[tuple[Meeting, SummaryKind]]) -> list[str]:
+        self.input_chars.append(0)
+        await self.latency.wait()
+        return [
+            _words(_seed_of(meeting.id, kind.value), self.output_words)
+            for meeting, kind in requests
+        ]
+
+    async def condense(self, parts: list[str]) -> str:
+        return await self._respond(*parts, input_chars=sum(map(len, parts)))
+
+    async def summarize_text(self, parts: list[str], kind: SummaryKind) -> str:
+        return await self._respond(kind.value, *parts, input_chars=sum(map(len, parts)))
+
+    async def condense_batch(self, requests: list[list[str]]) -> list[str]:
+        self.input_chars.append(sum(len(part) for parts in requests for part in parts))
+        await self.latency.wait()
+        return [_words(_seed_of(*parts), self.output_words) for parts in requests]
+
+    async def summarize_text_batch(
+        self, requests: list[tuple[list[str], SummaryKind]]
+    ) -> list[str]:
+        self.input_chars.append(sum(len(part) for parts, _ in requests for part in parts))
+        await self.latency.wait()
+        return [_words(_seed_of(kind.value, *parts), self.output_words) for parts, kind in requests]
@@ -0,0 +1,435 @@
+"""End-to-end load test: concurrent meetings through the services and the HTTP API.
+
+Each simulated meeting is created and started through the API, streams
+``--hours`` of audio chunks through :class:`StreamingASRPipeline`, captures
+the screen every ``--capture-interval`` seconds through :class:`VisionService`,
+refreshes a summary every ``--summary-interval`` seconds while clients poll the
+meeting routes, and finally records and compresses the full audio. Afterwards
+the transcripts and captures are searched and every meeting is exported.
+
+The capture and model backends are the deterministic fakes from
+:mod:`benchmarks.fakes`, so runs are repeatable and time is compressed: only the
+configured model latencies are waited for. With ``--max-batch`` above 1, the
+meetings share dynamic batchers in front of the ASR, VLM and LLM fakes, which
+take one latency per batch, and the achieved mean batch sizes are reported. With
+``--model-pool``, the fakes run in shared model pool workers, one process per
+model serving one call at a time, as real models would.
+
+Usage::
+
+    python -m benchmarks.meetings --meetings 4 --hours 2
+    python -m benchmarks.meetings --meetings 8 --save-baseline baseline.json
+    python -m benchmarks.meetings --meetings 8 --compare baseline.json --tolerance 0.2
+
+With ``--compare``, the exit status is 1 if any metric is worse than the
+baseline by more than ``--tolerance`` (a fraction).
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+import anyio
+import httpx
+import numpy as np
+
+from app.main import create_app
+from app.models import Meeting
+from app.services import (
+    AudioService,
+    BatchingASRBackend,
+    BatchingSummarizationBackend,
+    BatchingVisionLanguageModel,
+    IncrementalSummarizer,
+    ModelSpec,
+    SearchService,
+    SummarizationService,
+    VisionService,
+)
+from app.services.audio_pipeline import StreamingASRPipeline
+from app.services.frame_dedup import FrameDeduplicator
+from app.services.image_store import ImageStore
+from app.services.summarization import SummaryKind
+from benchmarks.fakes import (
+    FakeASR,
+    FakeAudioCapture,
+    FakeScreenCapture,
+    FakeSummarizer,
+    FakeVLM,
+    Latency,
+)
+
+SEARCH_QUERIES = ("roadmap", "budget review", "customer migration", "security audit", "launch")
+
+
+class Recorder:
+    """Wall-clock latencies per operation, in seconds."""
+
+    def __init__(self) -> None:
+        self.samples: defaultdict[str, list[float]] = defaultdict(list)
+
+    @contextmanager
+    def time(self, operation: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples[operation].append(time.perf_counter() - start)
+
+    def percentiles(self) -> dict[str, float]:
+        metrics = {}
+        for operation, samples in sorted(self.samples.items()):
+            metrics[f"{operation}.p50_ms"] = float(np.percentile(samples, 50)) * 1000
+            metrics[f"{operation}.p99_ms"] = float(np.percentile(samples, 99)) * 1000
+        return metrics
+
+
+def memory_mb() -> tuple[float, float]:
+    """Current and peak resident set size of this process, in MiB."""
+    try:
+        fields = dict(
+            line.split(":", 1) for line in Path("/proc/self/status").read_text().splitlines()
+        )
+        return int(fields["VmRSS"].split()[0]) / 1024, int(fields["VmHWM"].split()[0]) / 1024
+    except (OSError, KeyError, ValueError):
+        # ru_maxrss is KiB on Linux and bytes on macOS; only the peak is available.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak_mb = peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+        return peak_mb, peak_mb
+
+
+def db_size_mb(path: Path) -> float:
+    files = (path, path.with_name(path.name + "-wal"))
+    return sum(f.stat().st_size for f in files if f.exists()) / (1024 * 1024)
+
+
+class Simulation:
+    def __init__(self, args: argparse.Namespace, app, data_dir: Path) -> None:
+        self.args = args
+        self.app = app
+        self.data_dir = data_dir
+        self.recorder = Recorder()
+        self.peak_rss = 0.0
+        state = app.state
+
+        chunks = int(args.hours * 3600 / args.chunk_seconds)
+        self.captures = int(args.hours * 3600 / args.capture_interval)
+        self.summary_every = max(int(args.summary_interval / args.chunk_seconds), 1)
+        factories = model_factories(args)
+        if args.model_pool:
+            asr, vlm, summarizer = (state.model_pool.client(name) for name in factories)
+        else:
+            asr, vlm, summarizer = (factory() for factory in factories.values())
+        self.batchers: list[
+            BatchingASRBackend | BatchingVisionLanguageModel | BatchingSummarizationBackend
+        ] = []
+        if args.max_batch > 1:
+            wait = args.batch_wait_ms / 1000
+            asr = BatchingASRBackend(asr, args.max_batch, wait)
+            vlm = BatchingVisionLanguageModel(vlm, args.max_batch, wait)
+            summarizer = BatchingSummarizationBackend(summarizer, args.max_batch, wait)
+            self.batchers = [asr, vlm, summarizer]
+        self.audio = AudioService(
+            capture_backend=FakeAudioCapture(chunks, raw_seconds=args.raw_audio_seconds),
+            asr_backend=asr,
+            write_buffer=state.write_buffer,
+            broker=state.event_broker,
+        )
+        self.search = SearchService(
+            vector_index_path=state.vector_index.path,
+            vector_train_threshold=state.vector_index.train_threshold,
+        )
+        self.vision = VisionService(
+            capture_backend=FakeScreenCapture(
+                Latency(seed=2),
+                size=(args.image_width, args.image_height),
+                frames_per_slide=args.frames_per_slide,
+            ),
+            vlm=vlm,
+            vector_index=self.search.vector_index,
+            write_buffer=state.write_buffer,
+            broker=state.event_broker,
+            deduplicator=FrameDeduplicator(),
+            image_store=ImageStore(data_dir / "images"),
+        )
+        self.summarization = SummarizationService(
+            backend=summarizer,
+            write_buffer=state.write_buffer,
+            broker=state.event_broker,
+            incremental=IncrementalSummarizer(backend=summarizer),
+        )
+        self.pipelines: list[StreamingASRPipeline] = []
+
+    def sample_memory(self) -> None:
+        self.peak_rss = max(self.peak_rss, memory_mb()[0])
+
+    async def run_meeting(self, client: httpx.AsyncClient, index: int) -> None:
+        rec = self.recorder
+        with rec.time("api.create_meeting"):
+            response = await client.post("/meetings/", json={"title": f"Benchmark {index}"})
+        meeting_id = response.raise_for_status().json()["id"]
+        with rec.time("api.start_meeting"):
+            (await client.post(f"/meetings/{meeting_id}/start")).raise_for_status()
+        async with self.app.state.db_read_session_maker() as session:
+            meeting = await session.get(Meeting, meeting_id)
+        assert meeting is not None
+        meeting_dir = self.data_dir / "meetings" / meeting_id
+        screen_dir = meeting_dir / "screens"
+        screen_dir.mkdir(parents=True)
+
+        pipeline = StreamingASRPipeline(self.audio, queue_size=8, concurrency=self.args.asr_workers)
+        self.pipelines.append(pipeline)
+        capturing = anyio.Event()
+
+        async def audio() -> None:
+            with rec.time("audio.live_pipeline"):
+                async with self.app.state.db_session_maker() as session:
+                    await pipeline.run(meeting, session)
+
+        async def vision() -> None:
+            for _ in range(self.captures):
+                with rec.time("vision.capture_screen"):
+                    async with self.app.state.db_session_maker() as session:
+                        await self.vision.capture_screen(meeting, screen_dir, session)
+
+        async def summaries() -> None:
+            done = 0
+            while not capturing.is_set():
+                await anyio.sleep(0.01)
+                if pipeline.stats.chunks_transcribed >= (done + 1) * self.summary_every:
+                    done += 1
+                    await self._summarize(meeting, SummaryKind.RELEVANT)
+
+        async def readers() -> None:
+            etag: Optional[str] = None
+            while not capturing.is_set():
+                headers = {"If-None-Match": etag} if etag else {}
+                with rec.time("api.get_meeting"):
+                    response = await client.get(f"/meetings/{meeting_id}", headers=headers)
+                etag = response.headers.get("ETag", etag)
+                with rec.time("api.list_meetings"):
+                    (await client.get("/meetings/", params={"limit": 20})).raise_for_status()
+                self.sample_memory()
+                await anyio.sleep(self.args.poll_interval)
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(summaries)
+            tg.start_soon(readers)
+            async with anyio.create_task_group() as capture_tg:
+                capture_tg.start_soon(audio)
+                capture_tg.start_soon(vision)
+            capturing.set()
+
+        await self._summarize(meeting, SummaryKind.FINAL)
+        with rec.time("audio.record_full_audio"):
+            async with self.app.state.db_session_maker() as session:
+                await self.audio.record_full_audio(meeting, meeting_dir / "recording.wav", session)
+        with rec.time("api.stop_meeting"):
+            (await client.post(f"/meetings/{meeting_id}/stop")).raise_for_status()
+
+    async def _summarize(self, meeting: Meeting, kind: SummaryKind) -> None:
+        with self.recorder.time(f"summary.{kind.value}"):
+            async with self.app.state.db_session_maker() as session:
+                await self.summarization.generate_summary(meeting, kind, session)
+
+    async def query(self, client: httpx.AsyncClient, meeting_ids: list[str]) -> int:
+        """Search and export after the meetings end; return the exported byte count."""
+        rec = self.recorder
+        rng = np.random.default_rng(5)
+        for _ in range(self.args.queries):
+            for query in SEARCH_QUERIES:
+                with rec.time("search.full_text"):
+                    async with self.app.state.db_read_session_maker() as session:
+                        await self.search.full_text_search(query, session)
+            vector = rng.standard_normal(self.args.dim).astype(np.float32).tobytes()
+            with rec.time("search.visual"):
+                async with self.app.state.db_read_session_maker() as session:
+                    await self.search.visual_search(vector, session)
+
+        exported = 0
+        for meeting_id in meeting_ids:
+            with rec.time("api.export"):
+                async with client.stream("GET", f"/meetings/{meeting_id}/export") as response:
+                    async for chunk in response.aiter_bytes():
+                        exported += len(chunk)
+            self.sample_memory()
+        return exported
+
+    async def run(self) -> dict[str, float]:
+        transport = httpx.ASGITransport(app=self.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark/api/v1"
+        ) as client:
+            started = time.perf_counter()
+            async with anyio.create_task_group() as tg:
+                for index in range(self.args.meetings):
+                    tg.start_soon(self.run_meeting, client, index)
+            await self.app.state.write_buffer.flush()
+            live_seconds = time.perf_counter() - started
+
+            response = await client.get("/meetings/", params={"limit": self.args.meetings})
+            meeting_ids = [m["id"] for m in response.json()["items"]]
+            query_started = time.perf_counter()
+            exported = await self.query(client, meeting_ids)
+            query_seconds = time.perf_counter() - query_started
+
+        self.sample_memory()
+        transcribed = sum(p.stats.chunks_transcribed for p in self.pipelines)
+        captured = self.args.meetings * self.captures
+        return {
+            "throughput.chunks_per_s": transcribed / live_seconds,
+            "throughput.captures_per_s": captured / live_seconds,
+            "throughput.export_mb_per_s": exported / (1024 * 1024) / max(query_seconds, 1e-9),
+            **self.recorder.percentiles(),
+            "vision.duplicate_ratio": np.mean([t.duplicate for t in self.vision.timings]),
+            "db.size_mb": db_size_mb(Path(self.app.state.settings.db.PATH)),
+            **{
+                f"batch.{operation}.mean_size": stats.mean_size
+                for batcher in self.batchers
+                for operation, stats in batcher.batch_stats().items()
+                if stats.batches
+            },
+            "rss.peak_mb": self.peak_rss,
+            "wall.live_s": live_seconds,
+        }
+
+
+def model_factories(args: argparse.Namespace) -> dict[str, Callable[[], Any]]:
+    """The fake model backends; picklable, so they can also run in model pool workers."""
+    return {
+        "asr": partial(
+            FakeASR,
+            Latency(args.asr_ms / 1000, args.asr_ms / 4000, seed=1),
+            words_per_chunk=args.words_per_chunk,
+            chunk_seconds=args.chunk_seconds,
+        ),
+        "vlm": partial(
+            FakeVLM, Latency(args.vlm_ms / 1000, args.vlm_ms / 4000, seed=3), dim=args.dim
+        ),
+        "llm": partial(
+            FakeSummarizer,
+            Latency(args.llm_ms / 1000, args.llm_ms / 4000, seed=4),
+            output_words=args.summary_words,
+        ),
+    }
+
+
+async def simulate(args: argparse.Namespace, data_dir: Path) -> dict[str, float]:
+    # Settings are read from the environment when the app starts.
+    os.environ["DB_PATH"] = str(data_dir / "benchmark.db")
+    os.environ["PATHS_DATA_DIR"] = str(data_dir / "meetings")
+    if args.write_buffer_delay is not None:
+        os.environ["DB_WRITE_BUFFER_MAX_DELAY"] = str(args.write_buffer_delay)
+    models = []
+    if args.model_pool:
+        models = [
+            ModelSpec(name, factory, eager=True) for name, factory in model_factories(args).items()
+        ]
+    app = create_app(models=models)
+    async with app.router.lifespan_context(app):
+        while not app.state.model_pool.ready:
+            await anyio.sleep(0.05)
+        return await Simulation(args, app, data_dir).run()
+
+
+# Metrics where a larger value is an improvement; every other metric is a cost.
+_HIGHER_IS_BETTER = ("throughput.",)
+# Informational metrics that are not compared against the baseline.
+_NOT_COMPARED = ("vision.duplicate_ratio", "wall.", "batch.")
+
+
+def compare(metrics: dict[str, float], baseline: dict[str, float], tolerance: float) -> list[str]:
+    """Describe each metric that is worse than ``baseline`` by more than ``tolerance``."""
+    regressions = []
+    for name, base in sorted(baseline.items()):
+        value = metrics.get(name)
+        if value is None or base <= 0 or name.startswith(_NOT_COMPARED):
+            continue
+        change = (value - base) / base
+        if name.startswith(_HIGHER_IS_BETTER):
+            change = -change
+        if change > tolerance:
+            regressions.append(f"{name}: {base:.3f} -> {value:.3f} ({change:+.0%} worse)")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--meetings", type=int, default=4)
+    parser.add_argument("--hours", type=float, default=1.0)
+    parser.add_argument("--chunk-seconds", type=float, default=5.0)
+    parser.add_argument("--capture-interval", type=float, default=5.0)
+    parser.add_argument("--summary-interval", type=float, default=300.0)
+    parser.add_argument("--frames-per-slide", type=int, default=6)
+    parser.add_argument("--asr-ms", type=float, default=20.0, help="Mean ASR latency per chunk")
+    parser.add_argument("--asr-workers", type=int, default=2)
+    parser.add_argument("--vlm-ms", type=float, default=50.0, help="Mean VLM latency per call")
+    parser.add_argument("--llm-ms", type=float, default=200.0, help="Mean LLM latency per call")
+    parser.add_argument(
+        "--max-batch", type=int, default=1, help="Batch model calls across meetings when > 1"
+    )
+    parser.add_argument("--batch-wait-ms", type=float, default=20.0)
+    parser.add_argument(
+        "--model-pool",
+        action="store_true",
+        help="Run the model fakes in shared model pool workers instead of in-process",
+    )
+    parser.add_argument("--words-per-chunk", type=int, default=14)
+    parser.add_argument("--summary-words", type=int, default=120)
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--image-width", type=int, default=1280)
+    parser.add_argument("--image-height", type=int, default=720)
+    parser.add_argument("--raw-audio-seconds", type=float, default=60.0)
+    parser.add_argument(
+        "--write-buffer-delay",
+        type=float,
+        help="Override DB_WRITE_BUFFER_MAX_DELAY, the group-commit window",
+    )
+    parser.add_argument("--poll-interval", type=float, default=0.05)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--keep", type=Path, help="Keep the data in this directory")
+    parser.add_argument("--save-baseline", type=Path)
+    parser.add_argument("--compare", type=Path, help="Baseline to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    data_dir = args.keep or Path(tempfile.mkdtemp(prefix="callyfy-bench-"))
+    data_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        metrics = anyio.run(simulate, args, data_dir)
+    finally:
+        if args.keep is None:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    width = max(map(len, metrics))
+    for name, value in metrics.items():
+        print(f"{name:<{width}}  {value:12.3f}")
+
+    config = {k: v for k, v in vars(args).items() if k not in ("keep", "save_baseline", "compare")}
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps({"config": config, "metrics": metrics}, indent=2))
+        print(f"Baseline saved to {args.save_baseline}")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if baseline["config"] != {**config, "tolerance": baseline["config"]["tolerance"]}:
+            print("warning: baseline was recorded with different options", file=sys.stderr)
+        regressions = compare(metrics, baseline["metrics"], args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} of {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Recall and latency of exact vs IVF-PQ search in :class:`VectorIndex`.
+
+Usage::
+
+    python -m benchmarks.vector_index --sizes 10000 100000 1000000 --dim 128
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.services.vector_index import VectorIndex
+
+CAPTURES_PER_MEETING = 720  # one hour of 5-second captures
+
+
+def _synthetic(n: int, dim: int, rng: np.random.Generator) -> np.ndarray:
+    """Clustered vectors: near-duplicate slides around a few thousand topics."""
+    topics = rng.standard_normal((max(n // 200, 16), dim)).astype(np.float32)
+    noise = rng.standard_normal((n, dim)).astype(np.float32) * 0.35
+    return topics[rng.integers(0, len(topics), n)] + noise
+
+
+def _timed(fn, queries: np.ndarray) -> tuple[list, np.ndarray]:
+    results, latencies = [], []
+    for q in queries:
+        start = time.perf_counter()
+        results.append(fn(q))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return results, np.asarray(latencies)
+
+
+def run(size: int, dim: int, k: int, queries: int, nprobe: int, m: int) -> None:
+    rng = np.random.default_rng(size)
+    data = _synthetic(size, dim, rng)
+    query_rows = rng.choice(size, queries, replace=False)
+    query_vectors = data[query_rows] + rng.standard_normal((queries, dim)).astype(np.float32) * 0.1
+
+    workdir = Path(tempfile.mkdtemp(prefix="callyfy-vi-"))
+    try:
+        index = VectorIndex(workdir)
+        meetings = [f"m{i // CAPTURES_PER_MEETING}" for i in range(size)]
+        for start in range(0, size, 100_000):
+            stop = start + 100_000
+            index.add_many(
+                list(range(start, min(stop, size))), meetings[start:stop], data[start:stop]
+            )
+
+        exact, exact_ms = _timed(lambda q: index.search(q, k=k, exact=True), query_vectors)
+
+        nlist = int(min(4096, max(64, 4 * np.sqrt(size))))
+        start = time.perf_counter()
+        index.train(nlist=nlist, m=m)
+        train_s = time.perf_counter() - start
+        approx, ivf_ms = _timed(lambda q: index.search(q, k=k, nprobe=nprobe), query_vectors)
+
+        recall = np.mean(
+            [
+                len({h.capture_id for h in a} & {h.capture_id for h in e}) / k
+                for a, e in zip(approx, exact)
+            ]
+        )
+        _, filtered_ms = _timed(
+            lambda q: index.search(q, k=k, meeting_id="m0", exact=True), query_vectors
+        )
+        print(
+            f"{size:>9,} x {dim}  exact p50 {np.percentile(exact_ms, 50):7.2f} ms "
+            f"p99 {np.percentile(exact_ms, 99):7.2f} ms | "
+            f"ivf-pq(nlist={nlist}, nprobe={nprobe}, m={m}) p50 "
+            f"{np.percentile(ivf_ms, 50):6.2f} ms p99 {np.percentile(ivf_ms, 99):6.2f} ms "
+            f"recall@{k} {recall:.3f} train {train_s:5.1f} s | "
+            f"meeting-filtered exact p50 {np.percentile(filtered_ms, 50):5.2f} ms"
+        )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument("--m", type=int, default=16)
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size, args.dim, args.k, args.queries, args.nprobe, args.m)
+
+
+if __name__ == "__main__":
+    main()
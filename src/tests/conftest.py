@@ -0,0 +1,68 @@
+from pathlib import Path
+from typing import AsyncIterator
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.settings import DBSettings, PathsSettings, Settings
+from app.db import database
+from app.main import create_app
+from app.models import Meeting
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+def settings(tmp_path: Path) -> Settings:
+    return Settings(
+        db=DBSettings(PATH=str(tmp_path / "callyfy.db"), WRITE_BUFFER_MAX_DELAY=0.01),
+        paths=PathsSettings(DATA_DIR=tmp_path / "data"),
+    )
+
+
+@pytest.fixture
+async def engine(settings: Settings) -> AsyncIterator[AsyncEngine]:
+    engine = database.create_db_engine(settings.db)
+    await database.init_db_tables(engine)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_maker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return database.create_session_factory(engine)
+
+
+@pytest.fixture
+async def session(
+    session_maker: async_sessionmaker[AsyncSession],
+) -> AsyncIterator[AsyncSession]:
+    async with session_maker() as session:
+        yield session
+
+
+@pytest.fixture
+async def meeting(session: AsyncSession) -> Meeting:
+    meeting = Meeting(title="Weekly sync")
+    session.add(meeting)
+    await session.commit()
+    return meeting
+
+
+@pytest.fixture
+async def app(settings: Settings) -> AsyncIterator[FastAPI]:
+    app = create_app(settings)
+    async with app.router.lifespan_context(app):
+        yield app
+
+
+@pytest.fixture
+async def client(app: FastAPI) -> AsyncIterator[httpx.AsyncClient]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
@@ -0,0 +1,147 @@
+import io
+import wave
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+import numpy as np
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Meeting, RawAudioArtifact, TranscriptSegment
+from app.services.audio import AudioService
+from app.services.audio_archive import (
+    AudioArchive,
+    AudioArchiveError,
+    AudioArchiveWriter,
+    compress_wav,
+    index_path,
+)
+from app.services.post_processing import _write_slice, find_silence_bounds
+
+pytestmark = pytest.mark.anyio
+
+RATE = 8000
+
+
+def _speech_with_pauses(seconds: int) -> np.ndarray:
+    """A tone with 200 ms of silence around every full second."""
+    t = np.arange(RATE * seconds)
+    samples = (np.sin(t / 3) * 10000).astype(np.int16)
+    for second in range(1, seconds):
+        samples[second * RATE - RATE // 10 : second * RATE + RATE // 10] = 0
+    return samples
+
+
+def _write_wav(path: Path, samples: np.ndarray, width: int = 2) -> Path:
+    with wave.open(str(path), "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(width)
+        writer.setframerate(RATE)
+        writer.writeframes(samples.astype("<i2").tobytes() if width == 2 else samples.tobytes())
+    return path
+
+
+def test_archive_round_trip_by_range(tmp_path: Path) -> None:
+    samples = _speech_with_pauses(4)[: int(RATE * 3.5)]
+    with AudioArchiveWriter(tmp_path / "r.flacseg", RATE, segment_seconds=1) as writer:
+        writer.write(samples[:1234].tobytes())
+        writer.write(samples[1234:])
+
+    archive = AudioArchive(tmp_path / "r.flacseg")
+
+    assert [s.frames for s in archive.segments] == [RATE, RATE, RATE, RATE // 2]
+    assert archive.duration_seconds == 3.5
+    assert np.array_equal(np.concatenate(list(archive.iter_pcm()))[:, 0], samples)
+    part = np.concatenate(list(archive.iter_pcm(0.75, 2.25)))[:, 0]
+    assert np.array_equal(part, samples[int(RATE * 0.75) : int(RATE * 2.25)])
+    assert len(archive.segments_between(int(RATE * 0.75), int(RATE * 2.25))) == 3
+    offset, length = archive.byte_range(1.0, 2.0)
+    assert (offset, length) == (archive.segments[1].offset, archive.segments[1].length)
+    wav = b"".join(archive.iter_wav(0.5, 1.5))
+    with wave.open(io.BytesIO(wav)) as reader:
+        assert reader.getnframes() == RATE == len(reader.readframes(RATE)) // 2
+
+
+def test_torn_index_record_is_ignored(tmp_path: Path) -> None:
+    archive = compress_wav(
+        _write_wav(tmp_path / "r.wav", _speech_with_pauses(2)), tmp_path / "r.flacseg", 1
+    )
+    with index_path(archive.path).open("ab") as fh:
+        fh.write(b"\x00" * 7)
+
+    assert len(AudioArchive(archive.path).segments) == 2
+    with pytest.raises(AudioArchiveError):
+        AudioArchive(tmp_path / "missing.flacseg")
+    with pytest.raises(AudioArchiveError):
+        compress_wav(
+            _write_wav(tmp_path / "u8.wav", np.zeros(100, np.uint8), width=1), tmp_path / "x"
+        )
+
+
+def test_archive_is_sliced_like_the_wav(tmp_path: Path) -> None:
+    wav = _write_wav(tmp_path / "r.wav", _speech_with_pauses(6))
+    archive = compress_wav(wav, tmp_path / "r.flacseg", segment_seconds=1.3)
+
+    bounds = find_silence_bounds(archive.path, 2, 0.5)
+
+    assert bounds == find_silence_bounds(wav, 2, 0.5)
+    assert len(bounds) == 3 and bounds[-1][1] == 6 * RATE
+    for second, (_, end) in zip((2, 4), bounds):
+        assert abs(end - second * RATE) <= RATE // 10  # inside the pause
+    start, end = bounds[1]
+    assert _write_slice(archive.path, start, end, tmp_path / "a.wav") == start / RATE
+    _write_slice(wav, start, end, tmp_path / "b.wav")
+    with wave.open(str(tmp_path / "a.wav")) as a, wave.open(str(tmp_path / "b.wav")) as b:
+        assert a.readframes(end) == b.readframes(end)
+
+
+class DurationASR:
+    """Report each transcribed file's length, to show only slices are decoded."""
+
+    async def transcribe_chunk(self, audio: bytes) -> TranscriptSegment:
+        raise NotImplementedError
+
+    async def transcribe_file(self, audio_path: Path) -> list[TranscriptSegment]:
+        with wave.open(str(audio_path)) as reader:
+            seconds = reader.getnframes() / reader.getframerate()
+        start = datetime(2025, 1, 6)
+        return [TranscriptSegment(started_at=start, ended_at=start, text=f"{seconds:g}s")]
+
+
+async def test_post_process_archive_without_decoding_it_whole(
+    tmp_path: Path, session: AsyncSession, meeting: Meeting
+) -> None:
+    wav = _write_wav(tmp_path / "r.wav", _speech_with_pauses(20))
+    archive = compress_wav(wav, tmp_path / "r.flacseg", segment_seconds=1)
+    artifact = RawAudioArtifact(meeting_id=meeting.id, file_path=str(archive.path))
+    session.add(artifact)
+    await session.commit()
+    audio = AudioService(None, DurationASR(), post_process_slice_seconds=4)  # type: ignore
+
+    slices = await audio.post_process_audio(artifact, session)
+
+    texts = await session.scalars(select(TranscriptSegment.text).order_by(TranscriptSegment.id))
+    durations = [float(text.rstrip("s")) for text in texts]
+    assert len(durations) == slices > 2
+    assert max(durations) < 10 and sum(durations) == pytest.approx(20)
+
+
+async def test_serves_time_ranges_and_index(
+    tmp_path: Path, client: httpx.AsyncClient, session: AsyncSession, meeting: Meeting
+) -> None:
+    wav = _write_wav(tmp_path / "r.wav", _speech_with_pauses(3))
+    archive = compress_wav(wav, tmp_path / "r.flacseg", segment_seconds=1)
+    artifact = RawAudioArtifact(meeting_id=meeting.id, file_path=str(archive.path))
+    session.add(artifact)
+    await session.commit()
+    url = f"/api/v1/meetings/{meeting.id}/audio/{artifact.id}"
+
+    index = (await client.get(f"{url}/index")).json()
+    ranged = await client.get(url, params={"start": 0.5, "end": 2})
+
+    assert [s["start_seconds"] for s in index["segments"]] == [0, 1, 2]
+    assert ranged.headers["content-type"] == "audio/wav"
+    with wave.open(io.BytesIO(ranged.content)) as reader:
+        assert reader.getnframes() == int(1.5 * RATE)
@@ -0,0 +1,174 @@
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AsyncIterator
+
+import anyio
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.tracing import tracer
+from app.db.write_buffer import WriteBuffer
+from app.models import Meeting, TranscriptSegment
+from app.services.audio import AudioService
+from app.services.audio_pipeline import BackpressurePolicy, StreamingASRPipeline
+
+pytestmark = pytest.mark.anyio
+
+START = datetime(2025, 1, 6, 9, 0)
+
+
+class FakeCapture:
+    def __init__(self, chunks: list[bytes]) -> None:
+        self.chunks = chunks
+
+    async def start_stream(self, meeting: Meeting) -> None:
+        pass
+
+    async def stop_stream(self, meeting: Meeting) -> None:
+        pass
+
+    async def iter_chunks(self, meeting: Meeting) -> AsyncIterator[bytes]:
+        for chunk in self.chunks:
+            yield chunk
+
+    async def record_raw_audio(self, meeting: Meeting, destination: Path) -> None:
+        raise NotImplementedError
+
+
+class FakeASR:
+    """Echo the chunk as text; a chunk reading ``bad`` yields a segment that cannot be stored."""
+
+    async def transcribe_chunk(self, audio: bytes) -> TranscriptSegment:
+        index = int(audio.split()[-1]) if audio != b"bad" else 0
+        started = START + timedelta(seconds=index)
+        return TranscriptSegment(
+            started_at=started,
+            ended_at=None if audio == b"bad" else started + timedelta(seconds=1),
+            text=audio.decode(),
+        )
+
+    async def transcribe_file(self, audio_path: Path) -> list[TranscriptSegment]:
+        raise NotImplementedError
+
+
+async def test_persists_do_not_wait_for_each_group_commit(session_maker, session, meeting) -> None:
+    chunks = [f"chunk {i}".encode() for i in range(40)]
+    buffer = WriteBuffer(session_maker, max_delay=0.5)
+    buffer.start()
+    audio = AudioService(FakeCapture(chunks), FakeASR(), write_buffer=buffer)
+    pipeline = StreamingASRPipeline(audio, concurrency=4)
+
+    started = time.perf_counter()
+    async with session_maker() as pipeline_session:
+        await pipeline.run(meeting, pipeline_session)
+    elapsed = time.perf_counter() - started
+    await buffer.close()
+
+    # Waiting for each commit in turn would take 40 * max_delay = 20 seconds.
+    assert elapsed < 5
+    assert pipeline.stats.chunks_transcribed == 40
+    assert len(pipeline.stats.latencies) == 40
+    texts = await session.scalars(select(TranscriptSegment.text).order_by(TranscriptSegment.id))
+    assert list(texts) == [chunk.decode() for chunk in chunks]
+
+
+@pytest.mark.parametrize("buffered", [True, False])
+async def test_failed_persist_skips_the_chunk(
+    session_maker, session: AsyncSession, meeting: Meeting, buffered: bool
+) -> None:
+    buffer = WriteBuffer(session_maker, max_delay=0.01) if buffered else None
+    if buffer is not None:
+        buffer.start()
+    audio = AudioService(
+        FakeCapture([b"chunk 1", b"bad", b"chunk 2"]), FakeASR(), write_buffer=buffer
+    )
+    published: list[str] = []
+    audio.publish_transcript = lambda segment: published.append(segment.text)  # type: ignore
+    pipeline = StreamingASRPipeline(audio)
+
+    async with session_maker() as pipeline_session:
+        await pipeline.run(meeting, pipeline_session)
+    if buffer is not None:
+        await buffer.close()
+
+    assert pipeline.stats.persist_failures == 1
+    assert published == ["chunk 1", "chunk 2"]
+    texts = await session.scalars(select(TranscriptSegment.text).order_by(TranscriptSegment.id))
+    assert list(texts) == ["chunk 1", "chunk 2"]
+
+
+class GatedASR(FakeASR):
+    """Hold every chunk in ASR until ``release`` is set."""
+
+    def __init__(self) -> None:
+        self.started = anyio.Event()
+        self.release = anyio.Event()
+
+    async def transcribe_chunk(self, audio: bytes) -> TranscriptSegment:
+        self.started.set()
+        await self.release.wait()
+        return await super().transcribe_chunk(audio)
+
+
+class SteppedCapture(FakeCapture):
+    """Send the first chunk, then the rest once ASR has taken it, then keep the stream open."""
+
+    def __init__(self, chunks: list[bytes], asr: GatedASR, end: anyio.Event) -> None:
+        super().__init__(chunks)
+        self.asr = asr
+        self.end = end
+
+    async def iter_chunks(self, meeting: Meeting) -> AsyncIterator[bytes]:
+        yield self.chunks[0]
+        await self.asr.started.wait()
+        for chunk in self.chunks[1:]:
+            yield chunk
+        await self.end.wait()
+
+
+async def test_cancelled_run_leaves_no_queued_chunks_in_the_gauge(
+    session_maker, meeting: Meeting
+) -> None:
+    asr = GatedASR()
+    capture = SteppedCapture([f"chunk {i}".encode() for i in range(5)], asr, anyio.Event())
+    pipeline = StreamingASRPipeline(AudioService(capture, asr))
+    depth = metrics.ASR_QUEUE_DEPTH.labels()
+    before = depth.get()
+
+    async with session_maker() as pipeline_session, anyio.create_task_group() as tg:
+        tg.start_soon(pipeline.run, meeting, pipeline_session)
+        while pipeline.stats.chunks_captured < 5:
+            await anyio.sleep(0.01)
+        assert depth.get() == before + 4  # the first chunk is in ASR
+        tg.cancel_scope.cancel()
+
+    assert depth.get() == before
+    assert pipeline.stats.queue_depth == 0
+
+
+async def test_merged_chunks_are_traced_on_the_surviving_chunk(
+    session_maker, session: AsyncSession, meeting: Meeting
+) -> None:
+    asr, end = GatedASR(), anyio.Event()
+    capture = SteppedCapture([b"chunk 0", b"chunk 1", b"chunk 2"], asr, end)
+    audio = AudioService(capture, asr)
+    pipeline = StreamingASRPipeline(audio, queue_size=1, policy=BackpressurePolicy.MERGE)
+
+    async with session_maker() as pipeline_session, anyio.create_task_group() as tg:
+        tg.start_soon(pipeline.run, meeting, pipeline_session)
+        while pipeline.stats.chunks_captured < 3:
+            await anyio.sleep(0.01)
+        asr.release.set()
+        end.set()
+
+    assert pipeline.stats.chunks_merged == 1
+    segments = list(await session.scalars(select(TranscriptSegment).order_by(TranscriptSegment.id)))
+    assert [segment.text for segment in segments] == ["chunk 0", "chunk 1chunk 2"]
+    (queued,) = [
+        span for span in tracer.spans(meeting.id, segments[1].trace_id) if span.name == "queue"
+    ]
+    (merged,) = queued.attributes["merged"]
+    assert merged not in {segment.trace_id for segment in segments}
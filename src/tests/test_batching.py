@@ -0,0 +1,117 @@
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+import anyio
+import pytest
+
+from app.models import TranscriptSegment
+from app.services.audio import BatchASRBackend, BatchingASRBackend
+from app.services.model_pool import ModelSpec, ModelWorkerPool, Priority, model_calls
+
+pytestmark = pytest.mark.anyio
+
+START = datetime(2025, 1, 6, 9, 0)
+
+
+def _segment(chunk: bytes) -> TranscriptSegment:
+    return TranscriptSegment(started_at=START, ended_at=START, text=chunk.decode())
+
+
+class FakeBatchASR:
+    """Echo each chunk; a batch with ``bad`` raises, one with ``short`` loses a result."""
+
+    def __init__(self) -> None:
+        self.batches: list[list[bytes]] = []
+
+    async def transcribe_chunks(self, chunks: list[bytes]) -> list[TranscriptSegment]:
+        self.batches.append(chunks)
+        if b"bad" in chunks:
+            raise RuntimeError("decoder crashed")
+        segments = [_segment(chunk) for chunk in chunks]
+        return segments[:-1] if b"short" in chunks else segments
+
+    async def transcribe_file(self, audio_path: Path) -> Iterable[TranscriptSegment]:
+        return [_segment(audio_path.name.encode())]
+
+
+async def _transcribe_all(
+    asr: BatchingASRBackend, chunks: list[bytes]
+) -> dict[bytes, str | Exception]:
+    results: dict[bytes, str | Exception] = {}
+
+    async def transcribe(chunk: bytes) -> None:
+        try:
+            results[chunk] = (await asr.transcribe_chunk(chunk)).text
+        except Exception as exc:
+            results[chunk] = exc
+
+    async with anyio.create_task_group() as tg:
+        for chunk in chunks:
+            tg.start_soon(transcribe, chunk)
+    return results
+
+
+async def test_batched_results_go_back_to_their_callers() -> None:
+    backend = FakeBatchASR()
+    asr = BatchingASRBackend(backend, max_batch=4, max_wait=0.01)
+    chunks = [f"chunk {i}".encode() for i in range(6)]
+
+    results = await _transcribe_all(asr, chunks)
+
+    assert results == {chunk: chunk.decode() for chunk in chunks}
+    assert [len(batch) for batch in backend.batches] == [4, 2]
+    stats = asr.batch_stats()["transcribe_chunk"]
+    assert (stats.batches, stats.items, stats.largest, stats.full) == (2, 6, 4, 1)
+    assert [s.text for s in await asr.transcribe_file(Path("whole.wav"))] == ["whole.wav"]
+
+
+@pytest.mark.parametrize(
+    ("culprit", "error"), [(b"bad", RuntimeError), (b"short", ValueError)], ids=["raise", "short"]
+)
+async def test_a_failed_batch_fails_only_its_callers(culprit: bytes, error: type) -> None:
+    backend = FakeBatchASR()
+    asr = BatchingASRBackend(backend, max_batch=2, max_wait=0.01)
+
+    results = await _transcribe_all(asr, [b"chunk 1", culprit, b"chunk 2", b"chunk 3"])
+
+    assert backend.batches == [[b"chunk 1", culprit], [b"chunk 2", b"chunk 3"]]
+    assert isinstance(results[b"chunk 1"], error) and results[b"chunk 1"] is results[culprit]
+    assert results[b"chunk 2"] == "chunk 2" and results[b"chunk 3"] == "chunk 3"
+
+
+class RecordingPool(ModelWorkerPool):
+    """Answers ``transcribe_chunks`` in-process and records how each call was queued."""
+
+    def __init__(self) -> None:
+        super().__init__([ModelSpec("asr", dict, interface=BatchASRBackend)])
+        self.calls: list[tuple[str, Priority]] = []
+
+    async def submit(self, model, method, args, kwargs, meeting_id, priority=Priority.LIVE):
+        self.calls.append((meeting_id, priority))
+        return [_segment(chunk) for chunk in args[0]]
+
+
+async def test_batches_run_outside_their_callers_context() -> None:
+    pool = RecordingPool()
+    asr = BatchingASRBackend(pool.client("asr"), max_batch=2, max_wait=0.01)  # type: ignore
+
+    async def transcribe(meeting_id: str, priority: Optional[Priority]) -> None:
+        with model_calls(meeting_id, priority):
+            await asr.transcribe_chunk(meeting_id.encode())
+
+    for callers in (
+        [("a", Priority.BACKGROUND), ("b", Priority.INTERACTIVE)],  # dispatched when full
+        [("a", Priority.BACKGROUND)],  # dispatched by the timer
+        [("a", None), ("b", Priority.BACKGROUND)],
+    ):
+        async with anyio.create_task_group() as tg:
+            for meeting_id, priority in callers:
+                tg.start_soon(transcribe, meeting_id, priority)
+
+    # Not the meeting and priority of whichever caller triggered the dispatch.
+    assert pool.calls == [
+        ("", Priority.INTERACTIVE),
+        ("", Priority.BACKGROUND),
+        ("", Priority.LIVE),  # the client's default, as for the caller that set none
+    ]
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select, text
+
+from app.db import database
+from app.db.write_buffer import persist
+from app.models import Meeting
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_engine_applies_connection_profile(settings) -> None:
+    engine = database.create_db_engine(settings.db)
+    read_engine = database.create_db_engine(settings.db, read_only=True)
+    try:
+        async with engine.connect() as conn:
+            assert (await conn.scalar(text("PRAGMA journal_mode"))) == "wal"
+            assert (await conn.scalar(text("PRAGMA busy_timeout"))) == settings.db.BUSY_TIMEOUT
+        async with read_engine.connect() as conn:
+            assert (await conn.scalar(text("PRAGMA query_only"))) == 1
+    finally:
+        await read_engine.dispose()
+        await engine.dispose()
+
+
+async def test_persist_inside_writer_transaction_does_not_deadlock(app) -> None:
+    # The writer engine has a single connection; a session that has read in its
+    # transaction holds it while awaiting the write buffer.
+    async with app.state.db_session_maker() as session:
+        meeting = Meeting(title="Held")
+        session.add(meeting)
+        await session.commit()
+        await session.execute(select(Meeting.id))
+        assert session.in_transaction()
+
+        persisted = await asyncio.wait_for(
+            persist(Meeting(title="Buffered"), session, app.state.write_buffer), timeout=5
+        )
+
+        assert persisted.id is not None
+        titles = await session.scalars(select(Meeting.title).order_by(Meeting.title))
+        assert list(titles) == ["Buffered", "Held"]
@@ -0,0 +1,104 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Meeting, ScreenCapture
+from app.services.embedding_store import (
+    EmbeddingDType,
+    EmbeddingStore,
+    EmbeddingStoreError,
+    convert_legacy_embeddings,
+    load_capture_embedding,
+    store_path,
+)
+
+pytestmark = pytest.mark.anyio
+
+TOLERANCE = {EmbeddingDType.FLOAT32: 0, EmbeddingDType.FLOAT16: 4e-3, EmbeddingDType.INT8: 4e-2}
+
+
+def _vectors(count: int, dim: int = 16) -> np.ndarray:
+    return np.random.default_rng(0).standard_normal((count, dim)).astype(np.float32)
+
+
+@pytest.mark.parametrize("dtype", list(EmbeddingDType))
+def test_round_trip_and_reopen(tmp_path: Path, dtype: EmbeddingDType) -> None:
+    vectors = _vectors(20)
+    store = EmbeddingStore(store_path(tmp_path), dtype)
+    store.append(100, vectors[0].tobytes())
+    store.append_many(range(101, 120), vectors[1:])
+
+    reopened = EmbeddingStore(store_path(tmp_path), EmbeddingDType.FLOAT32)
+
+    assert reopened.dtype is dtype and reopened.dim == 16 and len(reopened) == 20
+    np.testing.assert_allclose(reopened.get(107), vectors[7], atol=TOLERANCE[dtype])
+    assert reopened.get(99) is None
+    assert reopened.top_k(vectors[12] * 3, k=2)[0][0] == 112
+
+
+def test_torn_record_is_ignored_and_overwritten(tmp_path: Path) -> None:
+    vectors = _vectors(3)
+    path = store_path(tmp_path)
+    EmbeddingStore(path).append_many([1, 2], vectors[:2])
+    with path.open("ab") as fh:
+        fh.write(b"\x01" * 10)  # an append interrupted part-way
+
+    store = EmbeddingStore(path)
+    assert len(store) == 2
+    store.append(3, vectors[2])
+
+    assert len(EmbeddingStore(path)) == 3
+    assert EmbeddingStore(path).row_of(3) == 2
+
+
+def test_rejects_mismatched_input(tmp_path: Path) -> None:
+    store = EmbeddingStore(store_path(tmp_path))
+    store.append(1, _vectors(1)[0])
+
+    with pytest.raises(EmbeddingStoreError):
+        store.append(2, _vectors(1, dim=8)[0])
+    with pytest.raises(EmbeddingStoreError):
+        store.append_many([2, 3], _vectors(1))
+
+    (tmp_path / "other.cemb").write_bytes(b"NOPE" + b"\0" * 60)
+    with pytest.raises(EmbeddingStoreError):
+        EmbeddingStore(tmp_path / "other.cemb")
+
+
+async def test_convert_legacy_embeddings(
+    tmp_path: Path, session: AsyncSession, meeting: Meeting
+) -> None:
+    vectors = _vectors(3)
+    captures = []
+    for i, vector in enumerate(vectors):
+        legacy = tmp_path / f"{i}.emb"
+        vector.tofile(legacy)
+        captures.append(
+            ScreenCapture(meeting_id=meeting.id, image_path=f"{i}.png", embeddings_path=str(legacy))
+        )
+    session.add_all(captures)
+    await session.flush()
+    duplicate = ScreenCapture(
+        meeting_id=meeting.id,
+        image_path="0.png",
+        embeddings_path=captures[0].embeddings_path,
+        duplicate_of_id=captures[0].id,
+    )
+    session.add(duplicate)
+    await session.commit()
+    assert np.array_equal(load_capture_embedding(captures[1]), vectors[1])
+
+    converted = await convert_legacy_embeddings(session, batch_size=2)
+
+    assert converted == 4
+    assert not list(tmp_path.glob("*.emb"))
+    rows = (await session.scalars(select(ScreenCapture).order_by(ScreenCapture.id))).all()
+    assert {row.embeddings_path for row in rows} == {str(store_path(tmp_path))}
+    stores: dict[Path, EmbeddingStore] = {}
+    for row, vector in zip(rows, [*vectors, vectors[0]]):
+        np.testing.assert_allclose(load_capture_embedding(row, stores), vector, atol=4e-3)
+    assert len(stores[store_path(tmp_path)]) == 3
+    assert await convert_legacy_embeddings(session) == 0
@@ -0,0 +1,57 @@
+import anyio
+import pytest
+
+from app.services.events import EventBroker
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_forget_delivers_queued_events_then_ends() -> None:
+    broker = EventBroker(queue_size=2)
+    subscription = broker.subscribe("m")
+    broker.publish("m", "transcript", {"text": "last words"})
+    broker.publish("m", "meeting", {"ended": True})
+
+    broker.forget("m")
+
+    with anyio.fail_after(1):
+        received = [event.type async for event in subscription]
+    assert received == ["transcript", "meeting"]
+    assert not subscription.evicted
+    assert broker.subscriber_count() == 0
+
+
+async def test_resume_replays_history_and_detects_gaps() -> None:
+    broker = EventBroker(history_size=3)
+    for i in range(5):
+        broker.publish("m", "transcript", {"i": i})
+
+    with broker.subscribe("m", after_seq=3) as subscription:
+        assert not subscription.resync
+        with anyio.fail_after(1):
+            assert (await subscription.__anext__()).seq == 4
+    assert broker.subscribe("m", after_seq=1).resync
+
+
+async def test_slow_subscriber_is_evicted() -> None:
+    broker = EventBroker(queue_size=1)
+    subscription = broker.subscribe("m")
+    broker.publish("m", "a", {})
+    broker.publish("m", "b", {})
+
+    assert subscription.evicted
+    assert [event.type async for event in subscription] == []
+
+
+def test_idle_topics_are_capped_least_recently_used_first() -> None:
+    broker = EventBroker(max_topics=2)
+    followed = broker.subscribe("followed")
+    broker.publish("a", "x", {})
+    broker.publish("b", "x", {})
+
+    assert set(broker._topics) == {"followed", "b"}
+    broker.publish("b", "x", {})
+    broker.publish("c", "x", {})
+    assert set(broker._topics) == {"followed", "c"}
+    assert broker.subscriber_count("followed") == 1
+    followed.close()
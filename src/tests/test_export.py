@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Meeting
+from app.services.export import EXPORT_COLUMNS, ExportFormat, iter_export
+from app.services.storage import StorageService
+
+from .test_storage import add_assets
+
+pytestmark = pytest.mark.anyio
+
+
+class CountingSession:
+    """Session proxy that records how many rows each statement returned."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self.fetched: list[int] = []
+
+    async def execute(self, stmt, *args, **kwargs):
+        rows = (await self.session.execute(stmt, *args, **kwargs)).all()
+        self.fetched.append(len(rows))
+        return rows
+
+
+async def _export(client: httpx.AsyncClient, meeting: Meeting, **params) -> bytes:
+    response = await client.get(f"/api/v1/meetings/{meeting.id}/export", params=params)
+    assert response.status_code == 200
+    return response.content
+
+
+async def test_large_export_is_read_in_batches(
+    tmp_path, session: AsyncSession, meeting: Meeting
+) -> None:
+    await add_assets(session, meeting, 3000)
+    counting = CountingSession(session)
+    entries = StorageService(tmp_path).iter_meeting_timeline(
+        meeting.id, counting, batch_size=200  # type: ignore[arg-type]
+    )
+
+    chunks = [chunk async for chunk in iter_export(entries, ExportFormat.NDJSON)]
+
+    assert len(chunks) > 3
+    assert sum(counting.fetched) == 3000 + 1000 + 600 + 1
+    assert max(counting.fetched) == 200
+
+
+async def test_large_export_resumes_from_cursor(
+    client: httpx.AsyncClient, session: AsyncSession, meeting: Meeting
+) -> None:
+    await add_assets(session, meeting, 3000)
+
+    records = [json.loads(line) for line in (await _export(client, meeting)).splitlines()]
+
+    assert len(records) == 3000 + 1000 + 600
+    positions = [(r["at"], r["kind"], r["id"]) for r in records]
+    assert positions == sorted(positions)
+
+    # Resume as a client would after losing the connection part-way.
+    cut = 2345
+    rest = await _export(client, meeting, cursor=records[cut]["cursor"])
+    assert [json.loads(line) for line in rest.splitlines()] == records[cut + 1 :]
+
+
+async def test_csv_export_gzip_and_kind_filter(
+    client: httpx.AsyncClient, session: AsyncSession, meeting: Meeting
+) -> None:
+    await add_assets(session, meeting, 30)
+
+    body = await _export(client, meeting, format="csv", kind="summary", gzip="true")
+    rows = list(csv.reader(io.StringIO(body.decode())))
+
+    assert rows[0] == list(EXPORT_COLUMNS)
+    assert [row[1] for row in rows[1:]] == ["summary"] * 6
+
+
+async def test_export_rejects_bad_cursor(client: httpx.AsyncClient, meeting: Meeting) -> None:
+    response = await client.get(f"/api/v1/meetings/{meeting.id}/export", params={"cursor": "!"})
+    assert response.status_code == 400
@@ -0,0 +1,106 @@
+import time
+from contextlib import asynccontextmanager
+from functools import partial
+from pathlib import Path
+from typing import AsyncIterator
+
+import anyio
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core.settings import Settings
+from app.main import create_app
+from app.services.model_pool import ModelSpec, ModelWorkerError
+
+pytestmark = pytest.mark.anyio
+
+
+class GatedStart:
+    """Runs in the worker: starting blocks until the gate file exists."""
+
+    def __init__(self, gate: Path) -> None:
+        while not gate.exists():
+            time.sleep(0.01)
+
+    def ping(self) -> str:
+        return "pong"
+
+
+class FailingStart(GatedStart):
+    """Runs in the worker: starting fails until the fix file exists."""
+
+    def __init__(self, fix: Path) -> None:
+        if not fix.exists():
+            raise RuntimeError("weights not found")
+
+
+@asynccontextmanager
+async def _serve(
+    settings: Settings, *models: ModelSpec
+) -> AsyncIterator[tuple[FastAPI, httpx.AsyncClient]]:
+    app = create_app(settings, models=models)
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield app, client
+
+
+async def _wait_for_state(client: httpx.AsyncClient, model: str, state: str) -> httpx.Response:
+    with anyio.fail_after(30):
+        while (response := await client.get("/ready")).json()["models"][model]["state"] != state:
+            await anyio.sleep(0.05)
+    return response
+
+
+async def test_ready_without_models(app: FastAPI, client: httpx.AsyncClient) -> None:
+    assert (await client.get("/health")).json() == {"status": "ok"}
+
+    response = await client.get("/ready")
+
+    assert response.status_code == 200
+    assert response.json()["ready"] and response.json()["models"] == {}
+    assert response.json()["startup_seconds"] == app.state.startup_seconds > 0
+
+
+async def test_ready_is_503_until_eager_models_start(tmp_path: Path, settings: Settings) -> None:
+    gate = tmp_path / "gate"
+    eager = ModelSpec("eager", partial(GatedStart, gate), eager=True)
+    lazy = ModelSpec("lazy", partial(GatedStart, gate))
+
+    async with _serve(settings, eager, lazy) as (_, client):
+        starting = await _wait_for_state(client, "eager", "starting")
+        gate.touch()
+        started = await _wait_for_state(client, "eager", "running")
+
+    assert starting.status_code == 503 and not starting.json()["ready"]
+    assert started.status_code == 200 and started.json()["ready"]
+    # Models started on first use do not hold readiness back.
+    assert started.json()["models"]["lazy"]["state"] == "pending"
+    assert started.json()["models"]["eager"]["start_seconds"] > 0
+
+
+async def test_failed_start_is_reported_and_retried(tmp_path: Path, settings: Settings) -> None:
+    fix = tmp_path / "fixed"
+
+    async with _serve(settings, ModelSpec("m", partial(FailingStart, fix), eager=True)) as (
+        app,
+        client,
+    ):
+        failed = await _wait_for_state(client, "m", "failed")
+        model = app.state.model_pool.client("m")
+        with pytest.raises(ModelWorkerError, match="weights not found"):
+            await model.ping()
+        still_failed = await client.get("/ready")
+
+        fix.touch()
+        assert await model.ping() == "pong"  # each call tries to start it again
+        recovered = await client.get("/ready")
+
+    assert failed.status_code == still_failed.status_code == 503
+    status = failed.json()["models"]["m"]
+    assert "RuntimeError: weights not found" in status["error"]
+    assert status["start_seconds"] is None
+    assert recovered.status_code == 200
+    assert recovered.json()["models"]["m"]["state"] == "running"
+    assert recovered.json()["models"]["m"]["error"] is None
@@ -0,0 +1,80 @@
+from pathlib import Path
+
+import httpx
+import numpy as np
+import pytest
+from PIL import Image
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Meeting, ScreenCapture
+from app.services.image_store import ImageStore, ImageStoreError
+from app.services.vision import VisionService
+
+from .test_vision import NoiseCapture, RendezvousVLM
+
+pytestmark = pytest.mark.anyio
+
+
+def _screen(path: Path, seed: int = 0, size: tuple[int, int] = (640, 400)) -> Path:
+    pixels = np.random.default_rng(seed).integers(0, 255, (size[1], size[0], 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(path)
+    return path
+
+
+def test_same_pixels_are_stored_once(tmp_path: Path) -> None:
+    store = ImageStore(tmp_path / "images", thumbnail_size=(64, 64))
+
+    first = store.ingest(_screen(tmp_path / "a.png"))
+    # The same screen from a backend that encodes differently.
+    second = store.ingest(_screen(tmp_path / "a.bmp"), delete_source=True)
+    other = store.ingest(_screen(tmp_path / "b.png", seed=1))
+
+    assert first.created and not second.created and other.created
+    assert first.digest == second.digest != other.digest
+    assert first.path == store.object_path(first.digest)
+    assert first.path.relative_to(store.root).parts[:3] == (
+        "objects",
+        first.digest[:2],
+        first.digest[2:4],
+    )
+    assert not (tmp_path / "a.bmp").exists() and (tmp_path / "a.png").exists()
+    assert len(list((store.root / "objects").rglob("*.webp"))) == 2
+    assert not list(store.root.rglob("*.tmp"))
+    with Image.open(first.path) as image:
+        assert image.format == "WEBP" and image.size == (640, 400)
+    with Image.open(first.thumbnail_path) as thumbnail:
+        assert thumbnail.size == (64, 40)
+
+
+def test_unreadable_image_is_rejected(tmp_path: Path) -> None:
+    (tmp_path / "broken.png").write_bytes(b"not an image")
+
+    with pytest.raises(ImageStoreError):
+        ImageStore(tmp_path / "images").ingest(tmp_path / "broken.png")
+    assert not (tmp_path / "images").exists()
+
+
+async def test_captures_are_served_from_the_store(
+    tmp_path: Path, client: httpx.AsyncClient, session: AsyncSession, meeting: Meeting
+) -> None:
+    vision = VisionService(
+        NoiseCapture(), RendezvousVLM(parties=1), image_store=ImageStore(tmp_path / "images")
+    )
+
+    capture = await vision.capture_screen(meeting, tmp_path, session)
+
+    assert capture.image_digest and capture.thumbnail_path
+    assert Path(capture.image_path).is_relative_to(tmp_path / "images")
+    assert not list(tmp_path.glob("*.png"))  # the backend's file was removed after analysis
+    url = f"/api/v1/meetings/{meeting.id}/captures/{capture.id}"
+    for suffix in ("image", "thumbnail"):
+        response = await client.get(f"{url}/{suffix}")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/webp"
+        assert "immutable" in response.headers["cache-control"]
+
+    legacy = ScreenCapture(meeting_id=meeting.id, image_path=str(tmp_path / "gone.png"))
+    session.add(legacy)
+    await session.commit()
+    missing = await client.get(f"/api/v1/meetings/{meeting.id}/captures/{legacy.id}/thumbnail")
+    assert missing.status_code == 404
@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+import anyio
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import Meeting, SummaryNode, TranscriptSegment
+from app.services import BatchingSummarizationBackend, IncrementalSummarizer
+from app.services.summarization import SummaryKind
+
+pytestmark = pytest.mark.anyio
+
+START = datetime(2025, 1, 6, 9, 0)
+
+
+class RecordingBackend:
+    """Join parts into one string and note whether ``session`` had a transaction open."""
+
+    def __init__(self) -> None:
+        self.session: Optional[AsyncSession] = None
+        self.calls_in_transaction = 0
+        self.condensed = 0
+
+    async def condense(self, parts: list[str]) -> str:
+        self.condensed += 1
+        self._check()
+        return "(" + " ".join(parts) + ")"
+
+    async def summarize_text(self, parts: list[str], kind: SummaryKind) -> str:
+        self._check()
+        return " | ".join(parts)
+
+    def _check(self) -> None:
+        if self.session is not None and self.session.in_transaction():
+            self.calls_in_transaction += 1
+
+
+async def _add_segments(session: AsyncSession, meeting: Meeting, count: int) -> None:
+    session.add_all(
+        TranscriptSegment(
+            meeting_id=meeting.id,
+            started_at=START + timedelta(seconds=i),
+            ended_at=START + timedelta(seconds=i + 1),
+            text=f"s{i}",
+        )
+        for i in range(count)
+    )
+    await session.commit()
+
+
+async def test_tree_is_built_without_holding_a_transaction(
+    session: AsyncSession, meeting: Meeting
+) -> None:
+    backend = RecordingBackend()
+    backend.session = session
+    summarizer = IncrementalSummarizer(backend, leaf_segments=2, fanout=2)
+    await _add_segments(session, meeting, 9)
+
+    rolling = await summarizer.summarize(meeting, SummaryKind.ROLLING, session)
+
+    # 4 leaves of 2 segments merge into one level-2 node; s8 is the tail.
+    assert rolling == "(((s0 s1) (s2 s3)) ((s4 s5) (s6 s7))) | s8"
+    assert backend.condensed == 7
+    assert backend.calls_in_transaction == 0
+    assert summarizer._locks == {}
+
+    final = await summarizer.summarize(meeting, SummaryKind.FINAL, session)
+
+    assert final == "((((s0 s1) (s2 s3)) ((s4 s5) (s6 s7))) (s8))"
+    assert backend.calls_in_transaction == 0
+    roots = await session.scalars(
+        select(SummaryNode).where(
+            SummaryNode.meeting_id == meeting.id, SummaryNode.parent_id.is_(None)
+        )
+    )
+    assert [(root.first_segment_id, root.level) for root in roots] == [(1, 3)]
+
+
+class BatchRecordingBackend(RecordingBackend):
+    """Also answers batches, recording the size of each."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[tuple[str, int]] = []
+
+    async def condense_batch(self, requests: list[list[str]]) -> list[str]:
+        self.batches.append(("condense", len(requests)))
+        return [await self.condense(parts) for parts in requests]
+
+    async def summarize_text_batch(
+        self, requests: list[tuple[list[str], SummaryKind]]
+    ) -> list[str]:
+        self.batches.append(("summarize_text", len(requests)))
+        return [await self.summarize_text(parts, kind) for parts, kind in requests]
+
+
+async def test_concurrent_meetings_share_batched_calls(
+    session_maker: async_sessionmaker[AsyncSession], session: AsyncSession
+) -> None:
+    meetings = [Meeting(title=f"m{i}") for i in range(4)]
+    session.add_all(meetings)
+    await session.commit()
+    for meeting in meetings:
+        await _add_segments(session, meeting, 9)
+    backend = BatchRecordingBackend()
+    batching = BatchingSummarizationBackend(backend, max_batch=4, max_wait=0.05)
+    summarizer = IncrementalSummarizer(batching, leaf_segments=2, fanout=2)
+
+    results: dict[str, str] = {}
+
+    async def summarize(meeting: Meeting) -> None:
+        # Each meeting's session on the single-connection writer engine.
+        async with session_maker() as own:
+            results[meeting.id] = await summarizer.summarize(meeting, SummaryKind.ROLLING, own)
+
+    async with anyio.create_task_group() as tg:
+        for meeting in meetings:
+            tg.start_soon(summarize, meeting)
+
+    assert set(results.values()) == {"(((s0 s1) (s2 s3)) ((s4 s5) (s6 s7))) | s8"}
+    assert backend.condensed == 7 * 4
+    # Each tree level is condensed for every meeting in one call.
+    assert sum(size for _, size in backend.batches) == 7 * 4 + 4
+    assert max(size for _, size in backend.batches) == 4
+    assert batching.batch_stats()["condense"].mean_size > 2
+    with pytest.raises(TypeError):
+        await BatchingSummarizationBackend(backend).summarize(meetings[0], SummaryKind.FINAL)
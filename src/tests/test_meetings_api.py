@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.http_cache import ResponseCache, is_not_modified, settled
+from app.models import Meeting
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_meeting_list_etag_follows_changes(client: httpx.AsyncClient) -> None:
+    first = await client.get("/api/v1/meetings/")
+    etag = first.headers["ETag"]
+
+    unchanged = await client.get("/api/v1/meetings/", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+
+    created = await client.post("/api/v1/meetings/", json={"title": "Planning"})
+    assert created.status_code == 201
+    changed = await client.get("/api/v1/meetings/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert [item["title"] for item in changed.json()["items"]] == ["Planning"]
+
+    stopped = await client.post(f"/api/v1/meetings/{created.json()['id']}/stop")
+    assert stopped.status_code == 200
+    after_stop = await client.get(
+        "/api/v1/meetings/", headers={"If-None-Match": changed.headers["ETag"]}
+    )
+    assert after_stop.status_code == 200
+
+
+async def test_get_meeting_conditional_requests(
+    app: FastAPI, client: httpx.AsyncClient, session: AsyncSession, meeting: Meeting
+) -> None:
+    url = f"/api/v1/meetings/{meeting.id}"
+    # Last changed well before this request, so Last-Modified is offered.
+    meeting.updated_at = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=1)
+    await session.commit()
+    cache: ResponseCache = app.state.response_cache
+
+    first = await client.get(url)
+    assert first.status_code == 200 and cache.misses == 1
+    etag, last_modified = first.headers["ETag"], first.headers["Last-Modified"]
+    assert (await client.get(url)).json() == first.json() and cache.hits == 1
+    for validator in ({"If-None-Match": etag}, {"If-Modified-Since": last_modified}):
+        assert (await client.get(url, headers=validator)).status_code == 304
+
+    meeting.title = "Renamed"
+    await session.commit()
+
+    for validator in ({"If-None-Match": etag}, {"If-Modified-Since": last_modified}):
+        changed = await client.get(url, headers=validator)
+        assert changed.status_code == 200 and changed.json()["title"] == "Renamed"
+    assert changed.headers["ETag"] != etag
+    assert cache.misses == 2 and cache.hits == 2  # the cached body went stale with the version
+
+
+def test_last_modified_waits_for_its_second_to_end() -> None:
+    changed = datetime(2025, 1, 6, 9, 0, 0, 100000)
+    during = datetime(2025, 1, 6, 9, 0, 0, 900000, tzinfo=timezone.utc)
+    after = datetime(2025, 1, 6, 9, 0, 1, tzinfo=timezone.utc)
+
+    # A client given "09:00:00" at 09:00:00.3 would not see a change at 09:00:00.6.
+    assert settled(changed, now=during) is None
+    assert settled(changed, now=after) == changed
+
+    request = Request(
+        {"type": "http", "headers": [(b"if-modified-since", b"Mon, 06 Jan 2025 09:00:00 GMT")]}
+    )
+    assert is_not_modified(request, 'W/"x"', changed)
+    assert not is_not_modified(request, 'W/"x"', datetime.now(timezone.utc))
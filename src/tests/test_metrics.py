@@ -0,0 +1,86 @@
+import httpx
+import pytest
+
+from app.core.metrics import CONTENT_TYPE, MetricsRegistry
+from app.models import Meeting
+
+pytestmark = pytest.mark.anyio
+
+ROUTE = "/api/v1/meetings/{meeting_id}"
+
+
+def _series(text: str) -> dict[str, float]:
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def _requests(samples: dict[str, float], route: str, status: int) -> float:
+    return samples.get(
+        f'callyfy_http_request_seconds_count{{method="GET",route="{route}",status="{status}"}}', 0
+    )
+
+
+def test_registry_renders_the_prometheus_text_format() -> None:
+    registry = MetricsRegistry()
+    events = registry.counter("t_events", 'Events "by" kind.', ("kind",))
+    events.labels('a"b\\c\nd').inc(2)
+    depth = registry.gauge("t_depth", "Queue depth.")
+    depth.set_function(lambda: 3)
+    latency = registry.histogram("t_seconds", "Latency.\nIn \\ seconds.", buckets=(1.0, 0.25))
+    for value in (0.125, 0.25, 0.5, 1.0, 8.0):
+        latency.observe(value)
+
+    assert registry.render() == (
+        '# HELP t_events Events "by" kind.\n'
+        "# TYPE t_events counter\n"
+        't_events_total{kind="a\\"b\\\\c\\nd"} 2\n'
+        "# HELP t_depth Queue depth.\n"
+        "# TYPE t_depth gauge\n"
+        "t_depth 3\n"
+        "# HELP t_seconds Latency.\\nIn \\\\ seconds.\n"
+        "# TYPE t_seconds histogram\n"
+        # A value on a bucket's bound counts towards that bucket (le: less or equal).
+        't_seconds_bucket{le="0.25"} 2\n'
+        't_seconds_bucket{le="1"} 4\n'
+        't_seconds_bucket{le="+Inf"} 5\n'
+        "t_seconds_sum 9.875\n"
+        "t_seconds_count 5\n"
+    )
+    with pytest.raises(ValueError):
+        registry.gauge("t_depth", "Again.")
+    with pytest.raises(ValueError):
+        events.labels()
+
+
+async def test_requests_are_labelled_by_route_template(
+    client: httpx.AsyncClient, meeting: Meeting
+) -> None:
+    before = _series((await client.get("/metrics")).text)
+
+    for meeting_id in (meeting.id, meeting.id, "missing"):
+        await client.get(f"/api/v1/meetings/{meeting_id}")
+    await client.get("/no/such/route")
+    response = await client.get("/metrics")
+
+    assert response.headers["content-type"] == CONTENT_TYPE
+    after = _series(response.text)
+    assert _requests(after, ROUTE, 200) - _requests(before, ROUTE, 200) == 2
+    assert _requests(after, ROUTE, 404) - _requests(before, ROUTE, 404) == 1
+    assert _requests(after, "unmatched", 404) - _requests(before, "unmatched", 404) == 1
+    assert not [name for name in after if meeting.id in name or "missing" in name]
+
+    # Cumulative buckets end in +Inf, which equals the count.
+    labels = f'method="GET",route="{ROUTE}",status="200"'
+    buckets = [
+        value
+        for name, value in after.items()
+        if name.startswith("callyfy_http_request_seconds_bucket{" + labels)
+    ]
+    assert buckets == sorted(buckets)
+    assert after[f'callyfy_http_request_seconds_bucket{{{labels},le="+Inf"}}'] == buckets[-1]
+    assert buckets[-1] == after[f"callyfy_http_request_seconds_count{{{labels}}}"]
+    assert after[f"callyfy_http_request_seconds_sum{{{labels}}}"] > 0
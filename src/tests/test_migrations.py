@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.settings import Settings
+from app.db import database, migrations
+
+pytestmark = pytest.mark.anyio
+
+
+async def _user_version(conn: AsyncConnection) -> int:
+    return await conn.run_sync(migrations.read_schema_version)
+
+
+async def _triggers(conn: AsyncConnection) -> set[str]:
+    rows = await conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'trigger'"))
+    return set(rows.scalars())
+
+
+async def test_schema_checks_run_once_per_version(settings: Settings) -> None:
+    engine = database.create_db_engine(settings.db)
+    try:
+        assert await database.init_db_tables(engine)
+        async with engine.connect() as conn:
+            assert await _user_version(conn) == database.schema_version() != 0
+
+        assert not await database.init_db_tables(engine)
+        assert await database.init_db_tables(engine, force=True)
+    finally:
+        await engine.dispose()
+
+
+async def test_older_database_is_upgraded(engine: AsyncEngine) -> None:
+    # What an older release left behind: a different version, a column, an
+    # index and a trigger that the current models add.
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("ALTER TABLE screen_captures DROP COLUMN image_digest")
+        await conn.exec_driver_sql("DROP INDEX ix_summaries_meeting_id_generated_at")
+        await conn.exec_driver_sql("DROP TRIGGER meetings_state_ai")
+        await conn.run_sync(migrations.write_schema_version, 7)
+
+    assert await database.init_db_tables(engine)
+
+    async with engine.connect() as conn:
+        columns = await conn.run_sync(
+            lambda sync: {c["name"] for c in inspect(sync).get_columns("screen_captures")}
+        )
+        indexes = await conn.run_sync(
+            lambda sync: {i["name"] for i in inspect(sync).get_indexes("summaries")}
+        )
+        assert "image_digest" in columns
+        assert "ix_summaries_meeting_id_generated_at" in indexes
+        assert {"meetings_state_ai", "transcript_segments_fts_ai"} <= await _triggers(conn)
+        assert await _user_version(conn) == database.schema_version()
+
+
+def test_schema_version_tracks_extra_ddl() -> None:
+    base = migrations.schema_version()
+
+    assert base == migrations.schema_version()
+    assert 0 < base < 2**31
+    # Reformatting a statement does not change the version; changing it does.
+    assert migrations.schema_version(["CREATE  TABLE x (a)"]) == migrations.schema_version(
+        ["CREATE TABLE x\n    (a)"]
+    )
+    assert migrations.schema_version(["CREATE TABLE x (a)"]) != migrations.schema_version(
+        ["CREATE TABLE x (b)"]
+    )
+    assert migrations.schema_version(["CREATE TABLE x (a)"]) != base
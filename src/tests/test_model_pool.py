@@ -0,0 +1,245 @@
+import asyncio
+import time
+from dataclasses import replace
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import AsyncIterator, Callable
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.settings import Settings
+from app.main import create_app
+from app.models import Meeting, RawAudioArtifact, TranscriptSegment
+from app.services.audio import ASRBackend, AudioService
+from app.services.model_pool import ModelSpec, ModelWorkerPool, Priority, model_calls
+from app.services.summarization import BatchingSummarizationBackend, SummaryKind
+
+from .test_audio_archive import _speech_with_pauses, _write_wav
+
+pytestmark = pytest.mark.anyio
+
+
+class GatedBackend:
+    """Runs in the worker: ``hold()`` blocks until the gate file exists."""
+
+    def __init__(self, gate: Path) -> None:
+        self.gate = gate
+        self.seen: list[str] = []
+
+    def hold(self) -> str:
+        self.gate.with_suffix(".held").touch()
+        while not self.gate.exists():
+            time.sleep(0.01)
+        return "held"
+
+    def echo(self, value: str) -> str:
+        self.seen.append(value)
+        return value
+
+    def calls(self) -> list[str]:
+        return self.seen
+
+
+def _warm_up(backend: GatedBackend) -> None:
+    backend.echo("warmup")
+
+
+@pytest.fixture
+async def make_pool() -> AsyncIterator[Callable[..., ModelWorkerPool]]:
+    pools: list[ModelWorkerPool] = []
+
+    def make(*specs: ModelSpec, budget: int | None = None, warmup: bool = False) -> ModelWorkerPool:
+        pools.append(ModelWorkerPool(specs, memory_budget_mb=budget, warmup=warmup))
+        return pools[-1]
+
+    yield make
+    for pool in pools:
+        await pool.close()
+
+
+def _spec(tmp_path: Path, name: str = "m", memory_mb: int = 0) -> ModelSpec:
+    return ModelSpec(name, partial(GatedBackend, tmp_path / f"{name}.gate"), memory_mb)
+
+
+async def _held(tmp_path: Path, name: str = "m") -> None:
+    while not (tmp_path / f"{name}.held").exists():
+        await asyncio.sleep(0.01)
+
+
+async def test_load_and_first_call_share_one_start(tmp_path: Path, make_pool) -> None:
+    pool = make_pool(_spec(tmp_path))
+
+    # The call used to reach the worker while load() was still starting it,
+    # and received the worker's "ready" handshake as its result.
+    _, echoed, _ = await asyncio.gather(
+        pool.load("m"), pool.client("m", "a").echo("first"), pool.load("m")
+    )
+
+    assert echoed == "first"
+    assert await pool.client("m", "a").calls() == ["first"]
+
+
+async def test_calls_run_by_priority_then_meetings_in_turn(tmp_path: Path, make_pool) -> None:
+    pool = make_pool(_spec(tmp_path))
+    held = asyncio.ensure_future(pool.client("m", "a").hold())
+    await _held(tmp_path)
+
+    queued = [
+        ("a", Priority.BACKGROUND, "a-background"),
+        ("a", Priority.LIVE, "a-live-1"),
+        ("a", Priority.LIVE, "a-live-2"),
+        ("a", Priority.LIVE, "a-live-3"),
+        ("b", Priority.INTERACTIVE, "b-interactive"),
+        ("b", Priority.LIVE, "b-live-1"),
+        ("c", Priority.LIVE, "c-live-1"),
+        ("b", Priority.LIVE, "b-live-2"),
+    ]
+    calls = [pool.client("m", meeting, priority).echo(value) for meeting, priority, value in queued]
+    tasks = [asyncio.ensure_future(call) for call in calls]
+    await asyncio.sleep(0.05)
+    assert pool.queue_depth("m") == len(queued)
+    (tmp_path / "m.gate").touch()
+    await asyncio.gather(held, *tasks)
+
+    assert await pool.client("m", "a").calls() == [
+        "a-live-1",
+        "b-live-1",
+        "c-live-1",
+        "a-live-2",
+        "b-live-2",
+        "a-live-3",
+        "b-interactive",
+        "a-background",
+    ]
+
+
+async def test_idle_models_are_evicted_to_fit_the_budget(tmp_path: Path, make_pool) -> None:
+    pool = make_pool(
+        _spec(tmp_path, "first", memory_mb=60), _spec(tmp_path, "second", memory_mb=60), budget=100
+    )
+    held = asyncio.ensure_future(pool.client("first", "a").hold())
+    await _held(tmp_path, "first")
+
+    # A busy model is never stopped: the second one waits for it to go idle.
+    second = asyncio.ensure_future(pool.client("second", "b").echo("x"))
+    await asyncio.sleep(0.2)
+    assert not second.done() and pool.resident == ["first"]
+
+    (tmp_path / "first.gate").touch()
+    assert await held == "held" and await second == "x"
+    assert pool.resident == ["second"] and pool.resident_mb == 60 and pool.evictions == 1
+
+    assert await pool.client("first", "a").echo("back") == "back"  # restarted on demand
+    assert pool.resident == ["first"] and pool.evictions == 2
+
+
+async def test_unbound_clients_take_meeting_and_priority_from_context(
+    tmp_path: Path, make_pool
+) -> None:
+    pool = make_pool(_spec(tmp_path))
+    shared = pool.client("m")
+    held = asyncio.ensure_future(shared.hold())
+    await _held(tmp_path)
+
+    async def call(meeting_id: str, priority: Priority, value: str) -> str:
+        with model_calls(meeting_id, priority):
+            return await shared.echo(value)
+
+    tasks = [
+        asyncio.ensure_future(call("a", Priority.BACKGROUND, "a-background")),
+        asyncio.ensure_future(call("a", Priority.LIVE, "a-live-1")),
+        asyncio.ensure_future(call("a", Priority.LIVE, "a-live-2")),
+        asyncio.ensure_future(call("b", Priority.LIVE, "b-live")),
+        asyncio.ensure_future(pool.client("m", priority=Priority.INTERACTIVE).echo("pinned")),
+    ]
+    await asyncio.sleep(0.05)
+    (tmp_path / "m.gate").touch()
+    await asyncio.gather(held, *tasks)
+
+    assert await shared.calls() == ["a-live-1", "b-live", "a-live-2", "pinned", "a-background"]
+
+
+async def test_clients_only_have_the_models_methods(tmp_path: Path, make_pool) -> None:
+    pool = make_pool(
+        _spec(tmp_path),  # a partial of GatedBackend
+        ModelSpec("asr", dict, interface=ASRBackend),
+        ModelSpec("any", _spec),  # a plain function: nothing to check against
+    )
+    gated, asr = pool.client("m"), pool.client("asr")
+
+    assert hasattr(gated, "echo") and not hasattr(gated, "summarize_batch")
+    assert hasattr(asr, "transcribe_file") and not hasattr(asr, "keys")
+    assert hasattr(pool.client("any"), "anything")
+    with pytest.raises(AttributeError, match="GatedBackend"):
+        gated.summarize_batch
+
+    # No batcher for a method the model lacks: the documented TypeError, before any call.
+    summarizer = BatchingSummarizationBackend(gated)  # type: ignore[arg-type]
+    with pytest.raises(TypeError, match="summarize_batch"):
+        await summarizer.summarize(Meeting(title="x"), SummaryKind.ROLLING)
+    assert pool.resident == []
+
+
+@pytest.mark.parametrize("warmup", [True, False])
+async def test_warmup_runs_in_the_worker_before_it_counts_as_started(
+    tmp_path: Path, make_pool, warmup: bool
+) -> None:
+    pool = make_pool(replace(_spec(tmp_path), warmup=_warm_up), warmup=warmup)
+
+    await pool.load("m")
+
+    assert await pool.client("m").calls() == (["warmup"] if warmup else [])
+    status = pool.status()["m"]
+    assert (status.warmup_seconds is not None) is warmup
+    assert status.start_seconds is not None and status.start_seconds >= (status.warmup_seconds or 0)
+
+
+class RecordingPool(ModelWorkerPool):
+    """Answers ``transcribe_file`` in-process and records how each call was queued."""
+
+    def __init__(self) -> None:
+        super().__init__([ModelSpec("asr", dict, interface=ASRBackend)])
+        self.calls: list[tuple[str, str, Priority]] = []
+
+    async def submit(self, model, method, args, kwargs, meeting_id, priority=Priority.LIVE):
+        self.calls.append((method, meeting_id, priority))
+        start = datetime(2025, 1, 6)
+        return [TranscriptSegment(started_at=start, ended_at=start, text="slice")]
+
+
+async def test_post_processing_queues_behind_live_work(
+    tmp_path: Path, session: AsyncSession, meeting: Meeting
+) -> None:
+    pool = RecordingPool()
+    wav = _write_wav(tmp_path / "r.wav", _speech_with_pauses(20))
+    artifact = RawAudioArtifact(meeting_id=meeting.id, file_path=str(wav))
+    session.add(artifact)
+    await session.commit()
+
+    audio = AudioService(
+        None,  # type: ignore[arg-type]
+        pool.client("asr"),
+        asr_factory=lambda: None,  # type: ignore  # cannot be sent to a worker process
+        post_process_slice_seconds=4,
+    )
+
+    assert await audio.post_process_audio(artifact, session) == len(pool.calls) > 2
+    assert set(pool.calls) == {("transcribe_file", meeting.id, Priority.BACKGROUND)}
+
+
+async def test_ready_waits_for_eager_models(tmp_path: Path, settings: Settings) -> None:
+    app = create_app(settings, models=[replace(_spec(tmp_path), eager=True)])
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = await client.get("/ready")
+            while (response := await client.get("/ready")).status_code != 200:
+                await asyncio.sleep(0.05)
+
+    assert first.status_code == 503
+    assert first.json()["models"]["m"]["state"] in ("pending", "starting")
+    model = response.json()["models"]["m"]
+    assert model["state"] == "running" and model["start_seconds"] > 0
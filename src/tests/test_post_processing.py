@@ -0,0 +1,69 @@
+import wave
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Meeting, Participant, RawAudioArtifact, TranscriptSegment
+from app.services.post_processing import SlicedTranscriber
+
+pytestmark = pytest.mark.anyio
+
+START = datetime(2025, 1, 6, 9, 0)
+RATE = 8000
+
+
+def _write_wav(path: Path, seconds: float) -> None:
+    samples = (np.sin(np.arange(int(RATE * seconds)) / 5) * 8000).astype(np.int16)
+    with wave.open(str(path), "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(RATE)
+        writer.writeframes(samples.tobytes())
+
+
+class SpeakerASR:
+    """One segment per file, attributed to ``speaker_id``."""
+
+    def __init__(self, speaker_id: int) -> None:
+        self.speaker_id = speaker_id
+
+    async def transcribe_chunk(self, audio: bytes) -> TranscriptSegment:
+        raise NotImplementedError
+
+    async def transcribe_file(self, audio_path: Path) -> list[TranscriptSegment]:
+        return [
+            TranscriptSegment(
+                speaker_id=self.speaker_id,
+                started_at=START,
+                ended_at=START + timedelta(milliseconds=500),
+                text="hello",
+                confidence=0.75,
+                trace_id="slice",
+            )
+        ]
+
+
+async def test_backend_segment_columns_are_kept(
+    tmp_path: Path, session: AsyncSession, meeting: Meeting
+) -> None:
+    speaker = Participant(meeting_id=meeting.id, name="Ada")
+    audio_path = tmp_path / "meeting.wav"
+    _write_wav(audio_path, 3)
+    artifact = RawAudioArtifact(meeting_id=meeting.id, file_path=str(audio_path))
+    session.add_all([speaker, artifact])
+    await session.commit()
+    transcriber = SlicedTranscriber(SpeakerASR(speaker.id), slice_seconds=1, search_seconds=0.1)
+
+    written = await transcriber.transcribe(artifact, session)
+
+    segments = list(await session.scalars(select(TranscriptSegment).order_by(TranscriptSegment.id)))
+    assert written == len(segments) == 3
+    assert {(s.speaker_id, s.confidence, s.trace_id) for s in segments} == {
+        (speaker.id, 0.75, "slice")
+    }
+    offsets = [(s.started_at - START).total_seconds() for s in segments]
+    assert offsets[0] == 0 and offsets == sorted(offsets) and offsets[-1] > 1.5
@@ -0,0 +1,67 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.sql import Executable
+
+from app.db import query_plan
+from app.models import MeetingsState
+from app.services.storage import (
+    ASSET_MODELS,
+    AssetKind,
+    assets_statement,
+    latest_summary_statement,
+    meetings_page_statement,
+    timeline_statement,
+)
+
+pytestmark = pytest.mark.anyio
+
+MEETING_ID = "00000000-0000-0000-0000-000000000000"
+AT = datetime(2025, 1, 6, 9, 0)
+TABLES = ["meetings", "meetings_state", *(model.__tablename__ for model in ASSET_MODELS.values())]
+
+# Statements that must seek into an index: their cost may not grow with table size.
+SEEKING: dict[str, Executable] = {
+    **{f"{kind.value} assets": assets_statement(MEETING_ID, kind) for kind in AssetKind},
+    **{
+        f"{kind.value} timeline{' after ' + after[1] if after else ''}": timeline_statement(
+            MEETING_ID, kind, after
+        ).limit(500)
+        for kind in AssetKind
+        for after in (None, (AT, "capture", 1), (AT, "summary", 1))
+    },
+    "latest summary": latest_summary_statement(MEETING_ID, "final"),
+    "meeting list page 2": meetings_page_statement(51, (AT, MEETING_ID)),
+    "meeting list page 2 with counts": meetings_page_statement(51, (AT, MEETING_ID), True),
+    "meetings state": select(MeetingsState).where(MeetingsState.id == 1),
+}
+
+# The first page reads the newest rows of the whole table, in index order up to its LIMIT.
+ORDERED_PREFIX: dict[str, Executable] = {
+    "meeting list page 1": meetings_page_statement(51),
+    "meeting list page 1 with counts": meetings_page_statement(51, include_counts=True),
+}
+
+
+async def _plan(engine: AsyncEngine, stmt: Executable) -> list[str]:
+    async with engine.connect() as conn:
+        return await conn.run_sync(query_plan.explain_query_plan, stmt)
+
+
+@pytest.mark.parametrize("name", list(SEEKING))
+async def test_query_seeks_an_index_and_does_not_sort(engine: AsyncEngine, name: str) -> None:
+    plan = await _plan(engine, SEEKING[name])
+
+    assert not query_plan.full_table_scans(plan, TABLES), plan
+    assert not query_plan.temp_b_trees(plan), plan
+
+
+@pytest.mark.parametrize("name", list(ORDERED_PREFIX))
+async def test_first_page_reads_an_index_in_order(engine: AsyncEngine, name: str) -> None:
+    plan = await _plan(engine, ORDERED_PREFIX[name])
+
+    for step in query_plan.full_table_scans(plan, TABLES):
+        assert " USING COVERING INDEX " in step or " USING INDEX " in step, plan
+    assert not query_plan.temp_b_trees(plan), plan
@@ -0,0 +1,147 @@
+from datetime import timedelta
+from typing import Optional
+
+import anyio
+import pytest
+from anyio import wait_all_tasks_blocked
+
+from app.services.scheduler import OverrunPolicy, PeriodicTask, SchedulerService
+
+pytestmark = pytest.mark.anyio
+
+INTERVAL = timedelta(seconds=10)
+
+
+class FakeClock:
+    """Virtual monotonic time: advanced to the next deadline once every task is asleep."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleepers: list[tuple[float, anyio.Event]] = []
+
+    def time(self) -> float:
+        return self.now
+
+    async def sleep_until(self, deadline: float) -> None:
+        if deadline <= self.now:
+            await anyio.sleep(0)
+            return
+        woken = anyio.Event()
+        self.sleepers.append((deadline, woken))
+        await woken.wait()
+
+    async def advance(self) -> None:
+        await wait_all_tasks_blocked()
+        self.now = max(self.now, min(deadline for deadline, _ in self.sleepers))
+        for deadline, woken in list(self.sleepers):
+            if deadline <= self.now:
+                self.sleepers.remove((deadline, woken))
+                woken.set()
+
+
+class Body:
+    """A task body that takes ``runtimes[i]`` virtual seconds on its i-th run."""
+
+    def __init__(self, clock: FakeClock, runtimes: tuple[float, ...] = (), fail_on=()) -> None:
+        self.clock = clock
+        self.runtimes = runtimes
+        self.fail_on = fail_on
+        self.starts: list[float] = []
+
+    async def __call__(self) -> None:
+        run = len(self.starts)
+        self.starts.append(self.clock.now)
+        self.clock.now += self.runtimes[run] if run < len(self.runtimes) else 0.0
+        if run in self.fail_on:
+            raise RuntimeError(f"run {run}")
+
+
+async def _run_until(clock: FakeClock, end: float, *tasks: PeriodicTask) -> None:
+    scheduler = SchedulerService(list(tasks), clock=clock.time, sleep_until=clock.sleep_until)
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(scheduler.start)
+        while clock.now < end:
+            await clock.advance()
+        tg.cancel_scope.cancel()
+
+
+def _task(body: Body, policy: OverrunPolicy = OverrunPolicy.SKIP, **kwargs) -> PeriodicTask:
+    return PeriodicTask("task", INTERVAL, body, overrun_policy=policy, **kwargs)
+
+
+async def test_ticks_stay_on_a_fixed_grid() -> None:
+    clock = FakeClock()
+    body = Body(clock, runtimes=(3.0,) * 10)
+    task = _task(body)
+
+    await _run_until(clock, 45, task)
+
+    # Runtime does not push later ticks back.
+    assert body.starts[:5] == [0, 10, 20, 30, 40]
+    assert task.stats.missed_ticks == 0 and task.stats.max_runtime == 3.0
+
+
+@pytest.mark.parametrize(
+    ("policy", "max_backlog", "starts", "missed", "max_lag"),
+    [
+        # The first run takes 25 s, so the ticks at 10 and 20 came due during it.
+        (OverrunPolicy.SKIP, 10, [0, 30, 40], 2, 0),
+        (OverrunPolicy.COALESCE, 10, [0, 25, 30, 40], 1, 5),
+        (OverrunPolicy.QUEUE, 10, [0, 25, 25, 30, 40], 0, 15),
+        (OverrunPolicy.QUEUE, 1, [0, 25, 30, 40], 1, 5),
+    ],
+)
+async def test_overrun_policies(
+    policy: OverrunPolicy, max_backlog: int, starts: list[float], missed: int, max_lag: float
+) -> None:
+    clock = FakeClock()
+    body = Body(clock, runtimes=(25.0,))
+    task = _task(body, policy, max_backlog=max_backlog)
+
+    await _run_until(clock, 45, task)
+
+    assert body.starts[: len(starts)] == starts
+    assert task.stats.missed_ticks == missed
+    assert task.stats.max_lag == max_lag
+
+
+async def test_failures_are_isolated() -> None:
+    clock = FakeClock()
+    failing, healthy = Body(clock, fail_on=(1, 2)), Body(clock)
+    tasks = [_task(failing), PeriodicTask("healthy", INTERVAL, healthy)]
+
+    await _run_until(clock, 45, *tasks)
+
+    assert failing.starts[:5] == healthy.starts[:5] == [0, 10, 20, 30, 40]
+    assert tasks[0].stats.failures == 2 and tasks[0].stats.last_error == "RuntimeError('run 2')"
+    assert tasks[1].stats.failures == 0
+
+
+async def test_only_the_scheduler_deadline_counts_as_a_timeout() -> None:
+    timeout = timedelta(seconds=0.01)
+    raised: Optional[int] = None
+
+    async def slow() -> None:
+        await anyio.sleep(1)  # real time, past the scheduler's deadline
+
+    async def raises_timeout() -> None:
+        nonlocal raised
+        raised = (raised or 0) + 1
+        raise TimeoutError("the task's own deadline")
+
+    # Real time here: the deadline is the scheduler's own cancel scope.
+    interval = timedelta(seconds=0.02)
+    slow_task = PeriodicTask("slow", interval, slow, timeout=timeout)
+    raising_task = PeriodicTask("raising", interval, raises_timeout, timeout=timeout)
+    scheduler = SchedulerService([slow_task, raising_task])
+
+    with anyio.fail_after(5):
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(scheduler.start)
+            while slow_task.stats.runs < 2:
+                await anyio.sleep(0.005)
+            tg.cancel_scope.cancel()
+
+    assert slow_task.stats.timeouts >= 2 and slow_task.stats.failures == 0
+    assert slow_task.stats.last_error == "timeout"
+    assert raising_task.stats.timeouts == 0 and raising_task.stats.failures == raised
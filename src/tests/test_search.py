@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.db import fts
+from app.models import Meeting, TranscriptSegment
+from app.services import SearchService
+
+pytestmark = pytest.mark.anyio
+
+START = datetime(2025, 1, 6, 9, 0)
+
+
+def _segment(meeting: Meeting, index: int, text: str) -> TranscriptSegment:
+    started = START + timedelta(seconds=5 * index)
+    return TranscriptSegment(
+        meeting_id=meeting.id,
+        started_at=started,
+        ended_at=started + timedelta(seconds=5),
+        text=text,
+    )
+
+
+@pytest.fixture
+def search(tmp_path) -> SearchService:
+    return SearchService(vector_index_path=tmp_path / "vectors")
+
+
+def test_build_match_expression_quotes_terms() -> None:
+    assert fts.build_match_expression('budget AND "q3" -x') == '"budget" "AND" """q3""" "-x"'
+    assert fts.build_match_expression("   ") == ""
+
+
+async def test_full_text_search_ranks_and_highlights(
+    session: AsyncSession, meeting: Meeting, search: SearchService
+) -> None:
+    session.add_all(
+        [
+            _segment(meeting, 0, "Let us review the budget for the launch"),
+            _segment(meeting, 1, "Budget budget budget, the budget is all we discuss"),
+            _segment(meeting, 2, "Nothing relevant here"),
+        ]
+    )
+    await session.commit()
+
+    hits = await search.full_text_search("budget", session)
+
+    assert [hit.segment.text.split()[0] for hit in hits] == ["Budget", "Let"]
+    assert hits[0].rank <= hits[1].rank
+    assert "<mark>budget</mark>" in hits[1].snippet
+
+
+async def test_full_text_search_stems_and_filters(
+    session: AsyncSession, meeting: Meeting, search: SearchService
+) -> None:
+    other = Meeting(title="Other")
+    session.add(other)
+    await session.flush()
+    session.add_all(
+        [_segment(meeting, 0, "We are migrating customers"), _segment(other, 0, "Migration plan")]
+    )
+    await session.commit()
+
+    assert len(await search.full_text_search("migrate", session)) == 2
+    hits = await search.full_text_search("migrate", session, meeting_id=other.id)
+    assert [hit.segment.meeting_id for hit in hits] == [other.id]
+    assert await search.full_text_search('"', session) == []
+
+
+async def test_fts_index_follows_updates_and_deletes(
+    session: AsyncSession, meeting: Meeting, search: SearchService
+) -> None:
+    segment = _segment(meeting, 0, "security audit next week")
+    session.add(segment)
+    await session.commit()
+
+    await session.execute(
+        update(TranscriptSegment).where(TranscriptSegment.id == segment.id).values(text="roadmap")
+    )
+    await session.commit()
+    assert await search.full_text_search("audit", session) == []
+    assert len(await search.full_text_search("roadmap", session)) == 1
+
+    await session.execute(delete(TranscriptSegment))
+    await session.commit()
+    assert await search.full_text_search("roadmap", session) == []
+
+
+async def test_rebuild_fts_index(
+    engine: AsyncEngine, session: AsyncSession, meeting: Meeting, search: SearchService
+) -> None:
+    session.add(_segment(meeting, 0, "quarterly roadmap"))
+    await session.commit()
+
+    await fts.rebuild_fts_index(engine)
+
+    assert len(await search.full_text_search("roadmap", session)) == 1
@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Meeting, RawAudioArtifact, ScreenCapture, SummaryRecord, TranscriptSegment
+from app.services.storage import (
+    AssetKind,
+    StorageService,
+    TimelineEntry,
+    decode_cursor,
+    decode_timeline_cursor,
+    encode_timeline_cursor,
+)
+
+pytestmark = pytest.mark.anyio
+
+START = datetime(2025, 1, 6, 9, 0)
+
+
+async def add_assets(session: AsyncSession, meeting: Meeting, seconds: int) -> None:
+    """One transcript segment per second, and a capture and a summary at the same times."""
+    for second in range(seconds):
+        at = START + timedelta(seconds=second)
+        session.add(
+            TranscriptSegment(
+                meeting_id=meeting.id, started_at=at, ended_at=at, text=f"segment {second}"
+            )
+        )
+        if second % 3 == 0:
+            session.add(
+                ScreenCapture(meeting_id=meeting.id, captured_at=at, image_path=f"{second}.png")
+            )
+        if second % 5 == 0:
+            session.add(
+                SummaryRecord(meeting_id=meeting.id, generated_at=at, kind="rolling", content="…")
+            )
+    session.add(RawAudioArtifact(meeting_id=meeting.id, recorded_at=START, file_path="a.flac"))
+    await session.commit()
+
+
+def _positions(entries: list[TimelineEntry]) -> list[tuple[datetime, str, int]]:
+    return [(entry.at, entry.kind.value, entry.id) for entry in entries]
+
+
+@pytest.fixture
+def storage(tmp_path) -> StorageService:
+    return StorageService(tmp_path)
+
+
+async def test_timeline_is_merged_in_time_kind_id_order(
+    session: AsyncSession, meeting: Meeting, storage: StorageService
+) -> None:
+    await add_assets(session, meeting, 40)
+
+    entries = [e async for e in storage.iter_meeting_timeline(meeting.id, session, batch_size=7)]
+
+    assert len(entries) == 40 + 14 + 8 + 1
+    assert _positions(entries) == sorted(_positions(entries))
+    assert entries[0].kind is AssetKind.AUDIO and entries[0].detail == "a.flac"
+    transcripts = [e for e in entries if e.kind is AssetKind.TRANSCRIPT]
+    assert transcripts[1].text == "segment 1" and transcripts[1].ended_at == transcripts[1].at
+
+
+async def test_timeline_resumes_after_cursor(
+    session: AsyncSession, meeting: Meeting, storage: StorageService
+) -> None:
+    await add_assets(session, meeting, 40)
+    kinds = [AssetKind.TRANSCRIPT, AssetKind.CAPTURE, AssetKind.SUMMARY]
+    everything = [e async for e in storage.iter_meeting_timeline(meeting.id, session, kinds)]
+
+    # Resume in the middle of a group of entries that share a timestamp.
+    for split in (0, 1, 2, 17, len(everything) - 1):
+        after = decode_timeline_cursor(encode_timeline_cursor(everything[split]))
+        rest = [
+            e
+            async for e in storage.iter_meeting_timeline(
+                meeting.id, session, kinds, after=after, batch_size=4
+            )
+        ]
+        assert _positions(rest) == _positions(everything[split + 1 :])
+
+
+async def test_timeline_pages_follow_the_stream(
+    session: AsyncSession, meeting: Meeting, storage: StorageService
+) -> None:
+    await add_assets(session, meeting, 25)
+    everything = [e async for e in storage.iter_meeting_timeline(meeting.id, session)]
+
+    paged: list[TimelineEntry] = []
+    cursor = None
+    while True:
+        after = decode_timeline_cursor(cursor) if cursor else None
+        page, cursor = await storage.get_meeting_timeline_page(
+            meeting.id, session, after=after, limit=6
+        )
+        paged.extend(page)
+        if cursor is None:
+            break
+
+    assert _positions(paged) == _positions(everything)
+
+
+async def test_meetings_state_changes_with_any_meeting_change(
+    session: AsyncSession, meeting: Meeting, storage: StorageService
+) -> None:
+    states = [await storage.meetings_state(session)]
+
+    other = await storage.create_meeting("Other", session)
+    states.append(await storage.meetings_state(session))
+    await add_assets(session, meeting, 1)
+    states.append(await storage.meetings_state(session))
+    other.title = "Renamed"
+    await session.commit()
+    states.append(await storage.meetings_state(session))
+    await session.delete(other)
+    await session.commit()
+    states.append(await storage.meetings_state(session))
+
+    versions = [version for version, _ in states]
+    assert versions == sorted(set(versions))
+    assert all(updated_at is not None for _, updated_at in states)
+
+
+async def test_meeting_list_pages_newest_first(
+    session: AsyncSession, meeting: Meeting, storage: StorageService
+) -> None:
+    session.add_all(Meeting(title=f"m{i}", created_at=START) for i in range(6))
+    await session.commit()
+
+    ids, after = [], None
+    while True:
+        page = await storage.list_meetings(session, limit=3, after=after, include_counts=True)
+        ids += [item["id"] for item in page.items]
+        if page.next_cursor is None:
+            break
+        after = decode_cursor(page.next_cursor)
+
+    assert ids[0] == meeting.id
+    assert ids[1:] == sorted(ids[1:], reverse=True)
+    assert len(ids) == 7
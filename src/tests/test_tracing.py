@@ -0,0 +1,108 @@
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.core import metrics
+from app.core.tracing import Tracer, tracer
+from app.models import Meeting
+
+pytestmark = pytest.mark.anyio
+
+
+def test_spans_are_buffered_per_meeting(tmp_path: Path) -> None:
+    traces = Tracer(spans_per_meeting=3, max_meetings=2, path=tmp_path / "spans.jsonl")
+
+    with traces.span("t1", "asr", "a", bytes=10) as attributes:
+        attributes["words"] = 4
+    with pytest.raises(RuntimeError), traces.span("t1", "persist", "a"):
+        raise RuntimeError("insert failed")
+    for index in range(3):
+        traces.record(f"t{index}", "queue", "b", 100.0 + index, 101.0 + index)
+
+    asr, persist = traces.spans("a")
+    assert (asr.name, asr.attributes) == ("asr", {"bytes": 10, "words": 4})
+    assert persist.attributes == {"error": "RuntimeError"} and persist.end >= persist.start
+    assert [s.trace_id for s in traces.spans("b")] == ["t0", "t1", "t2"]
+    assert traces.spans("b", "t1")[0].duration == 1.0
+
+    traces.record("t3", "queue", "b", 103.0, 104.0)  # the oldest span of "b" is dropped
+    traces.record("t4", "queue", "c", 0.0, 1.0)  # and the least recently traced meeting
+    assert [s.trace_id for s in traces.spans("b")] == ["t1", "t2", "t3"]
+    assert traces.spans("a") == []
+
+    traces.close()
+    lines = (tmp_path / "spans.jsonl").read_text().splitlines()
+    assert len(lines) == 7
+    assert json.loads(lines[0]) == {
+        "trace_id": "t1",
+        "name": "asr",
+        "meeting_id": "a",
+        "start": asr.start,
+        "end": asr.end,
+        "attributes": {"bytes": 10, "words": 4},
+    }
+
+
+def test_summary_spans_cover_the_chunks_persisted_before_it() -> None:
+    traces = Tracer()
+    latency = metrics.CHUNK_TO_SUMMARY_LATENCY.labels()
+    observed = latency.count
+
+    traces.chunk_persisted("m", "c1", 10.0)
+    traces.chunk_persisted("m", "c2", 12.0)
+    chunks = traces.take_unsummarized("m")
+    traces.chunk_persisted("m", "c3", 14.0)  # stored after the summary read the transcript
+    traces.summary_persisted("m", "s1", 15.0, 20.0, chunks, kind="rolling")
+
+    summarize, *summarized = traces.spans("m")
+    assert summarize.name == "summarize" and summarize.duration == 5.0
+    assert summarize.attributes == {"chunks": ["c1", "c2"], "kind": "rolling"}
+    assert [(s.trace_id, s.name, s.start, s.end) for s in summarized] == [
+        ("c1", "summarized", 10.0, 20.0),
+        ("c2", "summarized", 12.0, 20.0),
+    ]
+    assert summarized[0].attributes == {"summary": "s1"}
+    assert latency.count == observed + 2
+    assert traces.take_unsummarized("m") == [("c3", 14.0)]
+
+    traces.chunk_persisted("m", "c4", 16.0)
+    traces.forget("m")
+    assert traces.spans("m") == [] and traces.take_unsummarized("m") == []
+
+    disabled = Tracer(enabled=False)
+    disabled.record("t", "queue", "m", 0.0, 1.0)
+    disabled.chunk_persisted("m", "t", 0.0)
+    assert disabled.spans("m") == [] and disabled.take_unsummarized("m") == []
+
+
+async def test_debug_traces_until_the_meeting_stops(
+    client: httpx.AsyncClient, meeting: Meeting
+) -> None:
+    for index, start in enumerate((100.0, 110.0, 120.0)):
+        trace_id = f"chunk-{index}"
+        tracer.record(trace_id, "queue", meeting.id, start, start + 0.5, seq=index)
+        tracer.record(trace_id, "asr", meeting.id, start + 0.5, start + 2.5)
+    url = f"/api/v1/debug/meetings/{meeting.id}/traces"
+
+    body = (await client.get(url)).json()
+    assert [(s["name"], s["count"], s["p50_ms"]) for s in body["stages"]] == [
+        ("asr", 3, 2000.0),
+        ("queue", 3, 500.0),
+    ]
+    assert [t["trace_id"] for t in body["traces"]] == ["chunk-2", "chunk-1", "chunk-0"]
+    newest = body["traces"][0]
+    assert newest["duration_ms"] == 2500.0
+    assert [(s["name"], s["attributes"]) for s in newest["spans"]] == [
+        ("queue", {"seq": 2}),
+        ("asr", {}),
+    ]
+    limited = (await client.get(url, params={"limit": 1})).json()
+    assert [t["trace_id"] for t in limited["traces"]] == ["chunk-2"]
+    only = (await client.get(url, params={"trace_id": "chunk-0"})).json()
+    assert [t["trace_id"] for t in only["traces"]] == ["chunk-0"]
+
+    assert (await client.post(f"/api/v1/meetings/{meeting.id}/stop")).status_code == 200
+
+    assert (await client.get(url)).json() == {"meeting_id": meeting.id, "stages": [], "traces": []}
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from app.services import SearchService
+from app.services.vector_index import VectorIndex, VectorIndexError
+
+DIM = 32
+
+
+def _vectors(count: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((count, DIM)).astype(np.float32)
+
+
+def test_exact_search_finds_nearest(tmp_path) -> None:
+    index = VectorIndex(tmp_path)
+    vectors = _vectors(100)
+    index.add_many(list(range(100)), ["a"] * 50 + ["b"] * 50, vectors)
+
+    hits = index.search(vectors[7], k=3)
+    assert hits[0].capture_id == 7
+    assert hits[0].score == pytest.approx(1.0, abs=1e-5)
+    assert [hit.capture_id for hit in index.search(vectors[7], k=3, meeting_id="b")][0] >= 50
+    assert index.search(vectors[7], meeting_id="missing") == []
+
+
+def test_dimension_mismatch(tmp_path) -> None:
+    index = VectorIndex(tmp_path)
+    index.add(1, "a", _vectors(1)[0])
+    with pytest.raises(VectorIndexError):
+        index.add(2, "a", np.ones(DIM + 1, dtype=np.float32))
+
+
+def test_reopen_ignores_torn_append(tmp_path) -> None:
+    index = VectorIndex(tmp_path)
+    index.add_many([1, 2], ["a", "a"], _vectors(2))
+    with (tmp_path / "vectors.f32").open("ab") as fh:
+        fh.write(b"\0" * 10)
+
+    assert len(VectorIndex(tmp_path)) == 2
+
+
+def test_shared_instance_sees_appends(tmp_path) -> None:
+    search = SearchService(vector_index_path=tmp_path)
+    writer = VectorIndex.shared(tmp_path)
+    assert writer is search.vector_index
+
+    vectors = _vectors(3)
+    writer.add_many([1, 2, 3], ["a"] * 3, vectors)
+    assert search.vector_index.search(vectors[2], k=1)[0].capture_id == 3
+
+
+def test_trains_in_background_at_threshold(tmp_path) -> None:
+    index = VectorIndex(tmp_path, train_threshold=400)
+    vectors = _vectors(500)
+    index.add_many(list(range(300)), ["a"] * 300, vectors[:300])
+    assert not index.wait_trained()
+
+    index.add_many(list(range(300, 500)), ["a"] * 200, vectors[300:])
+    assert index.wait_trained(timeout=60)
+
+    index.add(500, "a", vectors[0] * 2)
+    hits = index.search(vectors[42], k=1)
+    assert hits[0].capture_id == 42
+    assert len(VectorIndex(tmp_path)) == 501
+    assert VectorIndex(tmp_path).trained
+
+
+def test_ivf_reads_only_the_probed_lists(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr("app.services.vector_index._UNGROUPED_MIN", 50)
+    index = VectorIndex(tmp_path)
+    vectors = _vectors(1200)
+    index.add_many(list(range(1000)), ["a"] * 500 + ["b"] * 500, vectors[:1000])
+    index.train(nlist=32, m=4, iterations=5)
+    index.add_many(list(range(1000, 1040)), ["b"] * 40, vectors[1000:1040])  # not grouped yet
+
+    q = index._coerce(vectors[1020])[0]
+    probed = index._probed_rows(q, nprobe=2)
+    assert 0 < len(probed) < 300 and 1020 in probed
+    assert index.search(vectors[1020], k=1, nprobe=2)[0].capture_id == 1020
+    assert index.search(vectors[1020], k=1, meeting_id="a", nprobe=32)[0].capture_id < 500
+
+    # Reopening keeps the grouping; appending past the threshold regroups.
+    reopened = VectorIndex(tmp_path)
+    assert reopened._meta["grouped"] == 1000 and reopened._ungrouped_count == 40
+    reopened.add_many(list(range(1040, 1200)), ["b"] * 160, vectors[1040:])
+    assert reopened._meta["grouped"] == 1200 and reopened._ungrouped_count == 0
+    offsets = reopened._list_offsets
+    assert offsets is not None and offsets[-1] == 1200
+    lists = np.fromfile(tmp_path / "lists.i32", dtype=np.int32)
+    for list_id in range(32):
+        assert set(lists[reopened._list_rows[offsets[list_id] : offsets[list_id + 1]]]) <= {list_id}
+    assert reopened.search(vectors[1150], k=1)[0].capture_id == 1150
@@ -0,0 +1,173 @@
+from pathlib import Path
+
+import anyio
+import numpy as np
+import pytest
+from PIL import Image
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import Meeting, ScreenCapture
+from app.services.frame_dedup import FrameDeduplicator
+from app.services.vision import BatchingVisionLanguageModel, VisionService
+
+pytestmark = pytest.mark.anyio
+
+
+class NoiseCapture:
+    """Save a different random image on every capture."""
+
+    def __init__(self) -> None:
+        self.rng = np.random.default_rng(0)
+        self.taken = 0
+
+    async def capture(self, meeting: Meeting, destination: Path) -> Path:
+        self.taken += 1
+        path = destination / f"{meeting.id}-{self.taken}.png"
+        pixels = self.rng.integers(0, 255, (32, 32), dtype=np.uint8)
+        Image.fromarray(pixels).save(path)
+        return path
+
+
+class RendezvousVLM:
+    """Only answer once ``parties`` descriptions are in progress at the same time."""
+
+    def __init__(self, parties: int) -> None:
+        self.parties = parties
+        self.waiting = 0
+        self.all_arrived = anyio.Event()
+
+    async def describe_image(self, image_path: Path) -> str:
+        self.waiting += 1
+        if self.waiting == self.parties:
+            self.all_arrived.set()
+        await self.all_arrived.wait()
+        return image_path.name
+
+    async def embed_image(self, image_path: Path) -> bytes:
+        return np.ones(4, dtype=np.float32).tobytes()
+
+
+async def test_dedup_lookup_does_not_hold_the_writer_connection(
+    tmp_path: Path, session_maker: async_sessionmaker[AsyncSession], session: AsyncSession
+) -> None:
+    meetings = [Meeting(title="A"), Meeting(title="B")]
+    session.add_all(meetings)
+    await session.commit()
+    vision = VisionService(
+        NoiseCapture(), RendezvousVLM(parties=2), deduplicator=FrameDeduplicator()
+    )
+
+    async def capture(meeting: Meeting) -> None:
+        # Each call gets its own session on the single-connection writer engine.
+        async with session_maker() as capture_session:
+            await vision.capture_screen(meeting, tmp_path, capture_session)
+
+    # The cold-cache lookup used to keep the connection checked out during
+    # analysis, so the second capture waited for it while the first waited
+    # for the second to reach the VLM.
+    with anyio.fail_after(5):
+        async with anyio.create_task_group() as tg:
+            for meeting in meetings:
+                tg.start_soon(capture, meeting)
+
+    assert await session.scalar(select(func.count()).select_from(ScreenCapture)) == 2
+
+
+class OverlapVLM:
+    """Each call waits for the other one to start, so they only finish if run concurrently."""
+
+    def __init__(self, delay: float = 0.05) -> None:
+        self.delay = delay
+        self.describing = anyio.Event()
+        self.embedding = anyio.Event()
+
+    async def describe_image(self, image_path: Path) -> str:
+        self.describing.set()
+        await self.embedding.wait()
+        await anyio.sleep(self.delay)
+        return image_path.name
+
+    async def embed_image(self, image_path: Path) -> bytes:
+        self.embedding.set()
+        await self.describing.wait()
+        await anyio.sleep(self.delay)
+        return np.ones(4, dtype=np.float32).tobytes()
+
+
+async def test_describe_and_embed_overlap_and_are_timed(
+    tmp_path: Path, session: AsyncSession, meeting: Meeting
+) -> None:
+    vision = VisionService(NoiseCapture(), OverlapVLM())
+
+    with anyio.fail_after(5):
+        capture = await vision.capture_screen(meeting, tmp_path, session)
+
+    assert capture.description == f"{meeting.id}-1.png"
+    (timings,) = vision.timings
+    assert timings.describe >= 0.05 and timings.embed >= 0.05 and not timings.duplicate
+    # Run one after the other, the analysis would take describe + embed.
+    assert max(timings.describe, timings.embed) <= timings.analysis
+    assert timings.analysis < timings.describe + timings.embed
+    assert timings.total >= timings.capture + timings.analysis + timings.persist
+    breakdown = vision.latency_breakdown()
+    assert breakdown["analysis"] == timings.analysis and breakdown["total"] == timings.total
+
+
+class SameFrameCapture(NoiseCapture):
+    """Save the same image on every capture."""
+
+    async def capture(self, meeting: Meeting, destination: Path) -> Path:
+        self.rng = np.random.default_rng(0)
+        return await super().capture(meeting, destination)
+
+
+async def test_unchanged_frame_reuses_the_analysis(
+    tmp_path: Path, session: AsyncSession, meeting: Meeting
+) -> None:
+    vision = VisionService(
+        SameFrameCapture(), RendezvousVLM(parties=1), deduplicator=FrameDeduplicator()
+    )
+
+    first = await vision.capture_screen(meeting, tmp_path, session)
+    second = await vision.capture_screen(meeting, tmp_path, session)
+
+    assert second.duplicate_of_id == first.id
+    assert second.description == first.description and second.image_path == first.image_path
+    assert not (tmp_path / f"{meeting.id}-2.png").exists()
+    assert [t.duplicate for t in vision.timings] == [False, True]
+    assert vision.latency_breakdown()["total"] == vision.timings[0].total
+
+
+class RecordingBatchVLM:
+    def __init__(self) -> None:
+        self.described: list[list[str]] = []
+
+    async def describe_images(self, image_paths: list[Path]) -> list[str]:
+        self.described.append([path.name for path in image_paths])
+        return [f"described {path.name}" for path in image_paths]
+
+    async def embed_images(self, image_paths: list[Path]) -> list[bytes]:
+        return [path.name.encode() for path in image_paths]
+
+
+async def test_batched_vlm_returns_each_result_to_its_caller() -> None:
+    backend = RecordingBatchVLM()
+    vlm = BatchingVisionLanguageModel(backend, max_batch=3, max_wait=0.01)
+    paths = [Path(f"{i}.png") for i in range(4)]
+    described: dict[Path, str] = {}
+    embedded: dict[Path, bytes] = {}
+
+    async def analyse(path: Path) -> None:
+        described[path] = await vlm.describe_image(path)
+        embedded[path] = await vlm.embed_image(path)
+
+    async with anyio.create_task_group() as tg:
+        for path in paths:
+            tg.start_soon(analyse, path)
+
+    assert described == {path: f"described {path.name}" for path in paths}
+    assert embedded == {path: path.name.encode() for path in paths}
+    stats = vlm.batch_stats()
+    assert stats["describe_image"].batches == 2 and stats["describe_image"].full == 1
+    assert sorted(map(len, backend.described)) == [1, 3]
@@ -0,0 +1,108 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.write_buffer import WriteBuffer
+from app.models import Meeting, TranscriptSegment
+
+pytestmark = pytest.mark.anyio
+
+START = datetime(2025, 1, 6, 9, 0)
+
+
+class CountingSessions:
+    """Session maker that counts the sessions (one per committed batch) it opens."""
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession]) -> None:
+        self.session_maker = session_maker
+        self.opened = 0
+
+    def __call__(self) -> AsyncSession:
+        self.opened += 1
+        return self.session_maker()
+
+
+def _segment(meeting: Meeting, index: int) -> TranscriptSegment:
+    started = START + timedelta(seconds=index)
+    return TranscriptSegment(
+        meeting_id=meeting.id, started_at=started, ended_at=started, text=f"segment {index}"
+    )
+
+
+async def _texts(session: AsyncSession) -> list[str]:
+    result = await session.scalars(select(TranscriptSegment.text).order_by(TranscriptSegment.id))
+    return list(result)
+
+
+async def test_concurrent_adds_share_one_commit(session_maker, session, meeting) -> None:
+    sessions = CountingSessions(session_maker)
+    buffer = WriteBuffer(sessions, max_batch=100, max_delay=0.05)  # type: ignore[arg-type]
+    buffer.start()
+
+    segments = await asyncio.gather(*(buffer.add(_segment(meeting, i)) for i in range(20)))
+    await buffer.close()
+
+    assert sessions.opened == 1
+    assert all(segment.id is not None for segment in segments)
+
+
+async def test_full_batch_is_written_without_waiting(session_maker, meeting) -> None:
+    sessions = CountingSessions(session_maker)
+    buffer = WriteBuffer(sessions, max_batch=4, max_delay=60)  # type: ignore[arg-type]
+    buffer.start()
+
+    await asyncio.wait_for(
+        asyncio.gather(*(buffer.add(_segment(meeting, i)) for i in range(8))), timeout=5
+    )
+    await buffer.close()
+
+    assert sessions.opened == 2
+
+
+async def test_rows_are_inserted_in_enqueue_order(session_maker, session, meeting) -> None:
+    buffer = WriteBuffer(session_maker, max_batch=3, max_delay=0.01)
+    buffer.start()
+    futures = [buffer.enqueue(_segment(meeting, i)) for i in range(10)]
+    segments = await asyncio.gather(*futures)
+    await buffer.close()
+
+    assert [s.id for s in segments] == sorted(s.id for s in segments)
+    assert await _texts(session) == [f"segment {i}" for i in range(10)]
+
+
+async def test_failing_object_does_not_fail_its_batch(session_maker, session, meeting) -> None:
+    buffer = WriteBuffer(session_maker, max_batch=100, max_delay=0.05)
+    buffer.start()
+
+    invalid = _segment(meeting, 1)
+    invalid.text = None  # type: ignore[assignment]  # violates NOT NULL
+    results = await asyncio.gather(
+        buffer.add(_segment(meeting, 0)),
+        buffer.add(invalid),
+        buffer.add(_segment(meeting, 2)),
+        return_exceptions=True,
+    )
+    await buffer.close()
+
+    assert isinstance(results[1], IntegrityError)
+    assert results[0].id is not None and results[2].id is not None
+    assert await _texts(session) == ["segment 0", "segment 2"]
+
+
+async def test_close_flushes_pending_objects(session_maker, session, meeting) -> None:
+    buffer = WriteBuffer(session_maker, max_batch=100, max_delay=60)
+    buffer.start()
+    futures = [buffer.enqueue(_segment(meeting, i)) for i in range(5)]
+    assert buffer.pending == 5
+
+    await asyncio.wait_for(buffer.close(), timeout=5)
+
+    assert all(future.done() for future in futures)
+    assert buffer.pending == 0
+    assert len(await _texts(session)) == 5
+    with pytest.raises(RuntimeError):
+        buffer.enqueue(_segment(meeting, 5))